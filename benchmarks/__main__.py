@@ -0,0 +1,63 @@
+import asyncio
+import json
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from benchmarks import app, media, metrics, middlewares, parameters, schemas, startup, zipkin  # noqa: F401
+from benchmarks.core import compare, REGISTRY
+
+
+@click.command()
+@click.argument("groups", nargs=-1)
+@click.option("--output", default="benchmarks/results.json", help="Write results to file")
+@click.option("--baseline", default="benchmarks/baseline.json", help="Compare results with stored baseline")
+@click.option("--threshold", default=0.2, help="Allowed slowdown relative to baseline")
+@click.option("--save-baseline", is_flag=True, default=False, help="Store results as new baseline")
+def run(groups, output, baseline, threshold, save_baseline):
+    """Run benchmarks for request hot path."""
+
+    selected = groups or sorted(REGISTRY.keys())
+    unknown = set(selected) - set(REGISTRY.keys())
+    if unknown:
+        raise click.BadParameter(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    loop = asyncio.get_event_loop()
+
+    results = {}
+    for group in selected:
+        click.echo(f"Run {group} benchmarks", err=True)
+        for name, stats in loop.run_until_complete(REGISTRY[group]()).items():
+            results[name] = stats.to_dict()
+            click.echo(f"  {name:<40} {stats.best * 1e6:>12.2f} us/op {stats.ops:>12.0f} ops/s", err=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.utcnow().isoformat(),
+        },
+        "results": results,
+    }
+
+    Path(output).write_text(json.dumps(report, indent=2))
+
+    baseline_path = Path(baseline)
+    if save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+    elif baseline_path.exists():
+        expected = json.loads(baseline_path.read_text())["results"]
+        regressions = compare(results, expected, threshold)
+
+        for regression in regressions:
+            click.echo(f"Regression: {regression}", err=True)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,62 @@
+"""Full request through the demo application."""
+import asyncio
+import re
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from benchmarks.core import measure_async, measure_concurrent, register, Results, Stats
+from benchmarks.fixtures import create_app
+
+
+HEADERS = {"X-Request-ID": "a3a1e2b6", "X-Correlation-ID": "f0c2d1a9"}
+CONTENT_LENGTH = re.compile(rb"content-length:\s*(\d+)", re.IGNORECASE)
+
+
+async def raw_load(host: str, port: int, path: str, number: int, connections: int) -> Stats:
+    """Send requests over keep-alive connections without HTTP client overhead."""
+
+    headers = "".join(f"{name}: {value}\r\n" for name, value in HEADERS.items())
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n{headers}\r\n".encode()
+
+    streams = [await asyncio.open_connection(host, port) for _ in range(connections)]
+    queue = asyncio.Queue()
+    for stream in streams:
+        queue.put_nowait(stream)
+
+    async def send() -> None:
+        reader, writer = await queue.get()
+        try:
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            assert head.startswith(b"HTTP/1.1 200 "), head.split(b"\r\n", 1)[0]
+            await reader.readexactly(int(CONTENT_LENGTH.search(head).group(1)))
+        finally:
+            queue.put_nowait((reader, writer))
+
+    try:
+        return await measure_concurrent(send, number=number, concurrency=connections)
+    finally:
+        for _, writer in streams:
+            writer.close()
+
+
+@register("app")
+async def run() -> Results:
+    results = {}
+
+    async with TestClient(TestServer(create_app())) as client:
+
+        async def get_items() -> None:
+            resp = await client.get("/api/items", headers=HEADERS)
+            await resp.read()
+            assert resp.status == 200, resp.status
+
+        results["app.test_client.get_items"] = await measure_async(get_items, number=500)
+        results["app.raw_socket.get_items"] = await raw_load(
+            client.host, client.port, "/api/items", number=5000, connections=10
+        )
+        results["app.raw_socket.health"] = await raw_load(
+            client.host, client.port, "/-/health", number=5000, connections=10
+        )
+
+    return results
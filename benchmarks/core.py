@@ -0,0 +1,84 @@
+import asyncio
+import time
+import timeit
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+@dataclass
+class Stats:
+    """Timings of a single benchmark, seconds per operation."""
+
+    number: int
+    best: float
+    mean: float
+
+    @property
+    def ops(self) -> float:
+        return 1 / self.best if self.best else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "ops": self.ops}
+
+
+Results = Dict[str, Stats]
+Benchmark = Callable[[], Awaitable[Results]]
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+
+def register(group: str) -> Callable[[Benchmark], Benchmark]:
+    def wrapper(benchmark: Benchmark) -> Benchmark:
+        REGISTRY[group] = benchmark
+        return benchmark
+
+    return wrapper
+
+
+def measure(func: Callable[[], Any], number: int, repeat: int = 5) -> Stats:
+    timings = timeit.repeat(func, number=number, repeat=repeat)
+    return Stats(number=number, best=min(timings) / number, mean=sum(timings) / len(timings) / number)
+
+
+async def measure_async(func: Callable[[], Awaitable[Any]], number: int, repeat: int = 5) -> Stats:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for _ in range(number):
+            await func()
+        timings.append(time.perf_counter() - started_at)
+
+    return Stats(number=number, best=min(timings) / number, mean=sum(timings) / len(timings) / number)
+
+
+async def measure_concurrent(func: Callable[[], Awaitable[Any]], number: int, concurrency: int) -> Stats:
+    """Run `number` operations in `concurrency` parallel loops."""
+
+    per_worker = max(number // concurrency, 1)
+
+    async def worker() -> None:
+        for _ in range(per_worker):
+            await func()
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    total = per_worker * concurrency
+    return Stats(number=total, best=elapsed / total, mean=elapsed / total)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """Find benchmarks which became slower than baseline more than `threshold` times."""
+
+    regressions = []
+    for name, stats in results.items():
+        expected = baseline.get(name, None)
+        if not expected or not expected["best"]:
+            continue
+
+        ratio = stats["best"] / expected["best"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {ratio:.2f}x slower than baseline")
+
+    return regressions
@@ -0,0 +1,34 @@
+import os
+from contextlib import redirect_stdout
+from typing import Mapping, Optional
+
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from aiohttp_micro import AppConfig
+from aiohttp_micro.app import init
+
+
+def create_app() -> web.Application:
+    """Demo application which writes its logs to /dev/null."""
+
+    # Logger keeps the stream it is created with, so it stays open for the whole life of application
+    devnull = open(os.devnull, "w")
+    with redirect_stdout(devnull):
+        app = init("micro", AppConfig())
+
+    async def close_devnull(app: web.Application) -> None:
+        devnull.close()
+
+    app.on_cleanup.append(close_devnull)
+
+    return app
+
+
+async def make_request(app: web.Application, path: str, headers: Optional[Mapping[str, str]] = None) -> web.Request:
+    """Request to application with resolved route."""
+
+    request = make_mocked_request("GET", path, headers=headers, app=app)
+    match_info = await app.router.resolve(request)
+
+    return make_mocked_request("GET", path, headers=headers, app=app, match_info=match_info)
@@ -0,0 +1,28 @@
+"""Encoding and decoding of dumped responses in every supported media type."""
+from aiohttp_micro.app import GetItemsResponseSchema, Item
+from aiohttp_micro.web.media import CODECS, JSON
+from benchmarks.core import measure, register, Results
+
+
+SIZES = (1, 50, 10000)
+NAMES = {JSON: "json", "application/msgpack": "msgpack", "application/cbor": "cbor"}
+
+
+@register("media")
+async def run() -> Results:
+    results = {}
+
+    schema = GetItemsResponseSchema()
+
+    for size in SIZES:
+        number = max(20000 // size, 5)
+        data = schema.dump({"items": [Item(key=key, name=f"Item {key}") for key in range(size)]})
+
+        for media_type, codec in CODECS.items():
+            name = NAMES.get(media_type, media_type)
+            body = codec.dumps(data)
+
+            results[f"media.{name}.encode.{size}"] = measure(lambda: codec.dumps(data), number=number)  # noqa: B023
+            results[f"media.{name}.decode.{size}"] = measure(lambda: codec.loads(body), number=number)  # noqa: B023
+
+    return results
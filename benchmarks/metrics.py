@@ -0,0 +1,34 @@
+"""Cost of `/-/metrics` scrape depending on number of series, served from shared exposition and rendered anew."""
+from aiohttp_micro.web.handlers import metrics
+from benchmarks.core import measure_async, register, Results
+from benchmarks.fixtures import create_app, make_request
+
+
+SERIES = (10, 1000, 10000)
+
+
+@register("metrics")
+async def run() -> Results:
+    results = {}
+
+    for count in SERIES:
+        app = create_app()
+
+        requests_total = app["metrics"]["requests_total"]
+        for key in range(count):
+            requests_total.labels(app["app_name"], "GET", f"/api/items/{key}", 200).inc()
+
+        request = await make_request(app, "/-/metrics")
+        resp = await metrics.handler(request)
+        assert resp.status == 200, resp.status
+
+        results[f"metrics.scrape.{count}"] = await measure_async(
+            lambda: metrics.handler(request), number=max(2000 // count, 5)  # noqa: B023
+        )
+
+        exposition = metrics.MetricsExposition(app["metrics_registry"], ttl=0)
+        results[f"metrics.render.{count}"] = await measure_async(
+            lambda: exposition.get(None, "gzip"), number=max(2000 // count, 5)  # noqa: B023
+        )
+
+    return results
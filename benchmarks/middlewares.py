@@ -0,0 +1,64 @@
+"""Every middleware on its own with a trivial handler."""
+from aiohttp import web
+
+from aiohttp_micro.web.admission import Limiter
+from aiohttp_micro.web.middlewares import common_middleware
+from aiohttp_micro.web.middlewares.admission import admission_middleware_factory
+from aiohttp_micro.web.middlewares.compression import compression_middleware_factory
+from aiohttp_micro.web.middlewares.deadline import deadline_middleware_factory
+from aiohttp_micro.web.middlewares.logging import logging_middleware_factory
+from aiohttp_micro.web.middlewares.metrics import middleware as metrics_middleware
+from aiohttp_micro.web.middlewares.tracing import tracing_middleware_factory
+from benchmarks.core import measure_async, register, Results
+from benchmarks.fixtures import create_app, make_request
+
+
+RESPONSE = web.Response(body=b"OK")
+
+# Large enough to be compressed, compressed in place, so every request gets its own response
+ITEMS_BODY = b'{"items": [' + b", ".join(b'{"key": %d, "name": "Item %d"}' % (key, key) for key in range(200)) + b"]}"
+
+HEADERS = {"Accept-Encoding": "gzip, deflate", "X-Request-Timeout": "5"}
+
+
+async def handler(request: web.Request) -> web.Response:
+    return RESPONSE
+
+
+async def items_handler(request: web.Request) -> web.Response:
+    return web.Response(body=ITEMS_BODY, content_type="application/json")
+
+
+@register("middlewares")
+async def run() -> Results:
+    app = create_app()
+    request = await make_request(app, "/api/items", headers=HEADERS)
+
+    middlewares = {
+        "admission": admission_middleware_factory(limiter=Limiter(100), route_limiters={"/api/items": Limiter(100)}),
+        "common": common_middleware,
+        "compression.skipped": compression_middleware_factory(),
+        "deadline": deadline_middleware_factory(max_timeout=10),
+        "logging": logging_middleware_factory(),
+        "metrics": metrics_middleware,
+        "tracing.untraced": tracing_middleware_factory(exclude_routes=["metrics"]),
+    }
+
+    results = {"middlewares.none": await measure_async(lambda: handler(request), number=20000)}
+    for name, middleware in middlewares.items():
+        resp = await middleware(request, handler)
+        assert resp.status == 200, f"{name}: {resp.status}"
+
+        results[f"middlewares.{name}"] = await measure_async(
+            lambda: middleware(request, handler), number=20000  # noqa: B023
+        )
+
+    compression = compression_middleware_factory()
+    resp = await compression(request, items_handler)
+    assert resp.headers["Content-Encoding"] == "gzip", resp.headers
+
+    results["middlewares.compression.gzip"] = await measure_async(
+        lambda: compression(request, items_handler), number=2000
+    )
+
+    return results
@@ -0,0 +1,79 @@
+"""Compare compiled parameters loading with per-request schema creation.
+
+Run on its own with::
+
+    $ python -m benchmarks.parameters
+"""
+import asyncio
+from typing import Any, Dict
+
+import click
+from aiohttp import web
+from marshmallow import ValidationError
+
+from aiohttp_micro.app import GetItemsView
+from aiohttp_micro.web.handlers.openapi import InvalidParameters, OperationView, ParameterIn
+from benchmarks.core import measure, register, Results
+from benchmarks.fixtures import make_request
+
+
+HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "benchmark",
+    "X-Request-ID": "a3a1e2b6",
+    "X-Correlation-ID": "f0c2d1a9",
+}
+
+
+def get_parameters_uncompiled(view: OperationView, request: web.Request) -> Dict[str, Any]:
+    parameters = {}
+    for section, schema_cls in view.parameters.items():
+        schema = view.create_schema(schema_cls)
+
+        if schema.in_ == ParameterIn.query:
+            src = request.query
+        elif schema.in_ == ParameterIn.header:
+            src = request.headers
+        elif schema.in_ == ParameterIn.path:
+            src = request.match_info
+        elif schema.in_ == ParameterIn.cookies:
+            src = request.cookies
+
+        try:
+            parameters[section] = schema.load(src)
+        except ValidationError as exc:
+            raise InvalidParameters(errors=exc.messages)
+
+    return parameters
+
+
+@register("parameters")
+async def run(number: int = 20000) -> Results:
+    app = web.Application()
+    app.router.add_get("/api/items", lambda request: web.Response())
+
+    view = GetItemsView(name="getItems", security=None, tags=["items"])
+    view.setup(app)
+
+    request = await make_request(app, "/api/items?offset=10&limit=20", headers=HEADERS)
+
+    assert get_parameters_uncompiled(view, request) == view.get_parameters(request)
+
+    return {
+        "parameters.uncompiled": measure(lambda: get_parameters_uncompiled(view, request), number=number),
+        "parameters.compiled": measure(lambda: view.get_parameters(request), number=number),
+    }
+
+
+def main() -> None:
+    results = asyncio.get_event_loop().run_until_complete(run())
+
+    uncompiled, compiled = results["parameters.uncompiled"], results["parameters.compiled"]
+
+    click.echo(f"uncompiled: {uncompiled.best * 1e6:.2f} us/request")
+    click.echo(f"compiled:   {compiled.best * 1e6:.2f} us/request")
+    click.echo(f"speedup:    {uncompiled.best / compiled.best:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
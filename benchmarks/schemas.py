@@ -0,0 +1,50 @@
+"""Parameters parsing, payload loading and response dumping."""
+import orjson
+from marshmallow import fields
+
+from aiohttp_micro.app import GetItemsResponseSchema, GetItemsView, Item, ItemSchema
+from aiohttp_micro.core.serializers import get_dumper
+from aiohttp_micro.web.handlers.openapi import PayloadSchema
+from benchmarks.core import measure, register, Results
+from benchmarks.fixtures import create_app, make_request
+
+
+SIZES = (1, 50, 10000)
+
+
+class AddItemsPayloadSchema(PayloadSchema):
+    items = fields.List(fields.Nested(ItemSchema), required=True)
+
+
+@register("schemas")
+async def run() -> Results:
+    app = create_app()
+
+    view = GetItemsView(name="getItems", security=None, tags=["items"])
+    view.setup(app)
+
+    request = await make_request(
+        app, "/api/items?offset=10&limit=20", headers={"X-Request-ID": "a3a1e2b6", "X-Correlation-ID": "f0c2d1a9"}
+    )
+
+    results = {"schemas.parameters": measure(lambda: view.get_parameters(request), number=20000)}
+
+    payload_schema = AddItemsPayloadSchema()
+    response_schema = GetItemsResponseSchema()
+    dump = get_dumper(response_schema)
+
+    for size in SIZES:
+        number = max(20000 // size, 5)
+
+        payload = {"items": [{"name": f"Item {key}"} for key in range(size)]}
+        results[f"schemas.payload.{size}"] = measure(
+            lambda: payload_schema.load(payload), number=number  # noqa: B023
+        )
+
+        data = {"items": [Item(key=key, name=f"Item {key}") for key in range(size)]}
+        results[f"schemas.dump.{size}"] = measure(
+            lambda: orjson.dumps(response_schema.dump(data)), number=number  # noqa: B023
+        )
+        results[f"schemas.fast_dump.{size}"] = measure(lambda: orjson.dumps(dump(data)), number=number)  # noqa: B023
+
+    return results
@@ -0,0 +1,63 @@
+"""Measure package import time with `python -X importtime`.
+
+Run on its own with::
+
+    $ python -m benchmarks.startup
+"""
+import asyncio
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+import click
+
+from benchmarks.core import register, Results, Stats
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """Self and cumulative import time of modules imported with `module`, in microseconds."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+
+    prefix = len("import time:")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_time, cumulative, name = line[prefix:].split("|")
+        times[name.strip()] = (int(self_time), int(cumulative))
+
+    return times
+
+
+def measure_import(module: str, repeat: int) -> Stats:
+    timings = [import_times(module)[module][1] / 1e6 for _ in range(repeat)]
+    return Stats(number=1, best=min(timings), mean=sum(timings) / len(timings))
+
+
+@register("startup")
+async def run(repeat: int = 5) -> Results:
+    return {
+        "startup.aiohttp": measure_import("aiohttp.web", repeat),
+        "startup.package": measure_import("aiohttp_micro", repeat),
+    }
+
+
+def main() -> None:
+    results = asyncio.get_event_loop().run_until_complete(run())
+
+    for name, stats in results.items():
+        click.echo(f"{name:<20} {stats.best * 1e3:.1f} ms")
+
+    times = import_times("aiohttp_micro")
+    click.echo("slowest modules:")
+    for name, (_, cumulative) in sorted(times.items(), key=lambda item: item[1][1], reverse=True)[1:11]:
+        click.echo(f"  {name:<40} {cumulative / 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Span export throughput and overflow against in-process Zipkin collector."""
+import time
+
+import aiozipkin as az  # type: ignore
+from aiohttp.test_utils import TestServer
+
+from aiohttp_micro.core.tools.zipkin import BatchTransport, LocalCollector
+from benchmarks.core import measure, register, Results, Stats
+
+
+async def export(collector: LocalCollector, server: TestServer, spans: int, **kwargs) -> BatchTransport:
+    transport = BatchTransport(str(server.make_url("/api/v2/spans")), **kwargs)
+    tracer = az.Tracer(transport, az.Sampler(sample_rate=1.0), az.create_endpoint("benchmark"))
+
+    for _ in range(spans):
+        with tracer.new_trace(sampled=True) as span:
+            span.name("GET /api/items")
+            span.tag("http.method", "GET")
+
+    await tracer.close()
+
+    return transport
+
+
+@register("zipkin")
+async def run(spans: int = 10000) -> Results:
+    results = {}
+
+    collector = LocalCollector()
+    async with TestServer(collector.create_app()) as server:
+        transport = BatchTransport(str(server.make_url("/api/v2/spans")), max_queue_size=spans * 10)
+        tracer = az.Tracer(transport, az.Sampler(sample_rate=1.0), az.create_endpoint("benchmark"))
+
+        def record_span() -> None:
+            with tracer.new_trace(sampled=True) as span:
+                span.name("GET /api/items")
+
+        results["zipkin.record_span"] = measure(record_span, number=spans, repeat=3)
+        await tracer.close()
+
+        started_at = time.perf_counter()
+        await export(collector, server, spans, max_queue_size=spans, batch_size=100)
+        elapsed = time.perf_counter() - started_at
+        results["zipkin.export"] = Stats(number=spans, best=elapsed / spans, mean=elapsed / spans)
+
+        # Slow collector: spans over queue limit should be dropped without slowing down recording
+        collector.delay = 0.05
+        started_at = time.perf_counter()
+        transport = await export(collector, server, spans, max_queue_size=spans // 10, batch_size=100)
+        elapsed = time.perf_counter() - started_at
+        results["zipkin.export_overflow"] = Stats(number=spans, best=elapsed / spans, mean=elapsed / spans)
+
+        assert transport.dropped == spans - spans // 10
+
+    return results
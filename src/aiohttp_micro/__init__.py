@@ -1,44 +1,70 @@
+import os
 import socket
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, List, NamedTuple, Optional, Tuple, TYPE_CHECKING, Union
 
 import config
-import orjson  # type: ignore
-import pkg_resources
-import sentry_sdk
-import structlog  # type: ignore
 from aiohttp.web import Application
-from apispec import APISpec  # type: ignore
-from apispec.ext.marshmallow import MarshmallowPlugin  # type: ignore
-from apispec.utils import validate_spec  # type: ignore
-from prometheus_client import CollectorRegistry, Counter, Enum, Gauge, Histogram, Info, Summary  # type: ignore
-from sentry_sdk.integrations.aiohttp import AioHttpIntegration
 
-from aiohttp_micro.web.handlers import meta, metrics, openapi
-from aiohttp_micro.web.middlewares import common_middleware
-from aiohttp_micro.web.middlewares.logging import logging_middleware_factory
-from aiohttp_micro.web.middlewares.metrics import middleware as metrics_middleware
-from aiohttp_micro.web.middlewares.tracing import tracing_middleware_factory
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Executor
 
+    from apispec import APISpec  # type: ignore
+    from prometheus_client import Counter, Enum, Gauge, Histogram, Info, Summary  # type: ignore
 
-Metric = Union[Counter, Gauge, Summary, Histogram, Info, Enum]
+    from aiohttp_micro.core.tools.log_sink import LogSink
+    from aiohttp_micro.core.tools.zipkin import SamplingRules
+    from aiohttp_micro.web.handlers.openapi import OperationView
+
+
+# Subsystems are imported by their `setup_*` functions, so importing the package
+# does not pay for apispec, prometheus_client, sentry_sdk, structlog or aiozipkin
+Metric = Union["Counter", "Gauge", "Summary", "Histogram", "Info", "Enum"]
+
+
+class Distribution(NamedTuple):
+    project_name: str
+    version: str
+
+
+def get_distribution(package_name: str) -> Distribution:
+    """Name and version of installed package."""
+
+    from importlib import metadata
+
+    distribution = metadata.distribution(package_name)
+    return Distribution(project_name=distribution.metadata["Name"], version=distribution.version)
 
 
 class ZipkinConfig(config.Config):
     host = config.StrField(default="localhost", env="ZIPKIN_HOST")
     port = config.IntField(default=9411, env="ZIPKIN_PORT")
     enabled = config.BoolField(default=False, env="ZIPKIN_ENABLED")
+    sample_rate = config.StrField(path="sample-rate", default="1.0", env="ZIPKIN_SAMPLE_RATE")
+    spans_per_second = config.IntField(path="spans-per-second", default=0, env="ZIPKIN_SPANS_PER_SECOND")
+    queue_size = config.IntField(path="queue-size", default=10000, env="ZIPKIN_QUEUE_SIZE")
+    batch_size = config.IntField(path="batch-size", default=100, env="ZIPKIN_BATCH_SIZE")
 
     def get_address(self) -> str:
         return f"http://{self.host}:{self.port}/api/v2/spans"
 
+    def get_sample_rate(self) -> float:
+        return min(max(float(self.sample_rate), 0.0), 1.0)
+
 
 class AppConfig(config.Config):
     debug = config.BoolField(default=False)
     sentry_dsn = config.StrField(path="sentry-dsn", env="SENTRY_DSN")
+    cursor_secret = config.StrField(path="cursor-secret", env="CURSOR_SECRET")
+    spec_cache = config.StrField(path="spec-cache", env="SPEC_CACHE")
     zipkin = config.NestedField[ZipkinConfig](ZipkinConfig)
 
 
 def setup(app: Application, app_name: str, config: AppConfig, package_name: Optional[str] = None) -> None:
+    from aiohttp_micro.core.cursors import CursorCodec
+    from aiohttp_micro.web.handlers import meta
+    from aiohttp_micro.web.middlewares import common_middleware
+
     if not package_name:
         package_name = app_name
 
@@ -46,9 +72,15 @@ def setup(app: Application, app_name: str, config: AppConfig, package_name: Opti
 
     app["app_name"] = app_name
     app["hostname"] = socket.gethostname()
-    app["distribution"] = pkg_resources.get_distribution(package_name)
+    app["distribution"] = get_distribution(package_name)
+
+    # Pagination cursors issued by one instance are valid for others only with common secret
+    app["cursor_codec"] = CursorCodec(config.cursor_secret.encode("utf-8") if config.cursor_secret else None)
 
     if config.sentry_dsn:
+        import sentry_sdk
+        from sentry_sdk.integrations.aiohttp import AioHttpIntegration
+
         sentry_sdk.init(
             dsn=str(config.sentry_dsn), integrations=[AioHttpIntegration()], release=app["distribution"].version,
         )
@@ -62,7 +94,33 @@ def setup(app: Application, app_name: str, config: AppConfig, package_name: Opti
     app.router.add_get("/-/meta", meta.index, name="meta")
 
 
-def setup_logging(app: Application) -> None:
+def setup_logging(app: Application, sink: Optional["LogSink"] = None) -> None:
+    """Configure structured logging.
+
+    Log lines are written to stdout synchronously by default. With `sink`
+    they are queued and written in batches from background thread.
+    """
+
+    import orjson
+    import structlog  # type: ignore
+
+    from aiohttp_micro.web.middlewares.logging import logging_middleware_factory
+
+    logger_factory = structlog.BytesLoggerFactory()
+    if sink:
+        from aiohttp_micro.core.tools.log_sink import LogSinkCollector, SinkLoggerFactory
+
+        logger_factory = SinkLoggerFactory(sink)
+
+        async def close_sink(app: Application) -> None:
+            sink.close()
+
+        app["log_sink"] = sink
+        app.on_cleanup.append(close_sink)
+
+        if "metrics_registry" in app:
+            register_collector(app, LogSinkCollector(sink))
+
     structlog.configure(
         cache_logger_on_first_use=True,
         processors=[
@@ -70,17 +128,36 @@ def setup_logging(app: Application) -> None:
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.JSONRenderer(serializer=orjson.dumps),
         ],
-        logger_factory=structlog.BytesLoggerFactory(),
+        logger_factory=logger_factory,
     )
 
     app["logger"] = structlog.get_logger(
-        app_name=app["app_name"], hostname=app["hostname"], version=app["distribution"].version,
+        app_name=app["app_name"], hostname=app["hostname"], pid=os.getpid(), version=app["distribution"].version,
     )
 
     app.middlewares.append(logging_middleware_factory())  # type: ignore
 
 
-def setup_metrics(app: Application, extra_metrics: Dict[str, Metric] = None) -> None:
+def setup_metrics(
+    app: Application,
+    extra_metrics: Dict[str, Metric] = None,
+    max_endpoints: int = 1000,
+    exposition_ttl: float = 1.0,
+    exposition_executor: Optional["Executor"] = None,
+) -> None:
+    """Collect request metrics and expose them on `/-/metrics` endpoint.
+
+    Exposition is rendered in `exposition_executor` (default thread pool of
+    event loop) in Prometheus text or OpenMetrics format requested by scraper,
+    compressed if scraper accepts it and shared by scrapes coming within
+    `exposition_ttl` seconds.
+    """
+
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram  # type: ignore
+
+    from aiohttp_micro.web.handlers import metrics
+    from aiohttp_micro.web.middlewares.metrics import middleware as metrics_middleware, RequestMetrics
+
     app["metrics_registry"] = CollectorRegistry()
     app["metrics"] = {
         "requests_total": Counter(
@@ -97,6 +174,20 @@ def setup_metrics(app: Application, extra_metrics: Dict[str, Metric] = None) ->
             "Requests in progress",
             ("app_name", "endpoint", "method"),
             registry=app["metrics_registry"],
+            multiprocess_mode="livesum",
+        ),
+        "payload_size": Histogram(
+            "request_payload_size_bytes",
+            "Request payload size",
+            ("app_name", "operation"),
+            buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+            registry=app["metrics_registry"],
+        ),
+        "payload_decode": Histogram(
+            "request_payload_decode_seconds",
+            "Request payload decode time",
+            ("app_name", "operation"),
+            registry=app["metrics_registry"],
         ),
     }
 
@@ -105,21 +196,426 @@ def setup_metrics(app: Application, extra_metrics: Dict[str, Metric] = None) ->
             app["metrics"][key] = metric
             app["metrics_registry"].register(metric)
 
+    app["metrics_collectors"] = []
+    if "log_sink" in app:
+        from aiohttp_micro.core.tools.log_sink import LogSinkCollector
+
+        register_collector(app, LogSinkCollector(app["log_sink"]))
+
+    app["request_metrics"] = RequestMetrics(app["app_name"], app["metrics"], max_endpoints=max_endpoints)
+
     app.middlewares.append(metrics_middleware)  # type: ignore
 
+    app["metrics_exposition"] = metrics.MetricsExposition(
+        app["metrics_registry"], ttl=exposition_ttl, executor=exposition_executor
+    )
     app.router.add_get("/-/metrics", metrics.handler, name="metrics")
 
 
-def setup_tracing(app: Application, exclude_routes: Optional[Iterable[str]] = None) -> None:
+def enable_multiprocess_metrics(path: str) -> None:
+    """Keep values of metrics created from now on in files shared by worker processes.
+
+    Should be called before application is created, values of metrics created
+    earlier, including their label children, stay in process memory.
+    """
+
+    from prometheus_client import values  # type: ignore
+
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Values of previous runs, files of this process are still in use
+    for stale in directory.glob("*.db"):
+        if not stale.name.endswith(f"_{os.getpid()}.db"):
+            stale.unlink()
+
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(directory)
+    os.environ["prometheus_multiproc_dir"] = str(directory)
+
+    if not getattr(values.ValueClass, "_multiprocess", False):
+        values.ValueClass = values.MultiProcessValue()
+
+
+def setup_multiprocess_metrics(app: Application, path: str) -> None:
+    """Aggregate metrics of application running in several worker processes.
+
+    Every process writes its metrics values to files in `path` directory and
+    `/-/metrics` endpoint collects values of all processes from these files.
+    Should be called after `setup_metrics` and before workers fork, metrics
+    are shared between workers only if `enable_multiprocess_metrics` has been
+    called before application is created. Custom collectors report values of
+    worker process serving the scrape.
+    """
+
+    from prometheus_client import CollectorRegistry  # type: ignore
+    from prometheus_client.multiprocess import MultiProcessCollector  # type: ignore
+
+    enable_multiprocess_metrics(path)
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=str(Path(path)))
+    for collector in app["metrics_collectors"]:
+        registry.register(collector)
+
+    app["metrics_multiprocess_dir"] = str(Path(path))
+    app["metrics_multiprocess_registry"] = registry
+    if "metrics_exposition" in app:
+        app["metrics_exposition"].registry = registry
+
+
+def register_collector(app: Application, collector: Any) -> None:
+    """Expose custom collector with application metrics, needs `setup_metrics` to be called first."""
+
+    app["metrics_collectors"].append(collector)
+    app["metrics_registry"].register(collector)
+    if "metrics_multiprocess_registry" in app:
+        app["metrics_multiprocess_registry"].register(collector)
+
+
+def unregister_collector(app: Application, collector: Any) -> None:
+    app["metrics_collectors"].remove(collector)
+    app["metrics_registry"].unregister(collector)
+    if "metrics_multiprocess_registry" in app:
+        app["metrics_multiprocess_registry"].unregister(collector)
+
+
+def setup_compression(
+    app: Application,
+    min_size: int = 1024,
+    content_types: Optional[Collection[str]] = None,
+    executor_threshold: int = 1024 * 1024,
+    max_workers: int = 2,
+) -> None:
+    """Compress responses with gzip, deflate or brotli.
+
+    Only responses of `content_types` (`COMPRESSIBLE_TYPES` by default) are
+    compressed. Bodies over `executor_threshold` bytes are compressed in
+    thread pool of `max_workers` threads. Compression ratio and time are
+    collected when `setup_metrics` was called before.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiohttp_micro.web.middlewares.compression import COMPRESSIBLE_TYPES, compression_middleware_factory
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compression")
+
+    async def shutdown_executor(app: Application) -> None:
+        executor.shutdown(wait=False)
+
+    app.on_cleanup.append(shutdown_executor)
+
+    if "metrics_registry" in app:
+        from prometheus_client import Histogram  # type: ignore
+
+        app["metrics"]["compression_ratio"] = Histogram(
+            "response_compression_ratio",
+            "Compressed to original response size ratio",
+            ("encoding",),
+            buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+            registry=app["metrics_registry"],
+        )
+        app["metrics"]["compression_time"] = Histogram(
+            "response_compression_seconds",
+            "Response compression time",
+            ("encoding",),
+            registry=app["metrics_registry"],
+        )
+
+    app.middlewares.append(  # type: ignore
+        compression_middleware_factory(
+            min_size=min_size,
+            content_types=content_types or COMPRESSIBLE_TYPES,
+            executor_threshold=executor_threshold,
+            executor=executor,
+            metrics=app.get("metrics", None),
+        )
+    )
+
+
+def setup_deadlines(
+    app: Application, default_timeout: Optional[float] = None, max_timeout: Optional[float] = None
+) -> None:
+    """Stop processing requests after clients stop waiting for them.
+
+    Deadline is read from `X-Request-Timeout` (seconds) or `grpc-timeout`
+    request headers, `default_timeout` applies to requests without them.
+    Remaining budget is available as `request["deadline"]`. Operations
+    answer `504 Gateway Timeout` after deadline and count skipped and
+    cancelled processing in `deadline_exceeded_total` counter. Call it
+    before `setup_admission_control` for queueing time to count too.
+    """
+
+    from aiohttp_micro.web.middlewares.deadline import deadline_middleware_factory
+
+    if "metrics_registry" in app:
+        from prometheus_client import Counter  # type: ignore
+
+        app["metrics"]["deadline_exceeded"] = Counter(
+            "deadline_exceeded_total",
+            "Requests which processing was skipped or cancelled after deadline",
+            ("app_name", "operation", "result"),
+            registry=app["metrics_registry"],
+        )
+
+    app.middlewares.append(  # type: ignore
+        deadline_middleware_factory(default_timeout=default_timeout, max_timeout=max_timeout)
+    )
+
+
+def setup_admission_control(
+    app: Application,
+    max_concurrency: Optional[int] = None,
+    route_limits: Optional[Dict[str, int]] = None,
+    max_queue: int = 100,
+    queue_timeout: float = 1.0,
+    adaptive: bool = False,
+    min_limit: int = 1,
+    max_limit: int = 1000,
+    latency_threshold: float = 1.0,
+    retry_after: int = 1,
+    exclude_paths: Optional[Collection[str]] = None,
+) -> None:
+    """Shed load over concurrency limits with `503 Service Unavailable`.
+
+    At most `max_concurrency` requests are handled at once, requests to route
+    path templates from `route_limits` are limited separately. Up to
+    `max_queue` requests over the limit wait `queue_timeout` seconds for
+    free slot. With `adaptive` global limit starts from `max_concurrency` and
+    follows observed latency between `min_limit` and `max_limit` (AIMD).
+    Health and metrics endpoints are never limited unless `exclude_paths`
+    are given.
+    """
+
+    from aiohttp_micro.web.admission import AdmissionCollector, AIMDLimiter, Limiter
+    from aiohttp_micro.web.middlewares.admission import admission_middleware_factory, EXCLUDE_PATHS
+
+    limiters: Dict[str, Limiter] = {}
+
+    limiter: Optional[Limiter] = None
+    if adaptive:
+        limiter = AIMDLimiter(
+            limit=max_concurrency or min_limit,
+            max_queue=max_queue,
+            timeout=queue_timeout,
+            min_limit=min_limit,
+            max_limit=max_limit,
+            latency_threshold=latency_threshold,
+        )
+    elif max_concurrency:
+        limiter = Limiter(limit=max_concurrency, max_queue=max_queue, timeout=queue_timeout)
+
+    if limiter is not None:
+        limiters["global"] = limiter
+
+    route_limiters = {
+        path: Limiter(limit=limit, max_queue=max_queue, timeout=queue_timeout)
+        for path, limit in (route_limits or {}).items()
+    }
+    limiters.update(route_limiters)
+
+    app["admission_limiters"] = limiters
+
+    if "metrics_registry" in app:
+        register_collector(app, AdmissionCollector(limiters))
+
+    app.middlewares.append(  # type: ignore
+        admission_middleware_factory(
+            limiter=limiter,
+            route_limiters=route_limiters,
+            exclude_paths=EXCLUDE_PATHS if exclude_paths is None else exclude_paths,
+            retry_after=retry_after,
+        )
+    )
+
+
+def setup_tracing(
+    app: Application, exclude_routes: Optional[Iterable[str]] = None, sampling_rules: Optional["SamplingRules"] = None,
+) -> None:
+    """Trace requests which carry tracing context.
+
+    Requests without sampling decision in their context are sampled with
+    `zipkin.sample_rate` from config, or adaptively to keep around
+    `zipkin.spans_per_second` spans when it is set. `sampling_rules` override
+    sample rate for particular route names, routes of operations registered
+    by `setup_openapi` are named after operations.
+    """
+
+    from aiohttp_micro.core.tools.zipkin import AdaptiveSampler, RateSampler
+    from aiohttp_micro.web.middlewares.tracing import tracing_middleware_factory
+
     if not exclude_routes:
         exclude_routes = []
 
+    zipkin_config = app["config"].zipkin
+
+    sampler: RateSampler
+    if zipkin_config.spans_per_second:
+        sampler = AdaptiveSampler(zipkin_config.spans_per_second, rules=sampling_rules)
+    else:
+        sampler = RateSampler(zipkin_config.get_sample_rate(), rules=sampling_rules)
+
+    app["trace_sampler"] = sampler
+
     app.middlewares.append(  # type: ignore
-        tracing_middleware_factory(exclude_routes=["metrics", *exclude_routes])
+        tracing_middleware_factory(exclude_routes=["metrics", *exclude_routes], sampler=sampler)
+    )
+
+
+Operation = Tuple[str, str, "OperationView"]
+
+
+def setup_stage_timing(app: Application, server_timing: bool = False) -> None:
+    """Collect durations of operation handling stages.
+
+    Durations of parameters loading, payload loading, request processing and
+    response dumping are collected for every operation to
+    `operation_stage_latency_seconds` histogram when `setup_metrics` is
+    called first. With `server_timing` they are sent to clients in
+    `Server-Timing` response header too. Should be called before
+    `setup_openapi`.
+    """
+
+    if "metrics_registry" in app:
+        from prometheus_client import Histogram  # type: ignore
+
+        app["metrics"]["operation_stage_latency"] = Histogram(
+            "operation_stage_latency_seconds",
+            "Operation handling stage latency",
+            ("app_name", "operation", "stage"),
+            registry=app["metrics_registry"],
+        )
+
+    app["server_timing"] = server_timing
+
+
+def setup_offloading(
+    app: Application,
+    executor: Optional["Executor"] = None,
+    payload_size: int = 1024 * 1024,
+    response_items: int = 1000,
+) -> None:
+    """Load large payloads and dump large responses outside of event loop.
+
+    Payloads of at least `payload_size` bytes are loaded and responses of at
+    least `response_items` items are dumped in `executor` (default thread
+    pool of event loop). With process pool executor payloads are loaded and
+    responses dumped with fresh schema instances in worker processes, and
+    responses of operations overriding `process_response` are dumped in
+    event loop. Operations are processed in event loop only unless this is
+    called before `setup_openapi`.
+    """
+
+    from aiohttp_micro.web.offload import Offloader
+
+    metrics = {}
+    if "metrics_registry" in app:
+        from prometheus_client import Gauge, Histogram  # type: ignore
+
+        registry = app["metrics_registry"]
+        labels = ("app_name", "operation", "stage")
+        metrics = {
+            "offload_queued": Gauge(
+                "offload_queued_total",
+                "Loads and dumps submitted to executor and not finished yet",
+                labels,
+                registry=registry,
+                multiprocess_mode="livesum",
+            ),
+            "offload_wait": Histogram(
+                "offload_wait_seconds", "Time spent waiting for executor", labels, registry=registry,
+            ),
+            "offload_execution": Histogram(
+                "offload_execution_seconds", "Load and dump time in executor", labels, registry=registry,
+            ),
+        }
+        app["metrics"].update(metrics)
+
+    app["offloader"] = Offloader(
+        executor=executor,
+        payload_size=payload_size,
+        response_items=response_items,
+        app_name=app["app_name"],
+        metrics=metrics,
     )
 
 
-Operation = Tuple[str, str, openapi.OperationView]
+def setup_response_cache(app: Application, max_entries: int = 10000) -> None:
+    """Cache responses of operations with `cache_ttl`.
+
+    Responses are cached in shared in-memory cache of `max_entries` entries,
+    available as `response_cache`. Should be called before `setup_openapi`,
+    which sets up cache with defaults for operations with `cache_ttl`
+    otherwise.
+    """
+
+    from aiohttp_micro.web.cache import ResponseCache, ResponseCacheCollector
+
+    app["response_cache"] = ResponseCache(max_entries=max_entries)
+
+    if "metrics_registry" in app:
+        register_collector(app, ResponseCacheCollector(app["response_cache"]))
+
+
+def setup_batch(app: Application, path: str = "/api/batch", max_operations: int = 50, concurrency: int = 10) -> None:
+    """Run several operations in one request.
+
+    Up to `max_operations` operations registered by `setup_openapi` could be
+    run in one request to `path`, `concurrency` of them at a time. Operations
+    pass application middlewares like separate requests. Should be called
+    before `setup_openapi`, which registers batch operation along with others.
+    """
+
+    from aiohttp_micro.web.handlers.batch import BatchView
+
+    if "metrics_registry" in app:
+        from prometheus_client import Counter, Histogram  # type: ignore
+
+        app["metrics"]["batch_size"] = Histogram(
+            "batch_size",
+            "Operations in batch request",
+            ("app_name",),
+            buckets=(1, 2, 5, 10, 20, 50, 100),
+            registry=app["metrics_registry"],
+        )
+        app["metrics"]["batch_operations"] = Counter(
+            "batch_operations_total",
+            "Operations run in batch requests",
+            ("app_name", "operation", "status"),
+            registry=app["metrics_registry"],
+        )
+
+    view = BatchView(
+        name="batch", security=None, tags=["batch"], max_operations=max_operations, max_concurrency=concurrency
+    )
+    app["batch_operation"] = ("POST", path, view)
+
+
+def setup_operation_metrics(app: Application, operations: List[Operation]) -> None:
+    """Count conditional and coalesced requests of operations.
+
+    Operations with `conditional` count their `304 Not Modified` and full
+    responses in `conditional_requests_total` counter, operations with
+    `coalesce` count requests which shared response of identical request in
+    `coalesced_requests_total` counter.
+    """
+
+    from prometheus_client import Counter  # type: ignore
+
+    if any(view.conditional for _, _, view in operations):
+        app["metrics"]["conditional_requests"] = Counter(
+            "conditional_requests_total",
+            "Conditional GET requests by result",
+            ("app_name", "operation", "result"),
+            registry=app["metrics_registry"],
+        )
+
+    if any(view.coalesce for _, _, view in operations):
+        app["metrics"]["coalesced_requests"] = Counter(
+            "coalesced_requests_total",
+            "Requests served by response of identical request in progress",
+            ("app_name", "operation"),
+            registry=app["metrics_registry"],
+        )
 
 
 def setup_openapi(
@@ -131,30 +627,116 @@ def setup_openapi(
     operations: List[Operation],
     openapi_version: str = "3.0.2",
     path: str = "/api/spec.json",
+    yaml_path: Optional[str] = None,
     security: Optional[Tuple[str, Dict[str, str]]] = None,
+    cache_max_age: int = 86400,
+    spec_cache_path: Optional[str] = None,
 ) -> None:
+    """Register operations and expose API specification.
 
-    app["spec"] = APISpec(
-        title=title,
-        version=version,
-        openapi_version=openapi_version,
-        info={"description": description},
-        plugins=[MarshmallowPlugin()],
-    )
+    Stage timing, offloading, response cache and batch operation are
+    configured by `setup_stage_timing`, `setup_offloading`,
+    `setup_response_cache` and `setup_batch` called before, offloading is
+    enabled only by `setup_offloading`. Registered
+    operations are available by name as `operations`.
+
+    With `spec_cache_path` validated specification is stored to the file
+    along with fingerprint of operations and schemas it is generated from,
+    on next start with the same fingerprint it is loaded from the file
+    instead of being generated and validated again.
+
+    Generated specification is available as `spec_document`. `spec` holds
+    `APISpec` object only when specification is generated, not loaded from
+    cache, and is deprecated in favour of `spec_document`.
+    """
+
+    from aiohttp_micro.web.handlers import openapi
+
+    if "batch_operation" in app:
+        operations = [*operations, app["batch_operation"]]
 
-    if security:
-        app["spec"].components.security_scheme(*security)
+    if "metrics_registry" in app:
+        setup_operation_metrics(app, operations)
+
+    if "response_cache" not in app and any(view.cache_ttl for _, _, view in operations):
+        setup_response_cache(app)
+
+    app["security_schemes"] = dict([security]) if security else {}
 
     app.router.add_get(path, openapi.handler, name="api.spec")
+    if yaml_path:
+        app.router.add_get(yaml_path, openapi.yaml_handler, name="api.spec.yaml")
 
+    app["operations"] = {}
     for method, path, view in operations:
-        app.router.add_route(method, path, view.handle)
+        view.setup(app)
+        route = app.router.add_route(method, path, view.handle, name=view.name)
+        app["operations"][view.name] = (route, view)
+
+    spec_info = {
+        "title": title,
+        "version": version,
+        "description": description,
+        "openapi_version": openapi_version,
+        "security": security,
+    }
+    document = load_spec(app, spec_info, operations, spec_cache_path)
+    app["spec_document"] = openapi.SpecDocument(document, max_age=cache_max_age)
+
+
+def load_spec(
+    app: Application, spec_info: Dict[str, Any], operations: List[Operation], cache_path: Optional[str]
+) -> Dict[str, Any]:
+    """Load API specification from cache at `cache_path` or build it."""
+
+    from aiohttp_micro.web import spec_cache
+
+    app["spec_fingerprint"] = spec_cache.fingerprint(spec_info, operations)
+    app["spec_cache"] = cache_path
+
+    document = spec_cache.load_spec(cache_path, app["spec_fingerprint"]) if cache_path else None
+    if document is not None:
+        return document
+
+    spec = build_spec(spec_info, operations)
+    app["spec"] = spec
+    document = spec.to_dict()
+
+    if cache_path:
+        try:
+            spec_cache.save_spec(cache_path, app["spec_fingerprint"], document)
+        except OSError as exc:
+            # Read-only image, specification is built on every start then
+            if "logger" in app:
+                app["logger"].warning("Unable to save API specification cache", path=cache_path, error=exc)
+
+    return document
 
+
+def build_spec(spec_info: Dict[str, Any], operations: List[Operation]) -> "APISpec":
+    """Generate and validate API specification."""
+
+    from apispec import APISpec  # type: ignore
+    from apispec.ext.marshmallow import MarshmallowPlugin  # type: ignore
+    from apispec.utils import validate_spec  # type: ignore
+
+    spec = APISpec(
+        title=spec_info["title"],
+        version=spec_info["version"],
+        openapi_version=spec_info["openapi_version"],
+        info={"description": spec_info["description"]},
+        plugins=[MarshmallowPlugin()],
+    )
+
+    if spec_info["security"]:
+        spec.components.security_scheme(*spec_info["security"])
+
+    for method, path, view in operations:
         operation = view.spec.generate()
         operation.setdefault("description", view.__doc__)
 
-        app["spec"].path(
-            path=path, operations={method.lower(): operation},
-        )
+        spec.path(path=path, operations={method.lower(): operation})
+
+    validate_spec(spec)
 
-    validate_spec(app["spec"])
+    return spec
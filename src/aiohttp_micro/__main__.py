@@ -1,4 +1,5 @@
 import asyncio
+import functools
 
 import click
 import uvloop  # type: ignore
@@ -7,6 +8,7 @@ from config import EnvValueProvider, load
 from aiohttp_micro import AppConfig
 from aiohttp_micro.app import init
 from aiohttp_micro.cli.server import server
+from aiohttp_micro.cli.spec import spec
 
 
 @click.group()
@@ -19,14 +21,14 @@ def cli(ctx, debug: bool = False) -> None:
     config = AppConfig(defaults={"debug": debug})
     load(config, providers=[EnvValueProvider()])
 
-    app = init("micro", config)
-
-    ctx.obj["app"] = app
+    # Application is created by commands, server could need to prepare process before that
+    ctx.obj["init_app"] = functools.partial(init, "micro", config)
     ctx.obj["config"] = config
     ctx.obj["loop"] = loop
 
 
 cli.add_command(server, name="server")
+cli.add_command(spec, name="spec")
 
 
 if __name__ == "__main__":
@@ -74,6 +74,7 @@ def init(app_name: str, cfg: AppConfig) -> web.Application:
             (METH_GET, "/api/items", GetItemsView(name="getItems", security="TokenAuth", tags=["items"]),),
         ],
         security=("TokenAuth", {"type": "apiKey", "name": "X-Access-Token", "in": "header"}),
+        spec_cache_path=cfg.spec_cache,
     )
 
     app["logger"].info("Initialize application")
@@ -0,0 +1,11 @@
+import click
+from aiohttp import web
+
+
+def get_app(ctx: click.Context) -> web.Application:
+    """Application of command, created on first use by `init_app` factory unless `app` is given."""
+
+    if "app" not in ctx.obj:
+        ctx.obj["app"] = ctx.obj["init_app"]()
+
+    return ctx.obj["app"]
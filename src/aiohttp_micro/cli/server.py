@@ -1,9 +1,17 @@
+import functools
+import os
+import shutil
 import socket
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 import click
 from aiohttp import web
 
-from aiohttp_micro.core.tools.zipkin import create_tracer
+from aiohttp_micro import enable_multiprocess_metrics, setup_multiprocess_metrics
+from aiohttp_micro.cli import get_app
+from aiohttp_micro.cli.supervisor import create_socket, Supervisor
 
 
 def get_address(default: str = "127.0.0.1") -> str:
@@ -32,10 +40,9 @@ def server(ctx):
 @click.option("--host", default=None, help="Specify application host")
 @click.option("--port", default=5000, help="Specify application port")
 @click.option("--tags", "-t", multiple=True, help="Specify tags for Consul Catalog")
+@click.option("--workers", "-w", default=1, help="Specify number of worker processes")
 @click.pass_context
-def run(ctx, host, port, tags):
-    app = ctx.obj["app"]
-
+def run(ctx, host, port, tags, workers):
     try:
         port = int(port)
 
@@ -50,10 +57,54 @@ def run(ctx, host, port, tags):
     else:
         address = get_address()
 
-    app.cleanup_ctx.append(create_tracer(host, port))
+    with multiprocess_metrics_dir(workers) as metrics_dir:
+        app = get_app(ctx)
+
+        from aiohttp_micro.core.tools.zipkin import create_tracer
+
+        app.cleanup_ctx.append(create_tracer(host, port))
+
+        app["logger"].info(f"Application serving on http://{address}:{port}", workers=workers)
+
+        if metrics_dir:
+            run_workers(app, host, port, workers, metrics_dir)
+        else:
+            web.run_app(app, host=host, port=port, print=None)
+
+        app["logger"].info("Shutdown application")
+
+
+@contextmanager
+def multiprocess_metrics_dir(workers: int) -> Iterator[Optional[str]]:
+    """Directory for metrics of worker processes, temporary one unless configured."""
+
+    if workers < 2:
+        yield None
+        return
+
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR", None)
+    temporary_dir = None
+    if not metrics_dir:
+        metrics_dir = temporary_dir = tempfile.mkdtemp(prefix="metrics-")
+
+    # Metrics created along with application and its operations are shared by workers too
+    enable_multiprocess_metrics(metrics_dir)
+
+    try:
+        yield metrics_dir
+    finally:
+        if temporary_dir:
+            shutil.rmtree(temporary_dir, ignore_errors=True)
+
+
+def run_workers(app: web.Application, host: str, port: int, workers: int, metrics_dir: str) -> None:
+    on_worker_exit = None
+    if "metrics_registry" in app:
+        setup_multiprocess_metrics(app, metrics_dir)
 
-    app["logger"].info(f"Application serving on http://{address}:{port}")
+        from prometheus_client.multiprocess import mark_process_dead  # type: ignore
 
-    web.run_app(app, host=host, port=port, print=None)
+        on_worker_exit = functools.partial(mark_process_dead, path=metrics_dir)
 
-    app["logger"].info("Shutdown application")
+    supervisor = Supervisor(app, create_socket(host, port), workers, on_worker_exit=on_worker_exit)
+    supervisor.run()
@@ -0,0 +1,27 @@
+import click
+
+from aiohttp_micro.cli import get_app
+from aiohttp_micro.web.spec_cache import save_spec
+
+
+@click.group()
+@click.pass_context
+def spec(ctx):
+    pass
+
+
+@spec.command()
+@click.option("--output", "-o", default=None, help="Specify spec cache file, configured one by default")
+@click.pass_context
+def build(ctx, output):
+    """Build and validate API specification ahead of application start."""
+
+    app = get_app(ctx)
+
+    path = output or app["spec_cache"]
+    if not path:
+        raise click.UsageError("Spec cache file is neither configured nor specified")
+
+    save_spec(path, app["spec_fingerprint"], app["spec_document"].to_dict())
+
+    click.echo(f"API specification saved to {path}")
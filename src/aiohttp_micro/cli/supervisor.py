@@ -0,0 +1,171 @@
+import asyncio
+import os
+import signal
+import socket
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+from aiohttp import web
+from aiohttp.web_runner import GracefulExit
+
+
+WorkerExitCallback = Callable[[int], None]
+
+FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+def create_socket(host: str, port: int, backlog: int = 128) -> socket.socket:
+    """Create listening socket shared by application workers."""
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+
+    return sock
+
+
+def graceful_exit() -> None:
+    raise GracefulExit()
+
+
+async def handle_signals(app: web.Application) -> None:
+    asyncio.get_event_loop().add_signal_handler(signal.SIGTERM, graceful_exit)
+
+
+def serve(app: web.Application, sock: socket.socket) -> None:
+    """Run application in forked worker process.
+
+    Workers ignore SIGINT, terminal sends it to the whole process group, and
+    supervisor forwards it as SIGTERM, so workers stop gracefully only once.
+    """
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+    if "logger" in app:
+        app["logger"] = app["logger"].bind(pid=os.getpid())
+
+    # Worker terminated before startup has nothing to shut down gracefully
+    app.on_startup.insert(0, handle_signals)
+
+    web.run_app(app, sock=sock, print=None, handle_signals=False)
+
+
+class Supervisor:
+    """Run application in several forked workers sharing the same socket.
+
+    Crashed workers are restarted. The first SIGINT or SIGTERM is forwarded
+    to workers as SIGTERM for graceful shutdown, workers which are still alive
+    after `shutdown_timeout` are killed.
+    """
+
+    def __init__(
+        self,
+        app: web.Application,
+        sock: socket.socket,
+        workers: int,
+        on_worker_exit: Optional[WorkerExitCallback] = None,
+        restart_delay: float = 1.0,
+        shutdown_timeout: float = 60.0,
+    ) -> None:
+        self._app = app
+        self._sock = sock
+        self._workers = workers
+        self._on_worker_exit = on_worker_exit
+        self._restart_delay = restart_delay
+        self._shutdown_timeout = shutdown_timeout
+
+        self._pids: Dict[int, float] = {}
+        self._stopping_since: Optional[float] = None
+
+    def log(self, message: str, **kwargs) -> None:
+        if "logger" in self._app:
+            self._app["logger"].info(message, **kwargs)
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                serve(self._app, self._sock)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self._pids[pid] = time.monotonic()
+        self.log("Start worker", worker_pid=pid)
+
+        return pid
+
+    def stop(self, signum: int, frame=None) -> None:
+        # Workers are already stopping, repeated signal would interrupt their graceful shutdown
+        if self._stopping_since is not None:
+            return
+
+        self._stopping_since = time.monotonic()
+        self.log("Stop workers", signal=signal.Signals(signum).name)
+
+        self.kill(signal.SIGTERM)
+
+    def kill(self, signum: int) -> None:
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def reap(self) -> None:
+        while self._pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._pids.clear()
+                return
+
+            if pid == 0:
+                return
+
+            started_at = self._pids.pop(pid, None)
+            if started_at is None:
+                continue
+
+            if self._on_worker_exit:
+                self._on_worker_exit(pid)
+
+            if self._stopping_since is None:
+                self.log("Worker exited unexpectedly", worker_pid=pid, status=status)
+
+                if time.monotonic() - started_at < self._restart_delay:
+                    time.sleep(self._restart_delay)
+
+                self.spawn()
+
+    def run(self) -> None:
+        for signum in FORWARDED_SIGNALS:
+            signal.signal(signum, self.stop)
+
+        for _ in range(self._workers):
+            self.spawn()
+
+        while self._pids:
+            self.reap()
+
+            if self._stopping_since is not None:
+                if time.monotonic() - self._stopping_since > self._shutdown_timeout:
+                    self.kill(signal.SIGKILL)
+
+            time.sleep(0.1)
+
+        self._sock.close()
@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import hmac
+import secrets
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import orjson
+
+from aiohttp_micro.core.entities import CursorFilters
+from aiohttp_micro.core.exceptions import InvalidCursor
+
+
+T = TypeVar("T")
+
+SIGNATURE_SIZE = 16
+
+
+class CursorCodec:
+    """Encode sort keys to opaque cursors signed with HMAC-SHA256.
+
+    Cursors are valid only for codecs with the same `secret`, random secret is
+    generated by default.
+    """
+
+    def __init__(self, secret: Optional[bytes] = None) -> None:
+        self._secret = secret or secrets.token_bytes(32)
+
+    def _sign(self, data: bytes) -> bytes:
+        return hmac.new(self._secret, data, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+    def encode(self, key: Sequence[Any]) -> str:
+        data = orjson.dumps(list(key))
+        return base64.urlsafe_b64encode(self._sign(data) + data).rstrip(b"=").decode("ascii")
+
+    def decode(self, cursor: str) -> Tuple[Any, ...]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        except ValueError:
+            raise InvalidCursor(cursor)
+
+        signature, data = raw[:SIGNATURE_SIZE], raw[SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, self._sign(data)):
+            raise InvalidCursor(cursor)
+
+        try:
+            key = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            raise InvalidCursor(cursor)
+
+        if not isinstance(key, list):
+            raise InvalidCursor(cursor)
+
+        return tuple(key)
+
+
+def make_page(
+    items: List[T], filters: CursorFilters, key: Callable[[T], Sequence[Any]], codec: CursorCodec
+) -> Dict[str, Any]:
+    """Build collection page with cursors of adjacent pages.
+
+    `items` should be fetched with `filters.fetch_limit` limit in sort order,
+    or in reverse sort order when `filters.backward` is set.
+    """
+
+    has_more = len(items) > filters.limit
+    items = items[: filters.limit]
+
+    if filters.backward:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, filters.after is not None
+
+    return {
+        "items": items,
+        "next": codec.encode(key(items[-1])) if items and has_next else None,
+        "prev": codec.encode(key(items[0])) if items and has_prev else None,
+    }
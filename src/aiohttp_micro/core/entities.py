@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Any, Optional, Tuple
 
 
 @dataclass
@@ -15,3 +16,23 @@ class Payload:
 class Filters:
     limit: int = 10
     offset: int = 0
+
+
+@dataclass
+class CursorFilters:
+    limit: int = 10
+    # Sort key of the last item on previous page or of the first item on next page
+    after: Optional[Tuple[Any, ...]] = None
+    before: Optional[Tuple[Any, ...]] = None
+
+    @property
+    def backward(self) -> bool:
+        """Items should be fetched in reverse sort order."""
+
+        return self.before is not None
+
+    @property
+    def fetch_limit(self) -> int:
+        """Number of items to fetch to find out whether there are more pages."""
+
+        return self.limit + 1
@@ -4,3 +4,7 @@ class EntityAlreadyExist(Exception):
 
 class EntityNotFound(Exception):
     pass
+
+
+class InvalidCursor(Exception):
+    pass
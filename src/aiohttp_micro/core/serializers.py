@@ -0,0 +1,281 @@
+"""Generated dump functions for schemas.
+
+Dumper compiles a specialized function for every type of object it serializes
+when it meets this type for the first time. Generated functions read attributes
+or keys directly, apply `data_key` renames and drop `None` values inline for
+`EntitySchema`, so dumping entities neither deep-copies them with
+`dataclasses.asdict` nor walks the result again in `post_dump` hooks.
+
+Schemas which could behave differently on the fast path (custom dump hooks,
+`Method` or `Function` fields, custom attribute getters, etc.) fall back
+to `Schema.dump`, so result is always the same as the regular dump.
+"""
+import copy
+from dataclasses import asdict, fields as dataclass_fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from marshmallow import fields, missing, Schema
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+from aiohttp_micro.core.schemas import EntitySchema, EnumField
+
+
+DumpFunction = Callable[[Any], Any]
+
+PRIMITIVES = (str, int, float, bool, type(None))
+UNSUPPORTED_FIELDS = (fields.Function, fields.Method, fields.Pluck)
+
+
+def plain(value: Any) -> Any:
+    """Convert dataclasses inside value to dicts the same way as `dataclasses.asdict` does."""
+
+    if value.__class__ in PRIMITIVES:
+        return value
+
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*[plain(item) for item in value])
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(plain(item) for item in value)
+
+    if isinstance(value, dict):
+        return type(value)((plain(key), plain(item)) for key, item in value.items())
+
+    return value
+
+
+def is_many(field_obj: fields.Nested) -> bool:
+    # `Nested` dumps lists when either field or schema instance passed to it has `many`
+    return field_obj.many or field_obj.schema.many
+
+
+def item_schema(schema: Schema) -> Schema:
+    """Schema dumping single items of `many` schema."""
+
+    if not schema.many:
+        return schema
+
+    item = schema.__dict__.get("_item_schema", None)
+    if item is None:
+        item = copy.copy(schema)
+        item.__dict__.pop("_fast_dumper", None)
+        item.many = False
+        schema.__dict__["_item_schema"] = item
+
+    return item
+
+
+def has_dump_hooks(schema: Schema, allowed: Tuple[str, ...] = ()) -> bool:
+    hooks = schema._hooks
+
+    for tag in (PRE_DUMP, POST_DUMP):
+        if hooks[(tag, True)]:
+            return True
+
+        if any(attr_name not in allowed for attr_name in hooks[(tag, False)]):
+            return True
+
+    return False
+
+
+def is_supported_field(field_obj: fields.Field) -> bool:
+    if isinstance(field_obj, UNSUPPORTED_FIELDS):
+        return False
+
+    if isinstance(field_obj, fields.Nested):
+        return True
+
+    if isinstance(field_obj, fields.List):
+        return is_supported_field(field_obj.inner)
+
+    return isinstance(field_obj, EnumField) or type(field_obj).__module__.startswith("marshmallow.")
+
+
+def is_supported_schema(schema: Schema) -> bool:
+    if schema.many or schema.ordered:
+        return False
+
+    if type(schema).get_attribute is not Schema.get_attribute:
+        return False
+
+    if isinstance(schema, EntitySchema):
+        if not getattr(schema, "entity_cls", None) or not is_dataclass(schema.entity_cls):
+            return False
+
+        schema_cls = type(schema)
+        if (
+            schema_cls.serialize_entity is not EntitySchema.serialize_entity
+            or schema_cls.cleanup is not EntitySchema.cleanup
+        ):
+            return False
+
+        if has_dump_hooks(schema, allowed=("serialize_entity", "cleanup")):
+            return False
+    elif has_dump_hooks(schema):
+        return False
+
+    for name, field_obj in schema.dump_fields.items():
+        if "." in (field_obj.attribute or name) or not is_supported_field(field_obj):
+            return False
+
+    return True
+
+
+class FunctionBuilder:
+    def __init__(self, schema: Schema, name: str, entity_fields: Optional[Tuple[str, ...]] = None) -> None:
+        self.schema = schema
+        self.name = name
+        self.entity_fields = entity_fields
+        self.drop_none = isinstance(schema, EntitySchema)
+
+        self.namespace: Dict[str, Any] = {
+            "_get_attribute": schema.get_attribute,
+            "_missing": missing,
+            "_plain": plain,
+        }
+        self.lines: List[str] = [f"def {name}(obj):", "    out = {}"]
+
+    @property
+    def from_entity(self) -> bool:
+        return self.entity_fields is not None
+
+    def bind(self, prefix: str, value: Any) -> str:
+        name = f"_{prefix}{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def value_expression(self, field_obj: fields.Field, attr: str) -> str:
+        """Python expression which serializes present value `v` of field."""
+
+        if isinstance(field_obj, fields.Nested):
+            if is_many(field_obj):
+                return f"None if v is None else [{self.nested_expression(field_obj, 'x')} for x in v]"
+            return f"None if v is None else {self.nested_expression(field_obj, 'v')}"
+
+        if isinstance(field_obj, fields.List) and isinstance(field_obj.inner, fields.Nested):
+            inner = field_obj.inner
+            if is_many(inner):
+                item = f"None if x is None else [{self.nested_expression(inner, 'y')} for y in x]"
+            else:
+                item = f"None if x is None else {self.nested_expression(inner, 'x')}"
+            return f"None if v is None else [{item} for x in v]"
+
+        value = "_plain(v)" if self.from_entity else "v"
+        serialize = f"{self.bind('f', field_obj)}._serialize({value}, {attr!r}, obj)"
+
+        exact_type = None
+        if isinstance(field_obj, fields.Boolean):
+            exact_type = "bool"
+        elif isinstance(field_obj, fields.Integer) and not field_obj.as_string:
+            exact_type = "int"
+        elif isinstance(field_obj, fields.Float) and not field_obj.as_string:
+            exact_type = "float"
+        elif type(field_obj) is fields.String:
+            exact_type = "str"
+
+        if exact_type:
+            return f"v if v.__class__ is {exact_type} else {serialize}"
+
+        return serialize
+
+    def nested_expression(self, field_obj: fields.Nested, var: str) -> str:
+        nested = item_schema(field_obj.schema)
+        dumper = self.bind("d", get_dumper(nested))
+
+        if not self.from_entity:
+            return f"{dumper}({var})"
+
+        if isinstance(nested, EntitySchema):
+            entity_cls = self.bind("e", nested.entity_cls)
+            return f"{dumper}({var} if isinstance({var}, {entity_cls}) else _plain({var}))"
+
+        return f"{dumper}(_plain({var}))"
+
+    def store(self, key: str, indent: str) -> None:
+        if self.drop_none:
+            self.lines.append(f"{indent}if v is not None:")
+            self.lines.append(f"{indent}    out[{key!r}] = v")
+        else:
+            self.lines.append(f"{indent}out[{key!r}] = v")
+
+    def add_field(self, name: str, field_obj: fields.Field) -> None:
+        attr = field_obj.attribute or name
+        key = field_obj.data_key if field_obj.data_key is not None else name
+        expression = self.value_expression(field_obj, attr)
+
+        if self.from_entity and attr in self.entity_fields and attr.isidentifier():
+            self.lines.append(f"    v = obj.{attr}")
+            self.lines.append(f"    v = {expression}")
+            self.store(key, "    ")
+            return
+
+        field_ref = self.bind("f", field_obj)
+        if self.from_entity:
+            # Attribute is not a dataclass field, so `asdict` result does not contain it.
+            self.lines.append(f"    v = {field_ref}.serialize({name!r}, {{}}, accessor=_get_attribute)")
+            self.lines.append("    if v is not _missing:")
+            self.store(key, "        ")
+            return
+
+        self.lines.append(f"    v = obj.get({attr!r}, _missing)")
+        self.lines.append("    if v is _missing:")
+        self.lines.append(f"        v = {field_ref}.serialize({name!r}, obj, accessor=_get_attribute)")
+        self.lines.append("        if v is not _missing:")
+        self.store(key, "            ")
+        self.lines.append("    else:")
+        self.lines.append(f"        v = {expression}")
+        self.store(key, "        ")
+
+    def build(self) -> DumpFunction:
+        for name, field_obj in self.schema.dump_fields.items():
+            self.add_field(name, field_obj)
+
+        self.lines.append("    return out")
+
+        exec("\n".join(self.lines), self.namespace)  # noqa: S102
+        return self.namespace[self.name]
+
+
+class Dumper:
+    """Dump objects with functions generated per schema and object type."""
+
+    def __init__(self, schema: Schema) -> None:
+        self.schema = schema
+        self._functions: Dict[Type[Any], DumpFunction] = {}
+
+    def __call__(self, obj: Any) -> Any:
+        function = self._functions.get(obj.__class__, None)
+        if function is None:
+            function = self._functions[obj.__class__] = self.compile(obj.__class__)
+
+        return function(obj)
+
+    def compile(self, obj_cls: Type[Any]) -> DumpFunction:
+        schema_name = type(self.schema).__name__
+
+        if obj_cls is dict:
+            return FunctionBuilder(self.schema, f"dump_{schema_name}_dict").build()
+
+        entity_cls = getattr(self.schema, "entity_cls", None)
+        if isinstance(self.schema, EntitySchema) and issubclass(obj_cls, entity_cls) and is_dataclass(obj_cls):
+            entity_fields = tuple(item.name for item in dataclass_fields(obj_cls))
+            return FunctionBuilder(self.schema, f"dump_{schema_name}_{obj_cls.__name__}", entity_fields).build()
+
+        return self.schema.dump
+
+
+def get_dumper(schema: Schema) -> DumpFunction:
+    """Get fast dump function for schema instance.
+
+    Returns `schema.dump` itself if schema is not supported by generated dumpers.
+    """
+
+    dumper = schema.__dict__.get("_fast_dumper", None)
+    if dumper is None:
+        dumper = Dumper(schema) if is_supported_schema(schema) else schema.dump
+        schema.__dict__["_fast_dumper"] = dumper
+
+    return dumper
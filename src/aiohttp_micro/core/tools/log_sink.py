@@ -0,0 +1,199 @@
+import os
+import queue
+import sys
+import threading
+import weakref
+from enum import Enum
+from typing import BinaryIO, Iterator, List, Optional
+
+
+class OverflowPolicy(Enum):
+    # Drop new lines while queue is full
+    drop = "drop"
+    # Keep every `sample_rate` line while queue is more than half full, drop new lines while it is full
+    sample = "sample"
+    # Wait for free space in queue up to `block_timeout` seconds, then drop line
+    block = "block"
+
+
+class LogSink:
+    """Write log lines to file in batches from background thread.
+
+    Logger calls only put rendered lines into bounded in-memory queue, so slow
+    writes to stdout do not block event loop. Lines written after sink was
+    closed go to file directly.
+    """
+
+    def __init__(
+        self,
+        file: Optional[BinaryIO] = None,
+        max_size: int = 10000,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        policy: OverflowPolicy = OverflowPolicy.drop,
+        sample_rate: int = 10,
+        block_timeout: float = 1.0,
+    ) -> None:
+        self._file = file or sys.stdout.buffer
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._policy = policy
+        self._sample_rate = sample_rate
+        self._block_timeout = block_timeout
+
+        self.dropped = 0
+        self.sampled = 0
+        self._received = 0
+        self._closed = False
+
+        self._start()
+        SINKS.add(self)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _start(self) -> None:
+        # Worker thread does not survive fork, so child process starts its own one
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=self._max_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        if not self._closed:
+            self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+            self._thread.start()
+
+    def write(self, line: bytes) -> None:
+        if self._closed:
+            self._write([line])
+            return
+
+        self._received += 1
+
+        if self._policy == OverflowPolicy.sample and self._queue.qsize() >= self._max_size // 2:
+            if self._received % self._sample_rate:
+                self.sampled += 1
+                return
+
+        try:
+            if self._policy == OverflowPolicy.block:
+                self._queue.put(line, timeout=self._block_timeout)
+            else:
+                self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def _batches(self) -> Iterator[List[bytes]]:
+        while True:
+            try:
+                line = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+
+            if line is None:
+                break
+
+            batch = [line]
+            while len(batch) < self._batch_size:
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if line is None:
+                    yield batch
+                    return
+
+                batch.append(line)
+
+            yield batch
+
+    def _write(self, batch: List[bytes]) -> None:
+        with self._lock:
+            self._file.write(b"".join(batch))
+            self._file.flush()
+
+    def _run(self) -> None:
+        for batch in self._batches():
+            self._write(batch)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush queued lines and stop background thread."""
+
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._thread:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+
+            self._thread.join(timeout)
+
+        lines = []
+        while True:
+            try:
+                line = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if line is not None:
+                lines.append(line)
+
+        if lines:
+            self._write(lines)
+
+
+# Live sinks restarted in child processes by single fork hook, closed ones are collected
+SINKS: "weakref.WeakSet[LogSink]" = weakref.WeakSet()
+
+
+def restart_sinks() -> None:
+    for sink in list(SINKS):
+        sink._start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=restart_sinks)
+
+
+class SinkLogger:
+    """structlog logger which writes rendered lines to `LogSink`."""
+
+    def __init__(self, sink: LogSink) -> None:
+        self._sink = sink
+
+    def msg(self, message: bytes) -> None:
+        self._sink.write(message + b"\n")
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+class SinkLoggerFactory:
+    def __init__(self, sink: LogSink) -> None:
+        self._sink = sink
+
+    def __call__(self, *args) -> SinkLogger:
+        return SinkLogger(self._sink)
+
+
+class LogSinkCollector:
+    """Expose log sink queue depth and dropped lines as metrics."""
+
+    def __init__(self, sink: LogSink) -> None:
+        self._sink = sink
+
+    def collect(self):
+        # Imported here, sink is used by applications with or without metrics
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily  # type: ignore
+
+        yield GaugeMetricFamily("log_sink_queue_depth", "Log lines waiting to be written", value=self._sink.depth)
+
+        dropped = CounterMetricFamily("log_sink_dropped_lines", "Log lines dropped by sink", labels=("reason",))
+        dropped.add_metric(("overflow",), self._sink.dropped)
+        dropped.add_metric(("sampled",), self._sink.sampled)
+        yield dropped
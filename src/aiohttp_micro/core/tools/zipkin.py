@@ -1,11 +1,266 @@
+import asyncio
+import gzip
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
 import aiozipkin as az
-from aiohttp import web
+import orjson  # type: ignore
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector, web
+from aiozipkin.record import Record
+from aiozipkin.transport import TransportABC
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, SummaryMetricFamily  # type: ignore
+
+from aiohttp_micro import register_collector, unregister_collector
+
+
+SamplingRules = Dict[str, float]
+
+
+class RateSampler:
+    """Sample fixed share of requests, optionally different for some routes."""
+
+    def __init__(
+        self, rate: float, rules: Optional[SamplingRules] = None, rand: Callable[[], float] = random.random
+    ) -> None:
+        self._rate = rate
+        self._rules = rules or {}
+        self._random = rand
+
+    def sample(self, rate: float) -> bool:
+        return rate >= 1.0 or (rate > 0.0 and self._random() < rate)
+
+    def is_sampled(self, route_name: Optional[str] = None) -> bool:
+        return self.sample(self._rules.get(route_name, self._rate))
+
+
+class AdaptiveSampler(RateSampler):
+    """Adjust sampling rate to keep spans rate near `target` spans per second.
+
+    Rate is recalculated every `interval` seconds from the number of requests
+    observed during previous interval. Routes with explicit rules are sampled
+    with their own rates and are not counted.
+    """
+
+    def __init__(
+        self,
+        target: float,
+        rules: Optional[SamplingRules] = None,
+        interval: float = 1.0,
+        rand: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(1.0, rules, rand)
+
+        self._target = target
+        self._interval = interval
+        self._clock = clock
+
+        self._requests = 0
+        self._window_started_at = clock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def is_sampled(self, route_name: Optional[str] = None) -> bool:
+        if route_name in self._rules:
+            return self.sample(self._rules[route_name])
+
+        self._requests += 1
+
+        now = self._clock()
+        elapsed = now - self._window_started_at
+        if elapsed >= self._interval:
+            observed = self._requests / elapsed
+            self._rate = min(1.0, self._target / observed)
+
+            self._requests = 0
+            self._window_started_at = now
+
+        return self.sample(self._rate)
+
+
+class BatchTransport(TransportABC):
+    """Send spans to Zipkin collector in gzip-compressed batches.
+
+    Spans are kept in bounded queue and new ones are dropped while it is full.
+    Queue is flushed every `flush_interval` seconds or as soon as `batch_size`
+    spans are collected. Batches which could not be delivered are dropped too.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        max_queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        timeout: float = 5.0,
+        compress_level: int = 6,
+    ) -> None:
+        self._address = address
+        self._max_queue_size = max_queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._compress_level = compress_level
+
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+        self.export_count = 0
+        self.export_time = 0.0
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._batch_ready = asyncio.Event()
+        self._closing = False
+
+        self._session = ClientSession(
+            connector=TCPConnector(limit=1),
+            timeout=ClientTimeout(total=timeout),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        self._task = asyncio.ensure_future(self._run())
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def send(self, record: Record) -> None:
+        if self._closing or len(self._queue) >= self._max_queue_size:
+            self.dropped += 1
+            return
+
+        self._queue.append(record.asdict())
+        if len(self._queue) >= self._batch_size:
+            self._batch_ready.set()
 
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
 
-def create_tracer(host: str, port: int):
+            self._batch_ready.clear()
+            await self.flush()
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        size = min(len(self._queue), self._batch_size)
+        return [self._queue.popleft() for _ in range(size)]
+
+    async def flush(self) -> None:
+        while self._queue:
+            await self._export(self._next_batch())
+
+    async def _export(self, batch: List[Dict[str, Any]]) -> None:
+        body = gzip.compress(orjson.dumps(batch), compresslevel=self._compress_level)
+
+        started_at = time.monotonic()
+        try:
+            async with self._session.post(self._address, data=body) as resp:
+                await resp.read()
+                resp.raise_for_status()
+        except (asyncio.TimeoutError, ClientError):
+            self.failed += len(batch)
+        else:
+            self.exported += len(batch)
+        finally:
+            self.export_count += 1
+            self.export_time += time.monotonic() - started_at
+
+    async def close(self) -> None:
+        if self._closing:
+            return
+
+        self._closing = True
+        self._batch_ready.set()
+
+        await self._task
+        await self.flush()
+        await self._session.close()
+
+
+class BatchTransportCollector:
+    """Expose span export queue depth, latency and dropped spans as metrics."""
+
+    def __init__(self, transport: BatchTransport) -> None:
+        self._transport = transport
+
+    def collect(self):
+        yield GaugeMetricFamily(
+            "zipkin_export_queue_depth", "Spans waiting to be exported", value=self._transport.depth
+        )
+
+        yield CounterMetricFamily(
+            "zipkin_exported_spans", "Spans exported to collector", value=self._transport.exported
+        )
+
+        dropped = CounterMetricFamily("zipkin_dropped_spans", "Spans dropped by exporter", labels=("reason",))
+        dropped.add_metric(("overflow",), self._transport.dropped)
+        dropped.add_metric(("error",), self._transport.failed)
+        yield dropped
+
+        yield SummaryMetricFamily(
+            "zipkin_export_latency",
+            "Span batch export latency",
+            count_value=self._transport.export_count,
+            sum_value=self._transport.export_time,
+        )
+
+
+class LocalCollector:
+    """In-process Zipkin-compatible collector which keeps received spans in memory.
+
+    Meant for tests and benchmarks: serve `create_app()` with aiohttp test
+    server and point exporter to `/api/v2/spans` on it. `delay` and `status`
+    simulate slow or failing collector.
+    """
+
+    def __init__(self, delay: float = 0.0, status: int = 202) -> None:
+        self.delay = delay
+        self.status = status
+
+        self.spans: List[Dict[str, Any]] = []
+        self.batches = 0
+
+    async def handler(self, request: web.Request) -> web.Response:
+        # aiohttp decompresses request body according to `Content-Encoding` header
+        body = await request.read()
+
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        if self.status < 300:
+            self.batches += 1
+            self.spans.extend(orjson.loads(body))
+
+        return web.Response(status=self.status)
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/v2/spans", self.handler)
+        return app
+
+
+def create_tracer(host: str, port: int, flush_interval: float = 1.0):
     async def ctx(app: web.Application):
+        zipkin_config = app["config"].zipkin
+
+        transport = BatchTransport(
+            zipkin_config.get_address(),
+            max_queue_size=zipkin_config.queue_size,
+            batch_size=zipkin_config.batch_size,
+            flush_interval=flush_interval,
+        )
+
+        collector = None
+        if "metrics_registry" in app:
+            collector = BatchTransportCollector(transport)
+            register_collector(app, collector)
+
         endpoint = az.create_endpoint(app["app_name"], ipv4=host, port=port)
-        tracer = await az.create(app["config"].zipkin.get_address(), local_endpoint=endpoint, sample_rate=1.0)
+        tracer = az.Tracer(transport, az.Sampler(sample_rate=zipkin_config.get_sample_rate()), endpoint)
 
         app["tracer"] = tracer
 
@@ -13,4 +268,7 @@ def create_tracer(host: str, port: int):
 
         await tracer.close()
 
+        if collector:
+            unregister_collector(app, collector)
+
     return ctx
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily  # type: ignore
+
+
+QUEUE_FULL = "queue_full"
+TIMEOUT = "timeout"
+
+
+class Limiter:
+    """Concurrency limit with bounded FIFO queue of waiting requests.
+
+    Request waits for free slot up to `timeout` seconds when limit is reached,
+    requests over `max_queue` waiting ones are rejected at once.
+    """
+
+    def __init__(self, limit: int, max_queue: int = 100, timeout: float = 1.0) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected: Dict[str, int] = {QUEUE_FULL: 0, TIMEOUT: 0}
+
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """Take slot, returns rejection reason if request should be shed."""
+
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return None
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected[QUEUE_FULL] += 1
+            return QUEUE_FULL
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            # Slot could be handed over right before timeout
+            if waiter.done() and not waiter.cancelled():
+                return None
+
+            self._discard(waiter)
+            self.rejected[TIMEOUT] += 1
+            return TIMEOUT
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+        return None
+
+    def release(self, latency: Optional[float] = None) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _discard(self, waiter: "asyncio.Future[None]") -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class AIMDLimiter(Limiter):
+    """Limiter which finds concurrency limit from observed latency.
+
+    Limit grows by one while it is fully used and requests complete within
+    `latency_threshold` seconds and shrinks by `backoff` factor, at most once
+    per `latency_threshold`, when they do not.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int = 100,
+        timeout: float = 1.0,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        latency_threshold: float = 1.0,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(limit=limit, max_queue=max_queue, timeout=timeout)
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_threshold = latency_threshold
+        self.backoff = backoff
+
+        self._clock = clock
+        self._decreased_at = float("-inf")
+
+    def release(self, latency: Optional[float] = None) -> None:
+        if latency is not None:
+            if latency > self.latency_threshold:
+                now = self._clock()
+                if now - self._decreased_at >= self.latency_threshold:
+                    self.limit = max(self.min_limit, int(self.limit * self.backoff))
+                    self._decreased_at = now
+            elif self.in_flight >= self.limit:
+                self.limit = min(self.max_limit, self.limit + 1)
+
+        super().release(latency)
+
+
+class AdmissionCollector:
+    """Expose limits, in-flight and queued requests and rejections of limiters."""
+
+    def __init__(self, limiters: Dict[str, Limiter]) -> None:
+        self._limiters = limiters
+
+    def collect(self):
+        limit = GaugeMetricFamily("admission_limit", "Concurrency limit", labels=("limiter",))
+        in_flight = GaugeMetricFamily("admission_in_flight", "Admitted requests in progress", labels=("limiter",))
+        depth = GaugeMetricFamily("admission_queue_depth", "Requests waiting for admission", labels=("limiter",))
+        queued = CounterMetricFamily("admission_queued", "Requests which waited for admission", labels=("limiter",))
+        rejected = CounterMetricFamily("admission_rejected", "Rejected requests", labels=("limiter", "reason"))
+
+        for name, limiter in self._limiters.items():
+            limit.add_metric((name,), limiter.limit)
+            in_flight.add_metric((name,), limiter.in_flight)
+            depth.add_metric((name,), limiter.depth)
+            queued.add_metric((name,), limiter.queued)
+
+            # Collected in exposition thread while event loop adds reasons
+            for reason, count in list(limiter.rejected.items()):
+                rejected.add_metric((name, reason), count)
+
+        yield limit
+        yield in_flight
+        yield depth
+        yield queued
+        yield rejected
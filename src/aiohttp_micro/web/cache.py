@@ -0,0 +1,163 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import orjson
+from aiohttp import hdrs, web
+
+
+CacheKey = Tuple[str, Hashable]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    status: int
+    content_type: str
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    vary: Optional[str] = None
+
+
+class OperationStats:
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class ResponseCache:
+    """In-memory LRU cache of serialized responses.
+
+    Entries are grouped by operation name, expire after TTL given on `set`
+    and least recently used ones are evicted when cache holds `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        # Kept up to date instead of summed over entries, read by exposition thread while event loop changes them
+        self._size = 0
+        self.stats: Dict[str, OperationStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _remove(self, cache_key: CacheKey) -> Optional[CachedResponse]:
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._size -= len(entry.body)
+
+        return entry
+
+    def _stats(self, operation: str) -> OperationStats:
+        stats = self.stats.get(operation, None)
+        if stats is None:
+            stats = self.stats[operation] = OperationStats()
+
+        return stats
+
+    def get(self, operation: str, key: Hashable) -> Optional[CachedResponse]:
+        stats = self._stats(operation)
+
+        entry = self._entries.get((operation, key), None)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._remove((operation, key))
+            stats.expirations += 1
+            entry = None
+
+        if entry is None:
+            stats.misses += 1
+            return None
+
+        self._entries.move_to_end((operation, key))
+        stats.hits += 1
+
+        return entry
+
+    def set(self, operation: str, key: Hashable, response: web.Response, ttl: float) -> None:
+        self._remove((operation, key))
+        self._entries[(operation, key)] = entry = CachedResponse(
+            body=response.body,
+            status=response.status,
+            content_type=response.content_type,
+            expires_at=self._clock() + ttl,
+            etag=response.headers.get(hdrs.ETAG, None),
+            last_modified=response.headers.get(hdrs.LAST_MODIFIED, None),
+            vary=response.headers.get(hdrs.VARY, None),
+        )
+        self._size += len(entry.body)
+
+        while len(self._entries) > self._max_entries:
+            (evicted, _), evicted_entry = self._entries.popitem(last=False)
+            self._size -= len(evicted_entry.body)
+            self._stats(evicted).evictions += 1
+
+    def invalidate(self, operation: Optional[str] = None, key: Optional[Hashable] = None) -> int:
+        """Remove cached responses of `operation`, all of them by default."""
+
+        if operation is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._size = 0
+            return removed
+
+        if key is not None:
+            return 1 if self._remove((operation, key)) else 0
+
+        keys: List[CacheKey] = [cache_key for cache_key in self._entries if cache_key[0] == operation]
+        for cache_key in keys:
+            self._remove(cache_key)
+
+        return len(keys)
+
+
+def make_key(
+    params: Optional[Dict[str, Any]], request: web.Request, vary: Iterable[str], media_type: Optional[str] = None
+) -> bytes:
+    """Cache key from parsed operation parameters, values of `vary` request headers and response media type."""
+
+    headers = [request.headers.get(name, None) for name in vary]
+    return orjson.dumps([params, headers, media_type], option=orjson.OPT_SORT_KEYS, default=str)
+
+
+class ResponseCacheCollector:
+    """Expose response cache hits, misses and evictions as metrics."""
+
+    def __init__(self, cache: ResponseCache) -> None:
+        self._cache = cache
+
+    def collect(self):
+        # Imported here, cache is used by operations with or without metrics
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily  # type: ignore
+
+        yield GaugeMetricFamily("response_cache_entries", "Responses in cache", value=len(self._cache))
+        yield GaugeMetricFamily("response_cache_size_bytes", "Size of responses in cache", value=self._cache.size)
+
+        hits = CounterMetricFamily("response_cache_hits", "Responses served from cache", labels=("operation",))
+        misses = CounterMetricFamily("response_cache_misses", "Responses missed in cache", labels=("operation",))
+        evictions = CounterMetricFamily(
+            "response_cache_evictions", "Responses removed from cache", labels=("operation", "reason")
+        )
+
+        # Collected in exposition thread while event loop adds operations
+        for operation, stats in list(self._cache.stats.items()):
+            hits.add_metric((operation,), stats.hits)
+            misses.add_metric((operation,), stats.misses)
+            evictions.add_metric((operation, "capacity"), stats.evictions)
+            evictions.add_metric((operation, "expired"), stats.expirations)
+
+        yield hits
+        yield misses
+        yield evictions
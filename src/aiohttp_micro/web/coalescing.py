@@ -0,0 +1,58 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+from aiohttp import web
+
+
+class Call:
+    def __init__(self, task: "asyncio.Future[web.Response]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one execution between concurrent calls with the same key.
+
+    Execution is cancelled only when every caller waiting for it was
+    cancelled, so client disconnect does not break responses of others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, call: Call, *args) -> None:
+        if self._calls.get(key, None) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[web.Response]]) -> Tuple[web.Response, bool]:
+        """Run `func` or wait for running one, returns result and whether it was shared."""
+
+        call = self._calls.get(key, None)
+        shared = call is not None
+
+        if call is None:
+            call = self._calls[key] = Call(asyncio.ensure_future(func()))
+            call.task.add_done_callback(partial(self._forget, key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Later callers should not join cancelled execution
+                self._forget(key, call)
+                call.task.cancel()
+
+            raise
+        finally:
+            call.waiters -= 1
+
+
+def copy_response(response: web.Response) -> web.Response:
+    """Copy of shared response, which could be prepared for another request."""
+
+    return web.Response(body=response.body, status=response.status, reason=response.reason, headers=response.headers)
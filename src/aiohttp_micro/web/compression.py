@@ -0,0 +1,73 @@
+import gzip
+import zlib
+from typing import Callable, Dict, Iterable, Optional
+
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi as brotli  # type: ignore
+    except ImportError:
+        brotli = None
+
+
+IDENTITY = "identity"
+
+Compressor = Callable[[bytes], bytes]
+
+COMPRESSORS: Dict[str, Compressor] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6),
+    "deflate": lambda body: zlib.compress(body, 6),
+}
+
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+
+# Preferred content codings go first
+ENCODINGS = tuple(encoding for encoding in ("br", "gzip", "deflate") if encoding in COMPRESSORS)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted = {}
+
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+
+        accepted[coding] = quality
+
+    return accepted
+
+
+def choose_encoding(header: Optional[str], encodings: Iterable[str] = ENCODINGS) -> str:
+    """Choose content coding for response from `Accept-Encoding` request header."""
+
+    if not header:
+        return IDENTITY
+
+    accepted = parse_accept_encoding(header)
+    default = accepted.get("*", 0.0)
+
+    for encoding in encodings:
+        if accepted.get(encoding, default) > 0:
+            return encoding
+
+    return IDENTITY
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == IDENTITY:
+        return body
+
+    return COMPRESSORS[encoding](body)
@@ -0,0 +1,80 @@
+import math
+import re
+import time
+from typing import Callable, Dict, Mapping, Optional
+
+
+# Request state key of `Deadline`
+DEADLINE = "deadline"
+
+REQUEST_TIMEOUT = "X-Request-Timeout"
+GRPC_TIMEOUT = "grpc-timeout"
+
+GRPC_TIMEOUT_RE = re.compile(r"^(\d{1,8})([HMSmun])$")
+# Nanoseconds in timeout unit
+GRPC_TIMEOUT_UNITS = {"H": 3600 * 10 ** 9, "M": 60 * 10 ** 9, "S": 10 ** 9, "m": 10 ** 6, "u": 10 ** 3, "n": 1}
+
+
+def parse_request_timeout(value: str) -> Optional[float]:
+    """Timeout in seconds from `X-Request-Timeout` header, `None` if it is invalid."""
+
+    try:
+        timeout = float(value)
+    except ValueError:
+        return None
+
+    if not math.isfinite(timeout) or timeout < 0:
+        return None
+
+    return timeout
+
+
+def parse_grpc_timeout(value: str) -> Optional[float]:
+    """Timeout in seconds from `grpc-timeout` header like `250m`, `None` if it is invalid."""
+
+    match = GRPC_TIMEOUT_RE.match(value.strip())
+    if not match:
+        return None
+
+    amount, unit = match.groups()
+    return int(amount) * GRPC_TIMEOUT_UNITS[unit] / 10 ** 9
+
+
+def get_timeout(headers: Mapping[str, str]) -> Optional[float]:
+    """The shortest of timeouts requested by client."""
+
+    timeouts = []
+
+    value = headers.get(REQUEST_TIMEOUT, None)
+    if value:
+        timeouts.append(parse_request_timeout(value))
+
+    value = headers.get(GRPC_TIMEOUT, None)
+    if value:
+        timeouts.append(parse_grpc_timeout(value))
+
+    valid = [timeout for timeout in timeouts if timeout is not None]
+    return min(valid) if valid else None
+
+
+class Deadline:
+    """Point in time after which client does not wait for response anymore."""
+
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.expires_at = clock() + timeout
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left, use it as timeout of downstream calls."""
+
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining <= 0
+
+    def headers(self) -> Dict[str, str]:
+        """Headers to propagate remaining budget to downstream services."""
+
+        return {REQUEST_TIMEOUT: f"{self.remaining:.3f}"}
@@ -1,34 +1,304 @@
-from typing import Any, Dict, Type
+import hashlib
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, IO, Iterable, Optional, Tuple, Type, Union
+from urllib.parse import parse_qsl
 
 import orjson
-from aiohttp import web
+from aiohttp import BodyPartReader, hdrs, web
 from marshmallow import Schema, ValidationError
 
+from aiohttp_micro.web.media import CODECS, get_codec, JSON
 
-async def get_payload(request: web.Request) -> Dict[str, Any]:
-    if "application/json" in request.content_type:
-        payload = await request.json()
+
+MAX_BODY_SIZE = 1024 ** 2
+# Uploaded files over this size are kept in temporary files instead of memory
+SPOOL_SIZE = 1024 ** 2
+CHUNK_SIZE = 65536
+# Request state key of already decoded payload, e.g. for operations of batch request
+PRELOADED_PAYLOAD = "preloaded_payload"
+# Request state key of files uploaded with multipart payload
+UPLOADED_FILES = "uploaded_files"
+
+FORM = "application/x-www-form-urlencoded"
+
+
+@dataclass
+class UploadedFile:
+    name: str
+    filename: str
+    content_type: str
+    file: IO[bytes]
+
+
+class PayloadMetrics:
+    """Request body size and decode time metrics of a single operation."""
+
+    def __init__(self, app: web.Application, operation: str) -> None:
+        self.body_size = app["metrics"]["payload_size"].labels(app["app_name"], operation)
+        self.decode_time = app["metrics"]["payload_decode"].labels(app["app_name"], operation)
+
+    @classmethod
+    def create(cls, app: web.Application, operation: str) -> Optional["PayloadMetrics"]:
+        if "payload_size" not in app.get("metrics", {}):
+            return None
+
+        return cls(app, operation)
+
+
+def check_body_size(size: int, max_size: Optional[int]) -> None:
+    if max_size is not None and size > max_size:
+        raise web.HTTPRequestEntityTooLarge(max_size=max_size, actual_size=size)
+
+
+async def read_body(request: web.Request, max_size: Optional[int]) -> bytes:
+    check_body_size(request.content_length or 0, max_size)
+
+    body = bytearray()
+    while True:
+        chunk = await request.content.readany()
+        if not chunk:
+            break
+
+        body.extend(chunk)
+        check_body_size(len(body), max_size)
+
+    return bytes(body)
+
+
+async def read_part(
+    part: BodyPartReader, target: Union[IO[bytes], bytearray], size: int, max_size: Optional[int]
+) -> int:
+    """Read part of multipart body to `target`, total size of body read so far is returned."""
+
+    while True:
+        chunk = await part.read_chunk(CHUNK_SIZE)
+        if not chunk:
+            return size
+
+        size += len(chunk)
+        check_body_size(size, max_size)
+
+        chunk = part.decode(chunk)
+        if isinstance(target, bytearray):
+            target.extend(chunk)
+        else:
+            target.write(chunk)
+
+
+async def read_multipart(request: web.Request, max_size: Optional[int], spool_size: int) -> Tuple[Dict[str, Any], int]:
+    """Read form fields, files are spooled to temporary files over `spool_size` bytes.
+
+    Temporary files are closed if body could not be read, and are kept in
+    request state to be closed with `close_uploaded_files` otherwise.
+    """
+
+    check_body_size(request.content_length or 0, max_size)
+
+    payload: Dict[str, Any] = {}
+    files = request.setdefault(UPLOADED_FILES, [])
+    size = 0
+
+    reader = await request.multipart()
+    try:
+        while True:
+            part = await reader.next()
+            if part is None:
+                break
+
+            if not part.filename:
+                field = bytearray()
+                size = await read_part(part, field, size, max_size)
+                payload[part.name] = field.decode(part.get_charset(default="utf-8"))
+                continue
+
+            target = tempfile.SpooledTemporaryFile(max_size=spool_size)
+            files.append(target)
+            size = await read_part(part, target, size, max_size)
+
+            target.seek(0)
+            content_type = part.headers.get(hdrs.CONTENT_TYPE, "application/octet-stream")
+            payload[part.name] = UploadedFile(part.name, part.filename, content_type, target)
+    except BaseException:
+        close_uploaded_files(request)
+        raise
+
+    return payload, size
+
+
+def close_uploaded_files(request: web.Request) -> None:
+    """Close temporary files of multipart payload once request is handled."""
+
+    for uploaded_file in request.pop(UPLOADED_FILES, []):
+        uploaded_file.close()
+
+
+async def get_payload(
+    request: web.Request,
+    max_size: Optional[int] = MAX_BODY_SIZE,
+    spool_size: int = SPOOL_SIZE,
+    metrics: Optional[PayloadMetrics] = None,
+) -> Dict[str, Any]:
+    """Read and decode request body.
+
+    Bodies over `max_size` bytes are rejected with `413 Request Entity Too Large`,
+    bodies of media types without codec other than forms are rejected with
+    `415 Unsupported Media Type`. Files of multipart payload are owned by the caller, `validate_payload` and
+    `OperationView` close them after handler, other handlers should call
+    `close_uploaded_files` when done with them.
+    """
+
+    payload, _ = await read_payload(request, max_size, spool_size, metrics)
+    return payload
+
+
+async def read_payload(
+    request: web.Request,
+    max_size: Optional[int] = MAX_BODY_SIZE,
+    spool_size: int = SPOOL_SIZE,
+    metrics: Optional[PayloadMetrics] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """Read and decode request body like `get_payload`, along with size of body read."""
+
+    if PRELOADED_PAYLOAD in request:
+        return request[PRELOADED_PAYLOAD], 0
+
+    if request.content_type == "multipart/form-data":
+        payload, size = await read_multipart(request, max_size, spool_size)
+
+        if metrics:
+            metrics.body_size.observe(size)
+
+        return payload, size
+
+    codec = get_codec(request.content_type)
+    if codec is None and "json" in request.content_type:
+        codec = CODECS[JSON]
+
+    if codec is None and request.content_type != FORM:
+        raise web.HTTPUnsupportedMediaType(text=f"Unsupported payload media type: {request.content_type}")
+
+    body = await read_body(request, max_size)
+
+    started_at = time.perf_counter()
+    if codec:
+        try:
+            payload = codec.loads(body)
+        except (ValueError, TypeError):
+            raise web.HTTPBadRequest(text=f"Invalid {request.content_type} payload")
     else:
-        payload = await request.post()
-    return dict(payload)
+        payload = dict(parse_qsl(body.decode(request.charset or "utf-8"), keep_blank_values=True))
+
+    if metrics:
+        metrics.decode_time.observe(time.perf_counter() - started_at)
+        metrics.body_size.observe(len(body))
+
+    return payload, len(body)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check `If-None-Match` header against entity tag with weak comparison."""
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+
+        if tag == opaque_tag:
+            return True
+
+    return False
+
+
+def weak_etag(value: str) -> str:
+    if value.startswith("W/"):
+        return value
+
+    if not value.startswith('"'):
+        value = f'"{value}"'
+
+    return f"W/{value}"
+
+
+def merge_vary(vary: Optional[str], names: Iterable[str]) -> Optional[str]:
+    """`Vary` header value extended with request header `names` missing in it."""
+
+    values = [value.strip() for value in vary.split(",")] if vary else []
+    known = {value.lower() for value in values}
+
+    for name in names:
+        if name.lower() not in known:
+            values.append(name)
+            known.add(name.lower())
+
+    return ", ".join(values) or None
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def body_etag(body: bytes) -> str:
+    """Weak entity tag computed from response body."""
+
+    return weak_etag(hashlib.blake2b(body, digest_size=8).hexdigest())
+
+
+def is_not_modified(request: web.Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Check conditional request headers against resource validators.
+
+    `If-Modified-Since` is ignored when request has `If-None-Match` header.
+    """
+
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH, None)
+    if if_none_match:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if last_modified is not None:
+        if_modified_since = request.if_modified_since
+        if if_modified_since is not None:
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+            return last_modified.replace(microsecond=0) <= if_modified_since
+
+    return False
 
 
 def json_response(data, status: int = 200, **kwargs) -> web.Response:
     return web.Response(body=orjson.dumps(data), status=status, content_type="application/json", **kwargs)
 
 
-def validate_payload(schema_cls: Type[Schema]):
+def validate_payload(schema_cls: Type[Schema], max_body_size: Optional[int] = MAX_BODY_SIZE):
     def wrapper(f):
         async def wrapped(request: web.Request) -> web.Response:
-            payload = await get_payload(request)
+            metrics = PayloadMetrics.create(request.app, f.__name__)
+            payload = await get_payload(request, max_size=max_body_size, metrics=metrics)
 
             try:
                 schema = schema_cls()
                 document = schema.load(payload)
             except ValidationError as exc:
+                close_uploaded_files(request)
                 return json_response({"errors": exc.messages}, status=422)
 
-            return await f(document, request)
+            try:
+                return await f(document, request)
+            finally:
+                close_uploaded_files(request)
 
         return wrapped
 
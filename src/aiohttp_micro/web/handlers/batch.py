@@ -0,0 +1,209 @@
+import asyncio
+import functools
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from aiohttp import hdrs, web
+from marshmallow import fields, Schema, validates, ValidationError
+from multidict import CIMultiDict
+
+from aiohttp_micro.web.handlers import PRELOADED_PAYLOAD
+from aiohttp_micro.web.handlers.openapi import OperationView, PayloadSchema, ResponseSchema, Tags
+from aiohttp_micro.web.media import JSON
+from aiohttp_micro.web.middlewares import Handler
+
+
+# Headers which describe batch request itself and are not passed to operations
+SKIPPED_HEADERS = (
+    hdrs.ACCEPT,
+    hdrs.ACCEPT_ENCODING,
+    hdrs.CONTENT_ENCODING,
+    hdrs.CONTENT_LENGTH,
+    hdrs.CONTENT_TYPE,
+    hdrs.IF_MODIFIED_SINCE,
+    hdrs.IF_NONE_MATCH,
+    hdrs.TRANSFER_ENCODING,
+)
+
+
+class PathMismatch(Exception):
+    """Path parameters do not match route of operation."""
+
+
+class BatchEntrySchema(Schema):
+    operation_id = fields.Str(required=True, data_key="operationId", description="Operation ID")
+    params = fields.Dict(keys=fields.Str(), missing=dict, description="Path and query parameters")
+    payload = fields.Raw(missing=None, allow_none=True, description="Operation payload")
+
+
+class BatchPayloadSchema(PayloadSchema):
+    """Operations to run."""
+
+    operations = fields.List(fields.Nested(BatchEntrySchema), required=True, description="Operations")
+
+    @validates("operations")
+    def validate_operations(self, operations, **kwargs) -> None:
+        if not operations:
+            raise ValidationError("At least one operation required")
+
+        max_operations = self.context.get("max_operations", None)
+        if max_operations and len(operations) > max_operations:
+            raise ValidationError(f"Up to {max_operations} operations allowed")
+
+
+class BatchResultSchema(Schema):
+    operation_id = fields.Str(data_key="operationId", description="Operation ID")
+    status = fields.Int(description="Response status")
+    body = fields.Raw(allow_none=True, description="Response body")
+
+
+class BatchResponseSchema(ResponseSchema):
+    """Results of operations in requested order."""
+
+    results = fields.List(fields.Nested(BatchResultSchema), description="Operations results")
+
+
+class BatchErrorsSchema(ResponseSchema):
+    """Invalid batch request."""
+
+    operations = fields.Raw(description="Operations errors")
+
+
+def decode_body(response: web.Response) -> Any:
+    if not isinstance(response.body, bytes) or not response.body:
+        return None
+
+    if response.content_type == JSON:
+        return orjson.loads(response.body)
+
+    return response.text
+
+
+class BatchView(OperationView):
+    """Run several operations in one request.
+
+    Operations are handled concurrently, at most `max_concurrency` at a time,
+    with headers of batch request. They pass application middlewares like
+    separate requests, so they are authenticated, admitted and counted on
+    their own, while batch request holds its admission slot. Streaming
+    operations could not be batched.
+    """
+
+    payload_cls = BatchPayloadSchema
+    parameters: Dict[str, Any] = {}
+    responses = {HTTPStatus.OK: BatchResponseSchema, HTTPStatus.UNPROCESSABLE_ENTITY: BatchErrorsSchema}
+    media_types = (JSON,)
+
+    def __init__(
+        self, name: str, security: Any, tags: Tags, max_operations: int = 50, max_concurrency: int = 10
+    ) -> None:
+        super().__init__(name=name, security=security, tags=tags)
+
+        self.max_operations = max_operations
+        self.max_concurrency = max_concurrency
+
+        self._schema_context["max_operations"] = max_operations
+
+        self._operations: Dict[str, Tuple[web.ResourceRoute, OperationView]] = {}
+        self._batch_size: Optional[Any] = None
+        self._batch_operations: Optional[Any] = None
+        self._app_name = ""
+
+    def setup(self, app: web.Application) -> None:
+        super().setup(app)
+
+        # Operations are registered by `setup_openapi`, some of them after batch view setup
+        self._operations = app.setdefault("operations", {})
+        self._app_name = app.get("app_name", "")
+
+        metrics = app.get("metrics", {})
+        self._batch_size = metrics.get("batch_size", None)
+        self._batch_operations = metrics.get("batch_operations", None)
+
+    async def prepare(self, request: web.Request, entry: Dict[str, Any]) -> Tuple[OperationView, web.Request]:
+        route, view = self._operations[entry["operation_id"]]
+
+        query = {key: str(value) for key, value in entry["params"].items()}
+        pattern = route.resource.get_info().get("pattern", None)
+        path_params = {name: query.pop(name) for name in (pattern.groupindex if pattern else ()) if name in query}
+
+        headers = CIMultiDict(request.headers)
+        for name in SKIPPED_HEADERS:
+            headers.popall(name, None)
+        headers[hdrs.ACCEPT] = JSON
+
+        url = route.resource.url_for(**path_params).with_query(query)
+        clone = request.clone(method=route.method, rel_url=url, headers=headers)
+
+        # Values are not checked against route pattern by `url_for`
+        match_info = await request.app.router.resolve(clone)
+        if match_info.http_exception is not None or match_info.route is not route:
+            raise PathMismatch()
+
+        match_info.add_app(request.app)
+        match_info.freeze()
+        clone._match_info = match_info  # type: ignore
+
+        if entry["payload"] is not None:
+            clone[PRELOADED_PAYLOAD] = entry["payload"]
+
+        return view, clone
+
+    def get_handler(self, request: web.Request, view: OperationView) -> Handler:
+        """Operation handler wrapped with application middlewares the same way aiohttp does for requests."""
+
+        handler: Handler = view.handle
+        for app in request.match_info.apps[::-1]:
+            for middleware in reversed(app.middlewares):
+                handler = functools.partial(middleware, handler=handler)
+
+        return handler
+
+    async def run(self, request: web.Request, entry: Dict[str, Any]) -> Tuple[int, Any]:
+        operation = self._operations.get(entry["operation_id"], None)
+        if operation is None or operation[1] is self or operation[1].streaming:
+            return HTTPStatus.NOT_FOUND, {"message": "Unknown operation"}
+
+        try:
+            view, clone = await self.prepare(request, entry)
+        except KeyError as exc:
+            return HTTPStatus.BAD_REQUEST, {"message": f"Missing path parameter: {exc.args[0]}"}
+        except PathMismatch:
+            return HTTPStatus.BAD_REQUEST, {"message": "Invalid path parameters"}
+
+        try:
+            response = await self.get_handler(clone, view)(clone)
+        except web.HTTPException as exc:
+            return exc.status, exc.text
+        except Exception as exc:
+            if "config" in request.app and request.app["config"].debug:
+                raise exc
+
+            from sentry_sdk import capture_exception
+
+            capture_exception(exc)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None
+
+        return response.status, decode_body(response)
+
+    async def process_request(self, request, params=None, payload=None):
+        entries = payload["operations"]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                status, body = await self.run(request, entry)
+
+            if self._batch_operations is not None:
+                operation = entry["operation_id"] if entry["operation_id"] in self._operations else "unknown"
+                self._batch_operations.labels(self._app_name, operation, int(status)).inc()
+
+            return {"operation_id": entry["operation_id"], "status": status, "body": body}
+
+        if self._batch_size is not None:
+            self._batch_size.labels(self._app_name).observe(len(entries))
+
+        results = await asyncio.gather(*(run_entry(entry) for entry in entries))
+
+        return {"results": results}, HTTPStatus.OK
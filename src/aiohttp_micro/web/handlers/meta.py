@@ -1,3 +1,5 @@
+import os
+
 from aiohttp import web
 
 from aiohttp_micro.web.handlers import json_response
@@ -7,6 +9,7 @@ async def index(request: web.Request) -> web.Response:
     return json_response(
         {
             "hostname": request.app["hostname"],
+            "pid": os.getpid(),
             "project": request.app["distribution"].project_name,
             "version": request.app["distribution"].version,
         }
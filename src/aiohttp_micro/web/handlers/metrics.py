@@ -1,5 +1,80 @@
-import prometheus_client  # type: ignore
-from aiohttp import web
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, Optional, Tuple
+
+from aiohttp import hdrs, web
+from prometheus_client import CollectorRegistry  # type: ignore
+from prometheus_client.exposition import choose_encoder  # type: ignore
+
+from aiohttp_micro.web.compression import choose_encoding, compress, IDENTITY
+
+
+class MetricsExposition:
+    """Rendered metrics shared by scrapes.
+
+    Exposition is rendered and compressed in `executor` (default thread pool
+    of event loop), scrapes coming within `ttl` seconds since rendering
+    started get the same body, concurrent scrapes wait for the same
+    rendering.
+    """
+
+    def __init__(
+        self,
+        registry: CollectorRegistry,
+        ttl: float = 1.0,
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.registry = registry
+        self._ttl = ttl
+        self._executor = executor
+        self._clock = clock
+
+        # Rendering task and its start time by content type
+        self._bodies: Dict[str, Tuple["asyncio.Future[bytes]", float]] = {}
+        # Compression task and rendering task it compresses by content type and encoding
+        self._compressed: Dict[Tuple[str, str], Tuple["asyncio.Future[bytes]", "asyncio.Future[bytes]"]] = {}
+
+    def _render(self, content_type: str, generate: Callable[[CollectorRegistry], bytes]) -> "asyncio.Future[bytes]":
+        now = self._clock()
+
+        task, started_at = self._bodies.get(content_type, (None, 0.0))
+        if task is None or (task.done() and (now >= started_at + self._ttl or failed(task))):
+            task = asyncio.get_event_loop().run_in_executor(self._executor, generate, self.registry)
+            self._bodies[content_type] = (task, now)
+
+        return task
+
+    def _compress(self, content_type: str, encoding: str, body: "asyncio.Future[bytes]") -> "asyncio.Future[bytes]":
+        task, source = self._compressed.get((content_type, encoding), (None, None))
+        if task is None or source is not body or (task.done() and failed(task)):
+            task = asyncio.ensure_future(self._compress_body(body, encoding))
+            self._compressed[(content_type, encoding)] = (task, body)
+
+        return task
+
+    async def _compress_body(self, body: "asyncio.Future[bytes]", encoding: str) -> bytes:
+        return await asyncio.get_event_loop().run_in_executor(self._executor, compress, await body, encoding)
+
+    async def get(self, accept: Optional[str], accept_encoding: Optional[str]) -> Tuple[bytes, str, str]:
+        """Body, content type and content coding of exposition acceptable by scraper."""
+
+        generate, content_type = choose_encoder(accept)
+        encoding = choose_encoding(accept_encoding)
+
+        task = self._render(content_type, generate)
+        if encoding != IDENTITY:
+            task = self._compress(content_type, encoding, task)
+
+        # Scraper gone away should not cancel rendering shared with others
+        body = await asyncio.shield(task)
+
+        return body, content_type, encoding
+
+
+def failed(task: "asyncio.Future[bytes]") -> bool:
+    return task.cancelled() or task.exception() is not None
 
 
 async def handler(request: web.Request) -> web.Response:
@@ -7,7 +82,14 @@ async def handler(request: web.Request) -> web.Response:
     Expose application metrics to the world
     """
 
-    resp = web.Response(body=prometheus_client.generate_latest(registry=request.app["metrics_registry"]))
+    exposition: MetricsExposition = request.app["metrics_exposition"]
+
+    body, content_type, encoding = await exposition.get(
+        request.headers.get(hdrs.ACCEPT, None), request.headers.get(hdrs.ACCEPT_ENCODING, None)
+    )
+
+    headers = {hdrs.CONTENT_TYPE: content_type, hdrs.VARY: f"{hdrs.ACCEPT}, {hdrs.ACCEPT_ENCODING}"}
+    if encoding != IDENTITY:
+        headers[hdrs.CONTENT_ENCODING] = encoding
 
-    resp.content_type = prometheus_client.CONTENT_TYPE_LATEST
-    return resp
+    return web.Response(body=body, headers=headers)
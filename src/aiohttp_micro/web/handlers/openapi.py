@@ -1,15 +1,53 @@
+import asyncio
+import hashlib
+import inspect
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
 from http import HTTPStatus
-from typing import Any, Collection, Dict, Iterable, Optional, Tuple, Type, Union
+from operator import attrgetter
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Coroutine,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
-from aiohttp import web
-from aiohttp.web_response import json_response
-from marshmallow import Schema
+import orjson
+from aiohttp import hdrs, web
+from marshmallow import EXCLUDE, fields, missing, Schema
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
 from marshmallow.exceptions import ValidationError
 
-from aiohttp_micro.web.handlers import get_payload
+from aiohttp_micro.core.serializers import get_dumper
+from aiohttp_micro.web.cache import make_key, ResponseCache
+from aiohttp_micro.web.coalescing import copy_response, SingleFlight
+from aiohttp_micro.web.compression import choose_encoding, compress, IDENTITY
+from aiohttp_micro.web.deadline import DEADLINE, Deadline
+from aiohttp_micro.web.handlers import (
+    body_etag,
+    close_uploaded_files,
+    etag_matches,
+    http_date,
+    is_not_modified,
+    MAX_BODY_SIZE,
+    merge_vary,
+    PayloadMetrics,
+    read_payload,
+    weak_etag,
+)
+from aiohttp_micro.web.media import choose_media_type, CODECS, JSON
+from aiohttp_micro.web.offload import count_items, Offloader
+from aiohttp_micro.web.timing import DUMP, format_server_timing, PARAMETERS, PAYLOAD, PROCESS, STAGES, StageTimer
 
 
 class ParameterIn(Enum):
@@ -51,6 +89,8 @@ class InvalidPayload(Exception):
 
 Tags = Iterable[str]
 
+NDJSON = "application/x-ndjson"
+
 
 @dataclass
 class OpenAPISpec:
@@ -60,7 +100,12 @@ class OpenAPISpec:
     parameters: Iterable[Type[ParametersSchema]] = field(default_factory=list)
     payload: Optional[Type[PayloadSchema]] = None
     security: Optional[str] = None
+    streaming: bool = False
     tags: Tags = field(default_factory=list)
+    media_types: Collection[str] = (JSON,)
+
+    def _content(self, schema: Type[Schema]) -> Dict[str, Any]:
+        return {media_type: {"schema": schema} for media_type in self.media_types}
 
     def _generate_responses(self) -> Dict[str, Dict[str, Collection[str]]]:
         responses = {}
@@ -70,9 +115,19 @@ class OpenAPISpec:
 
             if isinstance(schema, str):
                 response = {"description": schema, "content": {"text/plain": {"schema": {"type": "string"}}}}
+            elif issubclass(schema, ResponseSchema) and self.streaming and status_code < HTTPStatus.MULTIPLE_CHOICES:
+                response = {
+                    "content": {
+                        "application/json": {"schema": {"type": "array", "items": schema}},
+                        NDJSON: {"schema": schema},
+                    },
+                }
+
+                if schema.__doc__:
+                    response["description"] = schema.__doc__
             elif issubclass(schema, ResponseSchema):
                 response = {
-                    "content": {"application/json": {"schema": schema}},
+                    "content": self._content(schema),
                 }
 
                 if schema.__doc__:
@@ -100,7 +155,7 @@ class OpenAPISpec:
         if self.payload:
             operation["requestBody"] = {
                 "description": self.payload.__doc__,
-                "content": {"application/json": {"schema": self.payload}},
+                "content": self._content(self.payload),
                 "required": True,
             }
 
@@ -113,11 +168,170 @@ class OpenAPISpec:
         return operation
 
 
+ParameterSource = Callable[[web.Request], Mapping[str, Any]]
+ParametersFastLoader = Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+PARAMETER_SOURCES: Dict[ParameterIn, ParameterSource] = {
+    ParameterIn.cookies: attrgetter("cookies"),
+    ParameterIn.header: attrgetter("headers"),
+    ParameterIn.path: attrgetter("match_info"),
+    ParameterIn.query: attrgetter("query"),
+}
+
+
+def has_load_hooks(schema: Schema) -> bool:
+    hooks = schema._hooks
+
+    if hooks[VALIDATES]:
+        return True
+
+    return any(hooks[(tag, many)] for tag in (PRE_LOAD, POST_LOAD, VALIDATES_SCHEMA) for many in (True, False))
+
+
+def compile_flat_loader(schema: Schema) -> Optional[ParametersFastLoader]:
+    """Build loader for schemas with plain fields only.
+
+    Loader deserializes every field directly from the source mapping and skips
+    marshmallow load machinery. Returns `None` if schema could behave differently
+    on the fast path: nested fields, load hooks, unknown fields handling, etc.
+    """
+
+    if schema.many or schema.partial or schema.unknown != EXCLUDE or has_load_hooks(schema):
+        return None
+
+    loaders = []
+    for name, field_obj in schema.load_fields.items():
+        attribute = field_obj.attribute or name
+        if isinstance(field_obj, fields.Nested) or "." in attribute:
+            return None
+
+        data_key = field_obj.data_key if field_obj.data_key is not None else name
+        loaders.append((data_key, attribute, field_obj.deserialize))
+
+    dict_class = schema.dict_class
+
+    def load(src: Mapping[str, Any]) -> Dict[str, Any]:
+        result = dict_class()
+        errors = {}
+
+        for data_key, attribute, deserialize in loaders:
+            try:
+                value = deserialize(src.get(data_key, missing), data_key, src)
+            except ValidationError as exc:
+                errors[data_key] = exc.messages
+                continue
+
+            if value is not missing:
+                result[attribute] = value
+
+        if errors:
+            raise ValidationError(errors, data=src, valid_data=result)
+
+        return result
+
+    return load
+
+
+class ParametersLoader:
+    """Load request parameters for operation.
+
+    Schema instances, request sources and fast loaders are resolved once
+    on creation, so loading does not allocate or inspect schemas per request.
+    """
+
+    def __init__(self, schemas: Dict[str, ParametersSchema]) -> None:
+        self._sections = tuple(
+            (section, schema, PARAMETER_SOURCES[schema.in_], compile_flat_loader(schema))
+            for section, schema in schemas.items()
+        )
+
+    def load(self, request: web.Request) -> Dict[str, Any]:
+        parameters = {}
+        for section, schema, source, fast_load in self._sections:
+            src = source(request)
+
+            try:
+                if fast_load:
+                    parameters[section] = fast_load(src)
+                else:
+                    parameters[section] = schema.load(src)
+            except ValidationError as exc:
+                raise InvalidParameters(errors=exc.messages)
+
+        return parameters
+
+
 Responses = Dict[HTTPStatus, Type[ResponseSchema]]
 Parameters = Optional[Dict[str, Type[ParametersSchema]]]
 PayloadType = Optional[Type[PayloadSchema]]
 
 
+@dataclass(frozen=True)
+class ResourceVersion:
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers[hdrs.ETAG] = weak_etag(self.etag)
+        if self.last_modified:
+            headers[hdrs.LAST_MODIFIED] = http_date(self.last_modified)
+
+        return headers
+
+
+def security_headers(app: web.Application, security: Optional[str]) -> Tuple[str, ...]:
+    """Names of request headers with credentials for `security` scheme."""
+
+    if not security or "security_schemes" not in app:
+        return ()
+
+    scheme = app["security_schemes"].get(security, {})
+    if scheme.get("type") == "apiKey" and scheme.get("in") == "header":
+        return (scheme["name"],)
+    elif scheme.get("type") == "apiKey" and scheme.get("in") == "cookie":
+        return (hdrs.COOKIE,)
+
+    return (hdrs.AUTHORIZATION,)
+
+
+@dataclass
+class HandlingState:
+    """Request passing through stages of operation handling."""
+
+    request: web.Request
+    media_type: str
+    timer: Optional[StageTimer] = None
+    conditional: bool = False
+
+    params: Optional[Dict[str, Any]] = None
+    payload: Any = None
+    cache_key: Optional[bytes] = None
+    version: Optional[ResourceVersion] = None
+
+    def mark(self, stage: str) -> None:
+        if self.timer:
+            self.timer.mark(stage)
+
+
+def load_with_schema(schema_cls: Type[Schema], context: Dict[str, Any], raw_payload: Any) -> Any:
+    """Load payload in executor process."""
+
+    return schema_cls(context=context).load(raw_payload)
+
+
+def dump_with_schema(
+    schema_cls: Type[Schema], context: Dict[str, Any], fast: bool, data: Any, media_type: str
+) -> bytes:
+    """Dump and encode response data in executor process."""
+
+    schema = schema_cls(context=context)
+    dump = get_dumper(schema) if fast else schema.dump
+    return CODECS[media_type].dumps(dump(data))
+
+
 class OperationView(metaclass=ABCMeta):
     name: str
     responses: Responses
@@ -127,11 +341,72 @@ class OperationView(metaclass=ABCMeta):
     payload_cls: PayloadType = None
     security: Optional[Any] = None
 
+    # Dump responses with generated functions instead of `Schema.dump`
+    fast_dump: bool = False
+
+    # Operation responds with stream of items, every item is dumped with response schema
+    streaming: bool = False
+    stream_chunk_size: int = 16384
+
+    # Cache serialized responses of GET operation for `cache_ttl` seconds. Cache key is built from
+    # parsed parameters, values of `cache_vary` request headers and credentials of operation security scheme
+    cache_ttl: Optional[float] = None
+    cache_vary: Tuple[str, ...] = ()
+
+    # Answer GET requests with `304 Not Modified` when `If-None-Match` or `If-Modified-Since` headers match.
+    # Entity tag is computed from serialized response unless `get_version` provides one before processing
+    conditional: bool = False
+
+    # Concurrent GET requests with the same parameters, `cache_vary` headers and credentials share one
+    # `process_request` execution and its response. Streaming operations are never coalesced
+    coalesce: bool = False
+
+    # Load large payloads and dump large responses in executor configured by `setup_offloading`. `None` follows
+    # size thresholds, `True` and `False` always or never offload. Thresholds can be overridden per operation
+    offload: Optional[bool] = None
+    offload_payload_size: Optional[int] = None
+    offload_response_items: Optional[int] = None
+
+    # Requests with larger bodies are rejected with `413 Request Entity Too Large`
+    max_body_size: Optional[int] = MAX_BODY_SIZE
+
+    # Media types of payloads and responses, response media type is negotiated with `Accept` request header.
+    # Operations opt into binary ones, e.g. `(JSON, MSGPACK)`, so spec does not depend on installed extras
+    media_types: Tuple[str, ...] = (JSON,)
+
     def __init__(self, name: str, security: Any, tags: Tags) -> None:
         self.name = name
         self.security = security
         self.tags = tags
 
+        self._schemas: Dict[Type[Schema], Schema] = {}
+        self._schema_context: Dict[str, Any] = {}
+        self._parameters_loader: Optional[ParametersLoader] = None
+
+        self._stage_timing = False
+        self._server_timing = False
+        self._stage_latency: Dict[str, Any] = {}
+
+        self._cache: Optional[ResponseCache] = None
+        self._cache_vary: Tuple[str, ...] = self.cache_vary
+        self._cache_control = ""
+
+        self._conditional_requests: Dict[str, Any] = {}
+
+        self._flights: Optional[SingleFlight] = None
+        self._coalesced_requests: Optional[Any] = None
+
+        self._deadline_exceeded: Dict[str, Any] = {}
+
+        self._payload_metrics: Optional[PayloadMetrics] = None
+
+        self._offloader: Optional[Offloader] = None
+        self._offload_payload_size = 0
+        self._offload_response_items = 0
+
+        # Overrides of `process_response` written before media type negotiation take response only
+        self._negotiates_media_type = "media_type" in inspect.signature(self.process_response).parameters
+
     @property
     def spec(self) -> OpenAPISpec:
         return OpenAPISpec(
@@ -140,79 +415,637 @@ class OperationView(metaclass=ABCMeta):
             payload=self.payload_cls,
             responses=self.responses,
             security=self.security,
+            streaming=self.streaming,
             tags=self.tags,
+            media_types=self.media_types,
         )
 
-    def get_parameters(self, request: web.Request) -> Dict[str, Any]:
-        parameters = {}
-        for section, schema_cls in self.parameters.items():
-            schema = self.create_schema(schema_cls)
-
-            if schema.in_ == ParameterIn.query:
-                src = request.query
-            elif schema.in_ == ParameterIn.header:
-                src = request.headers
-            elif schema.in_ == ParameterIn.path:
-                src = request.match_info
-            elif schema.in_ == ParameterIn.cookies:
-                src = request.cookies
+    def setup(self, app: web.Application) -> None:
+        """Prepare operation to serve requests in application."""
+
+        self.setup_schemas(app)
+        self.setup_timing(app)
+
+        if self.cache_ttl:
+            self.setup_cache(app)
+
+        if self.coalesce and not self.streaming:
+            self.setup_coalescing(app)
+
+        if self.conditional:
+            self.setup_conditional(app)
+
+        self.setup_offloading(app)
+        self.setup_deadlines(app)
+
+    def setup_schemas(self, app: web.Application) -> None:
+        for media_type in self.media_types:
+            if media_type not in CODECS:
+                raise ValueError(f"Codec for {media_type} is not installed")
+
+        if "cursor_codec" in app:
+            self._schema_context["cursor_codec"] = app["cursor_codec"]
+
+        if self.parameters:
+            self._parameters_loader = ParametersLoader(
+                {section: self.get_schema(schema_cls) for section, schema_cls in self.parameters.items()}
+            )
+
+        if self.payload_cls:
+            self.get_schema(self.payload_cls)
+            self._payload_metrics = PayloadMetrics.create(app, self.name)
+
+        for schema_cls in self.responses.values():
+            if not isinstance(schema_cls, str):
+                self.get_schema(schema_cls)
+
+    def setup_timing(self, app: web.Application) -> None:
+        histogram = app.get("metrics", {}).get("operation_stage_latency", None)
+        if histogram is not None:
+            self._stage_latency = {stage: histogram.labels(app["app_name"], self.name, stage) for stage in STAGES}
+
+        self._server_timing = app.get("server_timing", False)
+        self._stage_timing = bool(self._stage_latency) or self._server_timing
+
+    def setup_cache(self, app: web.Application) -> None:
+        self._cache = app["response_cache"]
+
+        credentials = security_headers(app, self.security)
+        self._cache_vary = (*self.cache_vary, *credentials)
+        self._cache_control = f"{'private' if credentials else 'public'}, max-age={int(self.cache_ttl)}"
+
+    def setup_coalescing(self, app: web.Application) -> None:
+        self._flights = SingleFlight()
+        self._cache_vary = (*self.cache_vary, *security_headers(app, self.security))
 
+        counter = app.get("metrics", {}).get("coalesced_requests", None)
+        if counter is not None:
+            self._coalesced_requests = counter.labels(app["app_name"], self.name)
+
+    def setup_conditional(self, app: web.Application) -> None:
+        counter = app.get("metrics", {}).get("conditional_requests", None)
+        if counter is not None:
+            self._conditional_requests = {
+                result: counter.labels(app["app_name"], self.name, result) for result in ("not_modified", "full")
+            }
+
+    def setup_offloading(self, app: web.Application) -> None:
+        offloader = app.get("offloader", None)
+        if offloader is None or self.offload is False:
+            return
+
+        self._offloader = offloader
+        self._offload_payload_size = (
+            offloader.payload_size if self.offload_payload_size is None else self.offload_payload_size
+        )
+        self._offload_response_items = (
+            offloader.response_items if self.offload_response_items is None else self.offload_response_items
+        )
+
+        if self.offload:
+            self._offload_payload_size = self._offload_response_items = 0
+
+    def setup_deadlines(self, app: web.Application) -> None:
+        counter = app.get("metrics", {}).get("deadline_exceeded", None)
+        if counter is not None:
+            self._deadline_exceeded = {
+                result: counter.labels(app["app_name"], self.name, result) for result in ("skipped", "cancelled")
+            }
+
+    async def coalesced(
+        self, request: web.Request, key: bytes, params: Optional[Dict[str, Any]], media_type: str
+    ) -> web.Response:
+        """Process request or wait for the same request already in progress."""
+
+        async def execute() -> web.Response:
             try:
-                parameters[section] = schema.load(src)
-            except ValidationError as exc:
-                raise InvalidParameters(errors=exc.messages)
+                response = await self.process_request(request=request, params=params)
+                return await self.dump_response(response, media_type)
+            except web.HTTPException as exc:
+                # Exception could not be raised by every waiting handler, it is a response too
+                return exc
 
-        return parameters
+        response, shared = await self._flights.do(key, execute)  # type: ignore
+        if shared and self._coalesced_requests is not None:
+            self._coalesced_requests.inc()
+
+        return copy_response(response)
+
+    def deadline_exceeded(self, result: str) -> web.Response:
+        """`504 Gateway Timeout` response for request which deadline has passed."""
+
+        if self._deadline_exceeded:
+            self._deadline_exceeded[result].inc()
+
+        # Returned instead of raised, server errors raised by handlers are turned into 500 by common middleware
+        return web.Response(status=HTTPStatus.GATEWAY_TIMEOUT, text="Request deadline exceeded")
+
+    async def process_before(self, deadline: Deadline, process: Coroutine[Any, Any, Any]) -> Any:
+        """Cancel processing when client does not wait for response anymore."""
+
+        if deadline.expired:
+            process.close()
+            return self.deadline_exceeded("skipped")
+
+        try:
+            return await asyncio.wait_for(process, deadline.remaining)
+        except asyncio.TimeoutError:
+            # Timeouts of calls made by operation itself are not ours to handle
+            if not deadline.expired:
+                raise
+
+            return self.deadline_exceeded("cancelled")
+
+    def get_cached(self, request: web.Request, key: bytes) -> Optional[web.Response]:
+        cached = self._cache.get(self.name, key)  # type: ignore
+        if cached is None:
+            return None
+
+        headers = {hdrs.CACHE_CONTROL: self._cache_control}
+        if cached.etag:
+            headers[hdrs.ETAG] = cached.etag
+        if cached.last_modified:
+            headers[hdrs.LAST_MODIFIED] = cached.last_modified
+        if cached.vary:
+            headers[hdrs.VARY] = cached.vary
+
+        return web.Response(body=cached.body, status=cached.status, content_type=cached.content_type, headers=headers)
+
+    async def get_version(self, request: web.Request, params: Optional[Dict[str, Any]]) -> Optional[ResourceVersion]:
+        """Version of requested resource, checked before `process_request` for conditional requests."""
+
+        return None
+
+    def count_conditional(self, result: str) -> None:
+        if self._conditional_requests:
+            self._conditional_requests[result].inc()
+
+    def not_modified(self, headers: Mapping[str, str]) -> web.Response:
+        """`304 Not Modified` response with validators and caching headers from `headers`."""
+
+        self.count_conditional("not_modified")
+
+        return web.Response(
+            status=HTTPStatus.NOT_MODIFIED,
+            headers={
+                name: headers[name]
+                for name in (hdrs.ETAG, hdrs.LAST_MODIFIED, hdrs.CACHE_CONTROL, hdrs.VARY)
+                if name in headers
+            },
+        )
+
+    def conditional_response(self, request: web.Request, response: web.Response) -> web.Response:
+        if response.status != HTTPStatus.OK:
+            return response
+
+        if is_not_modified(request, response.headers.get(hdrs.ETAG, None), response.last_modified):
+            return self.not_modified(response.headers)
+
+        self.count_conditional("full")
+        return response
+
+    def invalidate(self, params: Optional[Dict[str, Any]] = None, request: Optional[web.Request] = None) -> int:
+        """Remove cached responses of operation, only ones for `params` and `request` if given."""
+
+        if self._cache is None:
+            return 0
+
+        if params is not None and request is not None:
+            key = make_key(params, request, self._cache_vary, self.negotiate(request))
+            return self._cache.invalidate(self.name, key)
+
+        return self._cache.invalidate(self.name)
+
+    def get_parameters(self, request: web.Request) -> Dict[str, Any]:
+        if self._parameters_loader is None:
+            self._parameters_loader = ParametersLoader(
+                {section: self.get_schema(schema_cls) for section, schema_cls in self.parameters.items()}
+            )
+
+        return self._parameters_loader.load(request)
 
     def create_schema(self, schema_cls: Type[Schema]) -> Schema:
-        return schema_cls()
+        return schema_cls(context=self._schema_context)
+
+    def get_schema(self, schema_cls: Type[Schema]) -> Schema:
+        schema = self._schemas.get(schema_cls, None)
+        if schema is None:
+            schema = self._schemas[schema_cls] = self.create_schema(schema_cls)
+
+        return schema
 
     async def get_payload(self, request: web.Request) -> None:
-        raw_payload = await get_payload(request)
+        raw_payload, size = await read_payload(request, max_size=self.max_body_size, metrics=self._payload_metrics)
 
         try:
-            schema = self.create_schema(self.payload_cls)
-            return schema.load(raw_payload)
+            schema = self.get_schema(self.payload_cls)
+
+            if self._offloader is None or size < self._offload_payload_size:
+                return schema.load(raw_payload)
+
+            if self._offloader.processes:
+                return await self._offloader.run(
+                    self.name, PAYLOAD, load_with_schema, self.payload_cls, self._schema_context, raw_payload
+                )
+
+            return await self._offloader.run(self.name, PAYLOAD, schema.load, raw_payload)
         except ValidationError as exc:
-            raise InvalidPayload(errors=exc.errors)
+            raise InvalidPayload(errors=exc.messages)
+
+    def should_offload_dump(self, response: Union[web.Response, Tuple[Any, HTTPStatus]]) -> bool:
+        if self._offloader is None or not isinstance(response, tuple):
+            return False
+
+        data, status = response
+        if count_items(data) < self._offload_response_items:
+            return False
+
+        # Only default processing of supported statuses could be run in other process
+        return not self._offloader.processes or (
+            status in self.responses and type(self).process_response is OperationView.process_response
+        )
+
+    async def dump_response(
+        self, response: Union[web.Response, Tuple[Any, HTTPStatus]], media_type: str = JSON
+    ) -> web.Response:
+        """Process response, large ones in executor."""
+
+        if not self.should_offload_dump(response):
+            return self.render_response(response, media_type)
+
+        if self._offloader is not None and self._offloader.processes:
+            data, status = response  # type: ignore
+            body = await self._offloader.run(
+                self.name,
+                DUMP,
+                dump_with_schema,
+                self.responses[status],
+                self._schema_context,
+                self.fast_dump,
+                data,
+                media_type,
+            )
+            return self.encoded_response(body, status, media_type)
+
+        return await self._offloader.run(self.name, DUMP, self.render_response, response, media_type)  # type: ignore
 
     @abstractmethod
     async def process_request(
         self, request: web.Request, params: Optional[Dict[str, Any]] = None, payload: Optional[PayloadType] = None
-    ) -> Union[web.Response, Tuple[Any, HTTPStatus]]:
+    ) -> Union[web.Response, Tuple[Any, HTTPStatus], AsyncIterator[Any], Tuple[AsyncIterator[Any], HTTPStatus]]:
         pass
 
-    def process_response(self, response: Union[web.Response, Tuple[Any, HTTPStatus]]) -> web.Response:
+    def get_dump(self, status: HTTPStatus) -> Callable[[Any], Any]:
+        schema_cls = self.responses.get(status, None)
+        if not schema_cls:
+            raise ValueError("Unsupported response status")
+
+        schema = self.get_schema(schema_cls)
+        return get_dumper(schema) if self.fast_dump else schema.dump
+
+    def negotiate(self, request: web.Request) -> str:
+        """Media type of response acceptable by client."""
+
+        accept = request.headers.get(hdrs.ACCEPT, None)
+        if len(self.media_types) == 1 or not accept or accept == JSON:
+            return self.media_types[0]
+
+        return choose_media_type(accept, self.media_types)
+
+    def render_response(self, response: Union[web.Response, Tuple[Any, HTTPStatus]], media_type: str) -> web.Response:
+        """Process response in negotiated media type, JSON one for `process_response` without `media_type`."""
+
+        if self._negotiates_media_type:
+            return self.process_response(response, media_type=media_type)
+
+        return self.process_response(response)
+
+    def process_response(
+        self, response: Union[web.Response, Tuple[Any, HTTPStatus]], media_type: str = JSON
+    ) -> web.Response:
         if not isinstance(response, web.Response):
             data, status = response
 
-            schema_cls = self.responses.get(status, None)
-            if not schema_cls:
-                raise ValueError("Unsupported response status")
+            dump = self.get_dump(status)
+            response = self.encoded_response(CODECS[media_type].dumps(dump(data)), status, media_type)
+
+        return response
+
+    def encoded_response(self, body: bytes, status: HTTPStatus, media_type: str) -> web.Response:
+        response = web.Response(body=body, status=status, content_type=media_type)
 
-            schema = self.create_schema(schema_cls)
-            response = json_response(schema.dump(data), status=status)
+        if len(self.media_types) > 1:
+            response.headers[hdrs.VARY] = hdrs.ACCEPT
 
         return response
 
-    async def handle(self, request: web.Request) -> web.Response:
-        params = None
-        if self.parameters:
-            try:
-                params = self.get_parameters(request)
-            except InvalidParameters as exc:
-                return self.process_response(response=(exc.errors, HTTPStatus.BAD_REQUEST))
+    async def stream_response(
+        self, request: web.Request, items: AsyncIterator[Any], status: HTTPStatus = HTTPStatus.OK
+    ) -> web.StreamResponse:
+        """Stream items as NDJSON or as chunked JSON array.
 
-        payload = None
-        if self.payload_cls:
-            try:
-                payload = await self.get_payload(request)
-            except InvalidPayload as exc:
-                return self.process_response(response=(exc.errors, HTTPStatus.UNPROCESSABLE_ENTITY))
+        Items are written in chunks of `stream_chunk_size` bytes, every write
+        waits for the transport to drain.
+        """
 
-        response = await self.process_request(request=request, params=params, payload=payload)
+        dump = self.get_dump(status)
+        ndjson = NDJSON in request.headers.get(hdrs.ACCEPT, "")
 
-        return self.process_response(response)
+        response = web.StreamResponse(status=status)
+        response.content_type = NDJSON if ndjson else "application/json"
+        await response.prepare(request)
+
+        separator = b"\n" if ndjson else b","
+        buffer = bytearray() if ndjson else bytearray(b"[")
+        first = True
+
+        try:
+            async for item in items:
+                if not ndjson and not first:
+                    buffer += separator
+
+                buffer += orjson.dumps(dump(item))
+                if ndjson:
+                    buffer += separator
+
+                first = False
+
+                if len(buffer) >= self.stream_chunk_size:
+                    await response.write(bytes(buffer))
+                    buffer.clear()
+        finally:
+            aclose = getattr(items, "aclose", None)
+            if aclose:
+                await aclose()
+
+        if not ndjson:
+            buffer += b"]"
+
+        if buffer:
+            await response.write(bytes(buffer))
+
+        await response.write_eof()
+        return response
+
+    def record_timings(self, request: web.Request, response: web.StreamResponse, timer: StageTimer) -> None:
+        if self._stage_latency:
+            for stage, duration in timer.timings.items():
+                self._stage_latency[stage].observe(duration)
+
+        request["timings"] = timer.timings
+
+        # Headers of streaming response are already sent
+        if self._server_timing and not response.prepared:
+            response.headers["Server-Timing"] = format_server_timing(timer.timings)
+
+    async def load_parameters(self, state: HandlingState) -> Optional[web.Response]:
+        if not self.parameters:
+            return None
+
+        try:
+            state.params = self.get_parameters(state.request)
+        except InvalidParameters as exc:
+            return self.render_response((exc.errors, HTTPStatus.BAD_REQUEST), state.media_type)
+
+        state.mark(PARAMETERS)
+        return None
+
+    async def lookup_cache(self, state: HandlingState) -> Optional[web.Response]:
+        if self._cache is None or state.request.method != hdrs.METH_GET:
+            return None
+
+        state.cache_key = make_key(state.params, state.request, self._cache_vary, state.media_type)
+        cached = self.get_cached(state.request, state.cache_key)
+        if cached is not None and state.conditional:
+            return self.conditional_response(state.request, cached)
+
+        return cached
+
+    async def check_version(self, state: HandlingState) -> Optional[web.Response]:
+        if not state.conditional:
+            return None
+
+        state.version = await self.get_version(state.request, state.params)
+        if state.version is None:
+            return None
+
+        headers = state.version.headers
+        if is_not_modified(state.request, headers.get(hdrs.ETAG, None), state.version.last_modified):
+            return self.not_modified(headers)
+
+        return None
+
+    async def load_payload(self, state: HandlingState) -> Optional[web.Response]:
+        if not self.payload_cls:
+            return None
+
+        try:
+            state.payload = await self.get_payload(state.request)
+        except InvalidPayload as exc:
+            return self.render_response((exc.errors, HTTPStatus.UNPROCESSABLE_ENTITY), state.media_type)
+
+        state.mark(PAYLOAD)
+        return None
+
+    async def execute(self, state: HandlingState) -> Any:
+        """Result of `process_request`, shared with identical requests and limited with deadline if any."""
+
+        if self._flights is not None and state.request.method == hdrs.METH_GET:
+            key = state.cache_key or make_key(state.params, state.request, self._cache_vary, state.media_type)
+            process = self.coalesced(state.request, key, state.params, state.media_type)
+        else:
+            process = self.process_request(request=state.request, params=state.params, payload=state.payload)
+
+        deadline = state.request.get(DEADLINE, None)
+        if deadline is not None:
+            return await self.process_before(deadline, process)
+
+        return await process
+
+    def set_validators(self, state: HandlingState, response: web.Response) -> None:
+        if response.status != HTTPStatus.OK or not isinstance(response.body, bytes):
+            return
+
+        validators = state.version.headers if state.version is not None else {}
+        if hdrs.ETAG not in validators:
+            response.headers[hdrs.ETAG] = body_etag(response.body)
+
+        response.headers.update(validators)
+
+    def store_cached(self, state: HandlingState, response: web.Response) -> None:
+        # Shared caches in front should not mix representations for different `cache_vary` headers
+        vary = merge_vary(response.headers.get(hdrs.VARY, None), self._cache_vary)
+        if vary:
+            response.headers[hdrs.VARY] = vary
+
+        if response.status != HTTPStatus.OK or not isinstance(response.body, bytes):
+            return
+
+        self._cache.set(self.name, state.cache_key, response, self.cache_ttl)  # type: ignore
+        response.headers[hdrs.CACHE_CONTROL] = self._cache_control
+
+    async def respond(self, state: HandlingState, result: Any) -> web.StreamResponse:
+        """Stream or dump result of processing."""
+
+        if hasattr(result, "__aiter__"):
+            return await self.stream_response(state.request, result)
+        elif isinstance(result, tuple) and hasattr(result[0], "__aiter__"):
+            return await self.stream_response(state.request, *result)
+
+        response = await self.dump_response(result, state.media_type)
+
+        if state.conditional:
+            self.set_validators(state, response)
+
+        if state.cache_key is not None:
+            self.store_cached(state, response)
+
+        if state.conditional:
+            response = self.conditional_response(state.request, response)
+
+        return response
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        state = HandlingState(
+            request=request,
+            media_type=self.negotiate(request),
+            timer=StageTimer() if self._stage_timing else None,
+            conditional=self.conditional and request.method == hdrs.METH_GET,
+        )
+
+        try:
+            return await self.run_stages(state)
+        finally:
+            close_uploaded_files(request)
+
+    async def run_stages(self, state: HandlingState) -> web.StreamResponse:
+        # Every stage could answer request on its own, with error, cached or `304 Not Modified` response
+        for stage in (self.load_parameters, self.lookup_cache, self.check_version, self.load_payload):
+            response = await stage(state)
+            if response is not None:
+                return response
+
+        result = await self.execute(state)
+        state.mark(PROCESS)
+
+        resp = await self.respond(state, result)
+
+        if state.timer:
+            state.timer.mark(DUMP)
+            self.record_timings(state.request, resp, state.timer)
+
+        return resp
+
+
+class SpecFormat(Enum):
+    json = "application/json"
+    yaml = "application/yaml"
+
+
+def render_spec(spec: Dict[str, Any], spec_format: SpecFormat) -> bytes:
+    if spec_format == SpecFormat.yaml:
+        from apispec.yaml_utils import dict_to_yaml  # type: ignore
+
+        return dict_to_yaml(spec).encode("utf-8")
+
+    return orjson.dumps(spec)
+
+
+@dataclass(frozen=True)
+class SpecRepresentation:
+    body: bytes
+    content_type: str
+    encoding: str
+    etag: str
+
+
+class SpecDocument:
+    """Frozen API specification.
+
+    Every representation of the specification (format, tag fragment and
+    content coding) is rendered once on the first request and then served
+    as is.
+    """
+
+    def __init__(self, spec: Dict[str, Any], max_age: int = 86400) -> None:
+        self._spec = spec
+        self._max_age = max_age
+        self._tags = {
+            tag for operations in self._operations(spec).values() for op in operations.values() for tag in op["tags"]
+        }
+        self._representations: Dict[Tuple[SpecFormat, Optional[str], str], SpecRepresentation] = {}
+
+    @staticmethod
+    def _operations(spec: Dict[str, Any], tag: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        paths = {}
+        for path, item in spec.get("paths", {}).items():
+            operations = {
+                method: op
+                for method, op in item.items()
+                if isinstance(op, dict) and "tags" in op and (not tag or tag in op["tags"])
+            }
+            if operations:
+                paths[path] = operations
+
+        return paths
+
+    @property
+    def cache_control(self) -> str:
+        return f"public, max-age={self._max_age}"
+
+    def has_tag(self, tag: str) -> bool:
+        return tag in self._tags
+
+    def to_dict(self, tag: Optional[str] = None) -> Dict[str, Any]:
+        if not tag:
+            return self._spec
+
+        return {**self._spec, "paths": self._operations(self._spec, tag)}
+
+    def get(self, spec_format: SpecFormat, tag: Optional[str] = None, encoding: str = IDENTITY) -> SpecRepresentation:
+        key = (spec_format, tag, encoding)
+
+        representation = self._representations.get(key, None)
+        if representation is None:
+            if encoding == IDENTITY:
+                body = render_spec(self.to_dict(tag), spec_format)
+                etag = '"{digest}"'.format(digest=hashlib.sha256(body).hexdigest()[:32])
+            else:
+                identity = self.get(spec_format, tag)
+                body = compress(identity.body, encoding)
+                etag = '{etag}-{encoding}"'.format(etag=identity.etag[:-1], encoding=encoding)
+
+            representation = SpecRepresentation(
+                body=body, content_type=spec_format.value, encoding=encoding, etag=etag
+            )
+            self._representations[key] = representation
+
+        return representation
+
+
+async def serve_spec(request: web.Request, spec_format: SpecFormat) -> web.Response:
+    document: SpecDocument = request.app["spec_document"]
+
+    tag = request.query.get("tag", None)
+    if tag and not document.has_tag(tag):
+        raise web.HTTPNotFound
+
+    encoding = choose_encoding(request.headers.get(hdrs.ACCEPT_ENCODING, None))
+    representation = document.get(spec_format, tag, encoding)
+
+    headers = {
+        hdrs.CACHE_CONTROL: document.cache_control,
+        hdrs.ETAG: representation.etag,
+        hdrs.VARY: hdrs.ACCEPT_ENCODING,
+    }
+
+    if etag_matches(request.headers.get(hdrs.IF_NONE_MATCH, None), representation.etag):
+        return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    if representation.encoding != IDENTITY:
+        headers[hdrs.CONTENT_ENCODING] = representation.encoding
+
+    return web.Response(body=representation.body, content_type=representation.content_type, headers=headers)
 
 
 async def handler(request: web.Request) -> web.Response:
@@ -220,4 +1053,12 @@ async def handler(request: web.Request) -> web.Response:
     Expose API specification to the world
     """
 
-    return web.json_response(request.app["spec"].to_dict())
+    return await serve_spec(request, SpecFormat.json)
+
+
+async def yaml_handler(request: web.Request) -> web.Response:
+    """
+    Expose API specification to the world in YAML format
+    """
+
+    return await serve_spec(request, SpecFormat.yaml)
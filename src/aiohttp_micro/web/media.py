@@ -0,0 +1,85 @@
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+import orjson
+
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2  # type: ignore
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+
+class Codec(NamedTuple):
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+CODECS: Dict[str, Codec] = {JSON: Codec(orjson.dumps, orjson.loads)}
+
+if msgpack is not None:
+    CODECS[MSGPACK] = Codec(
+        lambda data: msgpack.packb(data, use_bin_type=True), lambda body: msgpack.unpackb(body, raw=False)
+    )
+
+if cbor2 is not None:
+    CODECS[CBOR] = Codec(cbor2.dumps, cbor2.loads)
+
+# Preferred media types go first
+MEDIA_TYPES = tuple(CODECS)
+
+ALIASES = {"application/x-msgpack": MSGPACK}
+
+
+def get_codec(content_type: str) -> Optional[Codec]:
+    return CODECS.get(ALIASES.get(content_type, content_type), None)
+
+
+def parse_accept(header: str) -> Dict[str, float]:
+    accepted = {}
+
+    for item in header.split(","):
+        media_type, *params = item.split(";")
+        media_type = media_type.strip().lower()
+        if not media_type:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        accepted[ALIASES.get(media_type, media_type)] = quality
+
+    return accepted
+
+
+def choose_media_type(header: Optional[str], media_types: Iterable[str] = MEDIA_TYPES) -> str:
+    """Choose response media type from `Accept` request header, JSON when nothing matches."""
+
+    if not header:
+        return JSON
+
+    accepted = parse_accept(header)
+    default = max(accepted.get("*/*", 0.0), accepted.get("application/*", 0.0))
+
+    best, best_quality = JSON, 0.0
+    for media_type in media_types:
+        quality = accepted.get(media_type, default)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+
+    return best
@@ -1,7 +1,6 @@
 from typing import Awaitable, Callable
 
 from aiohttp import web
-from sentry_sdk import capture_exception
 
 
 Handler = Callable[[web.Request], Awaitable[web.Response]]
@@ -15,6 +14,8 @@ async def common_middleware(request: web.Request, handler: Handler) -> web.Respo
         if "config" in request.app and request.app["config"].debug:
             raise exc
         else:
+            from sentry_sdk import capture_exception
+
             capture_exception(exc)
 
         if isinstance(exc, (web.HTTPClientError,)):
@@ -0,0 +1,81 @@
+import time
+from http import HTTPStatus
+from typing import Collection, Dict, Optional
+
+from aiohttp import hdrs, web
+
+from aiohttp_micro.web.admission import Limiter
+from aiohttp_micro.web.middlewares import Handler
+from aiohttp_micro.web.middlewares.metrics import get_endpoint
+
+
+EXCLUDE_PATHS = ("/-/health", "/-/metrics")
+
+
+async def admit(limiter: Optional[Limiter], route_limiter: Optional[Limiter]) -> bool:
+    """Take slots of both route and global limiters or none of them."""
+
+    if route_limiter is not None and await route_limiter.acquire():
+        return False
+
+    try:
+        rejected = limiter is not None and bool(await limiter.acquire())
+    except BaseException:
+        # Cancelled while queued for global slot, on client disconnect for example
+        if route_limiter is not None:
+            route_limiter.release()
+        raise
+
+    if rejected and route_limiter is not None:
+        route_limiter.release()
+
+    return not rejected
+
+
+def admission_middleware_factory(
+    limiter: Optional[Limiter] = None,
+    route_limiters: Optional[Dict[str, Limiter]] = None,
+    exclude_paths: Collection[str] = EXCLUDE_PATHS,
+    retry_after: int = 1,
+):
+    """Shed requests over concurrency limits with `503 Service Unavailable`.
+
+    Requests take slot of their route limiter first, keyed with route path
+    template, and of global `limiter` then. Requests to `exclude_paths` are
+    always admitted.
+    """
+
+    routes = route_limiters or {}
+    exclude = frozenset(exclude_paths)
+
+    def reject() -> web.Response:
+        # Returned instead of raised, server errors raised by handlers are turned into 500 by common middleware
+        return web.Response(
+            status=HTTPStatus.SERVICE_UNAVAILABLE,
+            text="Service is overloaded",
+            headers={hdrs.RETRY_AFTER: str(retry_after)},
+        )
+
+    @web.middleware
+    async def middleware(request: web.Request, handler: Handler) -> web.Response:
+        endpoint = get_endpoint(request)
+        if endpoint in exclude:
+            return await handler(request)
+
+        route_limiter = routes.get(endpoint, None) if endpoint else None
+        if not await admit(limiter, route_limiter):
+            return reject()
+
+        started_at = time.monotonic()
+        try:
+            return await handler(request)
+        finally:
+            latency = time.monotonic() - started_at
+
+            if limiter is not None:
+                limiter.release(latency)
+
+            if route_limiter is not None:
+                route_limiter.release(latency)
+
+    return middleware
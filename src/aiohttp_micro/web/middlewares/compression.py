@@ -0,0 +1,114 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Collection, Dict, Optional
+
+from aiohttp import hdrs, web
+
+from aiohttp_micro.web.compression import choose_encoding, compress, ENCODINGS, IDENTITY
+from aiohttp_micro.web.handlers import weak_etag
+from aiohttp_micro.web.middlewares import Handler
+
+
+COMPRESSIBLE_TYPES = frozenset(
+    (
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "application/xml",
+        "application/yaml",
+        "text/css",
+        "text/csv",
+        "text/html",
+        "text/plain",
+    )
+)
+
+
+def is_compressible(response: web.StreamResponse, min_size: int, content_types: Collection[str]) -> bool:
+    """Check whether complete response body is worth compression."""
+
+    if not isinstance(response, web.Response) or response.prepared or hdrs.CONTENT_ENCODING in response.headers:
+        return False
+
+    body = response.body
+    return isinstance(body, bytes) and len(body) >= min_size and response.content_type in content_types
+
+
+def vary_on_encoding(response: web.Response) -> None:
+    """Mark response representation as depending on `Accept-Encoding`."""
+
+    vary = response.headers.get(hdrs.VARY, None)
+    if not vary:
+        response.headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+    elif hdrs.ACCEPT_ENCODING.lower() not in vary.lower():
+        response.headers[hdrs.VARY] = f"{vary}, {hdrs.ACCEPT_ENCODING}"
+
+
+def set_encoded_body(response: web.Response, body: bytes, encoding: str) -> None:
+    """Replace response body with its encoded representation."""
+
+    response.body = body
+    response.headers[hdrs.CONTENT_ENCODING] = encoding
+
+    # Compressed representation is not byte-for-byte identical to original one
+    etag = response.headers.get(hdrs.ETAG, None)
+    if etag:
+        response.headers[hdrs.ETAG] = weak_etag(etag)
+
+
+def compression_middleware_factory(
+    min_size: int = 1024,
+    content_types: Collection[str] = COMPRESSIBLE_TYPES,
+    executor_threshold: int = 1024 * 1024,
+    executor: Optional[Executor] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+):
+    """Compress response bodies according to `Accept-Encoding` request header.
+
+    Only complete responses of allowed content types and at least `min_size`
+    bytes long are compressed. Bodies over `executor_threshold` bytes are
+    compressed in `executor` to keep event loop responsive.
+    """
+
+    allowed = frozenset(content_types)
+
+    ratio = time_spent = None
+    if metrics:
+        ratio = {encoding: metrics["compression_ratio"].labels(encoding) for encoding in ENCODINGS}
+        time_spent = {encoding: metrics["compression_time"].labels(encoding) for encoding in ENCODINGS}
+
+    async def compress_body(body: bytes, encoding: str) -> bytes:
+        started_at = time.perf_counter()
+        if len(body) >= executor_threshold:
+            compressed = await asyncio.get_event_loop().run_in_executor(executor, compress, body, encoding)
+        else:
+            compressed = compress(body, encoding)
+
+        if ratio and time_spent:
+            time_spent[encoding].observe(time.perf_counter() - started_at)
+            ratio[encoding].observe(len(compressed) / len(body))
+
+        return compressed
+
+    @web.middleware
+    async def middleware(request: web.Request, handler: Handler) -> web.Response:
+        response = await handler(request)
+
+        if not is_compressible(response, min_size, allowed):
+            return response
+
+        vary_on_encoding(response)
+
+        encoding = choose_encoding(request.headers.get(hdrs.ACCEPT_ENCODING, None))
+        if encoding == IDENTITY:
+            return response
+
+        body = response.body
+        compressed = await compress_body(body, encoding)
+        if len(compressed) < len(body):
+            set_encoded_body(response, compressed, encoding)
+
+        return response
+
+    return middleware
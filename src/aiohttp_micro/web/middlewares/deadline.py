@@ -0,0 +1,30 @@
+from typing import Optional
+
+from aiohttp import web
+
+from aiohttp_micro.web.deadline import DEADLINE, Deadline, get_timeout
+from aiohttp_micro.web.middlewares import Handler
+
+
+def deadline_middleware_factory(default_timeout: Optional[float] = None, max_timeout: Optional[float] = None):
+    """Store deadline of request from `X-Request-Timeout` or `grpc-timeout` headers.
+
+    Requests without timeout headers get `default_timeout`, requested
+    timeouts are capped with `max_timeout`.
+    """
+
+    @web.middleware
+    async def middleware(request: web.Request, handler: Handler) -> web.Response:
+        timeout = get_timeout(request.headers)
+        if timeout is None:
+            timeout = default_timeout
+
+        if timeout is not None and max_timeout is not None:
+            timeout = min(timeout, max_timeout)
+
+        if timeout is not None:
+            request[DEADLINE] = Deadline(timeout)
+
+        return await handler(request)
+
+    return middleware
@@ -1,6 +1,7 @@
 from aiohttp import web
 
 from aiohttp_micro.web.middlewares import Handler
+from aiohttp_micro.web.timing import to_milliseconds
 
 
 def logging_middleware_factory(tracing_header: str = "X-B3-Traceid"):
@@ -14,7 +15,13 @@ def logging_middleware_factory(tracing_header: str = "X-B3-Traceid"):
 
         response = await handler(request)
 
-        request["logger"].debug(f"{request.method} {request.path} {response.status}")
+        timings = request.get("timings", None)
+        if timings:
+            request["logger"].debug(
+                f"{request.method} {request.path} {response.status}", timings=to_milliseconds(timings)
+            )
+        else:
+            request["logger"].debug(f"{request.method} {request.path} {response.status}")
 
         return response
 
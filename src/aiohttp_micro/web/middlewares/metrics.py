@@ -1,26 +1,116 @@
 import time
+from http import HTTPStatus
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
 
-from aiohttp import web
+from aiohttp import hdrs, web
 
 from aiohttp_micro.web.middlewares import Handler
 
 
+UNMATCHED_ENDPOINT = "<unmatched>"
+OVERFLOW_ENDPOINT = "<overflow>"
+OTHER_METHOD = "OTHER"
+
+
+def get_endpoint(request: web.Request) -> Optional[str]:
+    """Canonical template of matched route, `None` for unmatched requests."""
+
+    match_info = request.match_info
+    if match_info.http_exception is not None:
+        return None
+
+    resource = match_info.route.resource
+    if resource is None:
+        return None
+
+    return resource.canonical
+
+
+class EndpointMetrics:
+    """Label children of request metrics for a single endpoint and method."""
+
+    def __init__(self, app_name: str, endpoint: str, method: str, metrics: Dict[str, Any]) -> None:
+        self._app_name = app_name
+        self._endpoint = endpoint
+        self._method = method
+        self._requests_total = metrics["requests_total"]
+
+        self.in_progress = metrics["requests_in_progress"].labels(app_name, endpoint, method)
+        self.latency = metrics["requests_latency"].labels(app_name, endpoint)
+
+        self._total: Dict[int, Any] = {}
+
+    def total(self, status: int) -> Any:
+        child = self._total.get(status, None)
+        if child is None:
+            child = self._total[status] = self._requests_total.labels(
+                self._app_name, self._method, self._endpoint, status
+            )
+
+        return child
+
+
+class RequestMetrics:
+    """Cache of request metrics label children per route and method.
+
+    Endpoints are labeled with canonical route templates, so requests to
+    `/api/items/1` and `/api/items/2` share the same series. Requests which
+    did not match any route share `<unmatched>` endpoint and endpoints over
+    `max_endpoints` limit share `<overflow>` one. Non-standard methods share
+    `OTHER` method label.
+    """
+
+    def __init__(self, app_name: str, metrics: Dict[str, Any], max_endpoints: int = 1000) -> None:
+        self._app_name = app_name
+        self._metrics = metrics
+        self._max_endpoints = max_endpoints
+
+        self._endpoints: Set[str] = set()
+        self._cache: Dict[Tuple[Hashable, str], EndpointMetrics] = {}
+
+    def get(self, request: web.Request) -> EndpointMetrics:
+        endpoint = get_endpoint(request)
+        method = request.method if request.method in hdrs.METH_ALL else OTHER_METHOD
+
+        key = (request.match_info.route if endpoint else None, method)
+        metrics = self._cache.get(key, None)
+        if metrics is None:
+            metrics = self._cache[key] = self._create(endpoint, method)
+
+        return metrics
+
+    def _create(self, endpoint: Optional[str], method: str) -> EndpointMetrics:
+        if endpoint is None:
+            endpoint = UNMATCHED_ENDPOINT
+        elif endpoint not in self._endpoints:
+            if len(self._endpoints) < self._max_endpoints:
+                self._endpoints.add(endpoint)
+            else:
+                endpoint = OVERFLOW_ENDPOINT
+
+        return EndpointMetrics(self._app_name, endpoint, method, self._metrics)
+
+
 @web.middleware
 async def middleware(request: web.Request, handler: Handler) -> web.Response:
     """
     Middleware to collect http requests count and response latency
     """
 
-    start_time = time.monotonic()
-    request.app["metrics"]["requests_in_progress"].labels(request.app["app_name"], request.path, request.method).inc()
-
-    response = await handler(request)
+    metrics = request.app["request_metrics"].get(request)
 
-    resp_time = time.monotonic() - start_time
-    request.app["metrics"]["requests_latency"].labels(request.app["app_name"], request.path).observe(resp_time)
-    request.app["metrics"]["requests_in_progress"].labels(request.app["app_name"], request.path, request.method).dec()
-    request.app["metrics"]["requests_total"].labels(
-        request.app["app_name"], request.method, request.path, response.status
-    ).inc()
+    start_time = time.monotonic()
+    metrics.in_progress.inc()
 
-    return response
+    status = HTTPStatus.INTERNAL_SERVER_ERROR.value
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as exc:
+        status = exc.status
+        raise
+    finally:
+        metrics.latency.observe(time.monotonic() - start_time)
+        metrics.in_progress.dec()
+        metrics.total(status).inc()
@@ -1,47 +1,83 @@
 from typing import List, Optional
 
 from aiohttp import web
-from aiozipkin.helpers import make_context
+from aiozipkin.helpers import make_context, TraceContext
+from aiozipkin.span import SpanAbc
 
+from aiohttp_micro.core.tools.zipkin import RateSampler
 from aiohttp_micro.web.middlewares import Handler
+from aiohttp_micro.web.timing import to_milliseconds
 
 
-def tracing_middleware_factory(exclude_routes: Optional[List[str]] = None):
+def sampled_context(
+    request: web.Request, route_name: Optional[str], sampler: Optional[RateSampler]
+) -> Optional[TraceContext]:
+    """Tracing context of request if it should be traced, `None` otherwise."""
+
+    context = make_context(request.headers)
+    if context is None or context.sampled is False:
+        return None
+
+    if context.sampled is None and sampler is not None:
+        # Make sampling decision here to avoid creating spans which would not be recorded
+        if not sampler.is_sampled(route_name):
+            return None
+
+        context = context._replace(sampled=True)
+
+    return context
+
+
+def tag_request(span: SpanAbc, request: web.Request) -> None:
+    span.name(f"{request.method.upper()} {request.path}")
+    span.kind("SERVER")
+
+    span.tag("http.path", request.path)
+    span.tag("http.method", request.method.upper())
+
+    host = request.headers.get("Host", None)
+    if host:
+        span.tag("http.host", host)
+
+
+def tag_response(span: SpanAbc, request: web.Request, response: web.StreamResponse) -> None:
+    span.tag("http.status_code", str(response.status))
+    span.tag("http.response.size", response.content_length)
+
+    timings = request.get("timings", None)
+    if timings:
+        for stage, duration in to_milliseconds(timings).items():
+            span.tag(f"timing.{stage}_ms", str(duration))
+
+
+def tracing_middleware_factory(exclude_routes: Optional[List[str]] = None, sampler: Optional[RateSampler] = None):
     exclude: List[str] = []
     if exclude_routes:
         exclude = exclude_routes
 
     @web.middleware
     async def tracing_middleware(request: web.Request, handler: Handler) -> web.Response:
-        context = make_context(request.headers)
         route_name = request.match_info.route.name
+        if route_name in exclude:
+            return await handler(request)
 
-        if context and route_name not in exclude:
-            tracer = request.app["tracer"]
-            span = tracer.join_span(context)
-
-            host = request.headers.get("Host", None)
-
-            with tracer.new_child(span.context) as child_span:
-                child_span.name(f"{request.method.upper()} {request.path}")
-                child_span.kind("SERVER")
+        context = sampled_context(request, route_name, sampler)
+        if context is None:
+            return await handler(request)
 
-                child_span.tag("http.path", request.path)
-                child_span.tag("http.method", request.method.upper())
+        tracer = request.app["tracer"]
+        span = tracer.join_span(context)
 
-                if host:
-                    child_span.tag("http.host", host)
+        with tracer.new_child(span.context) as child_span:
+            tag_request(child_span, request)
 
-                try:
-                    response = await handler(request)
-                    child_span.tag("http.status_code", str(response.status))
-                except web.HTTPException as e:
-                    child_span.tag("http.status_code", str(e.status))
-                    raise
+            try:
+                response = await handler(request)
+            except web.HTTPException as e:
+                child_span.tag("http.status_code", str(e.status))
+                raise
 
-                child_span.tag("http.response.size", response.content_length)
-        else:
-            response = await handler(request)
+            tag_response(child_span, request, response)
 
         return response
 
@@ -0,0 +1,94 @@
+import asyncio
+import dataclasses
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from prometheus_client import Gauge, Histogram  # type: ignore
+
+
+T = TypeVar("T")
+
+
+def count_items(data: Any) -> int:
+    """Estimate number of items in response data.
+
+    Collections are measured by their length, dicts and dataclasses by the
+    longest collection among their values.
+    """
+
+    if isinstance(data, (list, tuple, set, frozenset)):
+        return len(data)
+
+    if dataclasses.is_dataclass(data) and not isinstance(data, type):
+        data = vars(data)
+
+    if isinstance(data, dict):
+        return max((len(value) for value in data.values() if isinstance(value, (list, tuple))), default=0)
+
+    return 0
+
+
+def timed_call(func: Callable[..., T], *args: Any) -> Tuple[T, float, float]:
+    """Call function in executor, along with wall clock time it started and finished at.
+
+    Defined at module level to be pickled for process pool executors.
+    """
+
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at, time.time()
+
+
+class Offloader:
+    """Run CPU-bound payload loading and response dumping in executor.
+
+    Payloads of at least `payload_size` bytes and responses of at least
+    `response_items` items are processed in `executor` instead of event loop.
+    Functions and arguments passed to process pool executors should be
+    picklable, module level functions and classes for example.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        payload_size: int = 1024 * 1024,
+        response_items: int = 1000,
+        app_name: str = "",
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.executor = executor
+        self.payload_size = payload_size
+        self.response_items = response_items
+        self.processes = isinstance(executor, ProcessPoolExecutor)
+
+        self._app_name = app_name
+        self._metrics = metrics or {}
+
+    def _metric(self, name: str, operation: str, stage: str) -> Any:
+        metric = self._metrics.get(name, None)
+        return metric.labels(self._app_name, operation, stage) if metric is not None else None
+
+    async def run(self, operation: str, stage: str, func: Callable[..., T], *args: Any) -> T:
+        queued: Optional["Gauge"] = self._metric("offload_queued", operation, stage)
+        wait_time: Optional["Histogram"] = self._metric("offload_wait", operation, stage)
+        execution_time: Optional["Histogram"] = self._metric("offload_execution", operation, stage)
+
+        if queued is not None:
+            queued.inc()
+
+        submitted_at = time.time()
+        try:
+            result, started_at, finished_at = await asyncio.get_event_loop().run_in_executor(
+                self.executor, timed_call, func, *args
+            )
+        finally:
+            if queued is not None:
+                queued.dec()
+
+        if wait_time is not None and execution_time is not None:
+            wait_time.observe(max(started_at - submitted_at, 0.0))
+            execution_time.observe(finished_at - started_at)
+
+        return result
@@ -1,8 +1,10 @@
-from typing import Any, Dict, Generic, Type, TypeVar
+from typing import Any, Dict, Generic, Optional, Type, TypeVar
 
-from marshmallow import EXCLUDE, fields, post_dump, post_load, Schema
+from marshmallow import EXCLUDE, fields, post_dump, post_load, Schema, validates_schema, ValidationError
 
-from aiohttp_micro.core.entities import Payload
+from aiohttp_micro.core.cursors import CursorCodec
+from aiohttp_micro.core.entities import CursorFilters, Payload
+from aiohttp_micro.core.exceptions import InvalidCursor
 from aiohttp_micro.core.schemas import JSON
 from aiohttp_micro.web.handlers.openapi import ParameterIn, ParametersSchema, ResponseSchema
 
@@ -42,6 +44,55 @@ class CollectionFiltersSchema(ParametersSchema):
         return obj
 
 
+class CursorFiltersSchema(ParametersSchema):
+    """Collection cursor filters.
+
+    Cursors are decoded with `cursor_codec` from schema context, which
+    `OperationView` fills from application.
+    """
+
+    in_ = ParameterIn.query
+
+    after = fields.Str(missing=None, description="Cursor of the last item on previous page")
+    before = fields.Str(missing=None, description="Cursor of the first item on next page")
+    limit = fields.Int(
+        default=10, missing=10, validate=lambda limit: 10 <= limit <= 50, description="Number of items per page"
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+    @validates_schema
+    def validate_cursors(self, data: JSON, **kwargs) -> None:
+        if data.get("after", None) and data.get("before", None):
+            raise ValidationError("Only one of cursors could be used", "before")
+
+    def decode(self, cursor: Optional[str], field_name: str) -> Optional[tuple]:
+        if not cursor:
+            return None
+
+        codec: CursorCodec = self.context["cursor_codec"]
+        try:
+            return codec.decode(cursor)
+        except InvalidCursor:
+            raise ValidationError("Invalid cursor", field_name)
+
+    @post_load
+    def build_filters(self, data: JSON, **kwargs) -> CursorFilters:
+        return CursorFilters(
+            limit=data["limit"],
+            after=self.decode(data["after"], "after"),
+            before=self.decode(data["before"], "before"),
+        )
+
+
+class CursorPageSchema(ResponseSchema):
+    """Collection page with cursors of adjacent pages, subclasses add `items` field."""
+
+    next = fields.Str(allow_none=True, description="Cursor of the next page")
+    prev = fields.Str(allow_none=True, description="Cursor of the previous page")
+
+
 class ErrorResponseSchema(ResponseSchema):
     code = fields.Str(description="Error code")
     message = fields.Str(description="Error description")
@@ -0,0 +1,121 @@
+import enum
+import hashlib
+import os
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+import orjson
+from marshmallow import fields, Schema
+
+from aiohttp_micro.web.handlers.openapi import OperationView
+
+
+SpecOperation = Tuple[str, str, OperationView]
+
+# Packages generating and validating specification, their upgrades could change it
+GENERATORS = ("apispec", "marshmallow")
+
+
+def describe_field(field: fields.Field) -> Dict[str, Any]:
+    """Everything about field which could change its specification."""
+
+    description = {
+        "type": f"{type(field).__module__}.{type(field).__qualname__}",
+        "attribute": field.attribute,
+        "data_key": field.data_key,
+        "required": field.required,
+        "allow_none": field.allow_none,
+        "load_only": field.load_only,
+        "dump_only": field.dump_only,
+        "default": field.load_default if hasattr(field, "load_default") else field.missing,
+        "metadata": field.metadata,
+        "validators": field.validators,
+    }
+
+    for attr in ("nested", "inner", "tuple_fields", "key_field", "value_field", "enum"):
+        value = getattr(field, attr, None)
+        if value is not None:
+            description[attr] = value
+
+    return description
+
+
+def describe_schema(schema_cls: Type[Schema]) -> Dict[str, Any]:
+    in_ = getattr(schema_cls, "in_", None)
+
+    return {
+        "name": f"{schema_cls.__module__}.{schema_cls.__qualname__}",
+        "doc": schema_cls.__doc__,
+        "in": in_.value if in_ is not None else None,
+        "unknown": schema_cls.opts.unknown,
+        "fields": schema_cls._declared_fields,
+    }
+
+
+def describe(value: Any) -> Any:
+    if isinstance(value, type) and issubclass(value, Schema):
+        return describe_schema(value)
+    elif isinstance(value, Schema):
+        return describe_schema(type(value))
+    elif isinstance(value, fields.Field):
+        return describe_field(value)
+    elif isinstance(value, type) and issubclass(value, enum.Enum):
+        return [member.value for member in value]
+    elif isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    elif callable(value) and hasattr(value, "__qualname__"):
+        # Functions and lambdas are represented with their names, their reprs contain addresses
+        return f"{value.__module__}.{value.__qualname__}"
+
+    return repr(value)
+
+
+def fingerprint(spec_info: Dict[str, Any], operations: Iterable[SpecOperation]) -> str:
+    """Digest of everything API specification is generated from."""
+
+    source = {
+        "generators": {name: metadata.version(name) for name in GENERATORS},
+        "info": spec_info,
+        "operations": [
+            {"method": method, "path": path, "doc": view.__doc__, "operation": view.spec.generate()}
+            for method, path, view in operations
+        ],
+    }
+
+    body = orjson.dumps(source, default=describe, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.sha256(body).hexdigest()
+
+
+def load_spec(path: str, expected: str) -> Optional[Dict[str, Any]]:
+    """Specification from cache file, `None` if it is missing, broken or built from other sources."""
+
+    try:
+        cached = orjson.loads(Path(path).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict) or cached.get("fingerprint", None) != expected:
+        return None
+
+    return cached.get("spec", None)
+
+
+def save_spec(path: str, spec_fingerprint: str, spec: Dict[str, Any]) -> None:
+    """Write validated specification to cache file atomically."""
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(orjson.dumps({"fingerprint": spec_fingerprint, "spec": spec}))
+
+        # Cache is usually built by other user than the one application runs with
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
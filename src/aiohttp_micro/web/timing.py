@@ -0,0 +1,37 @@
+import time
+from typing import Dict, Tuple
+
+
+PARAMETERS = "parameters"
+PAYLOAD = "payload"
+PROCESS = "process"
+DUMP = "dump"
+
+STAGES: Tuple[str, ...] = (PARAMETERS, PAYLOAD, PROCESS, DUMP)
+
+
+class StageTimer:
+    """Durations of request handling stages, seconds."""
+
+    __slots__ = ("timings", "_started_at")
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self._started_at = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """Finish `stage` started when previous one was finished."""
+
+        now = time.perf_counter()
+        self.timings[stage] = now - self._started_at
+        self._started_at = now
+
+
+def to_milliseconds(timings: Dict[str, float]) -> Dict[str, float]:
+    return {stage: round(duration * 1000, 3) for stage, duration in timings.items()}
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """Value of `Server-Timing` response header."""
+
+    return ", ".join(f"{stage};dur={duration}" for stage, duration in to_milliseconds(timings).items())
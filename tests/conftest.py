@@ -1,22 +1,83 @@
-from typing import NamedTuple
+import asyncio
+from http import HTTPStatus
+from typing import Optional
 
-import pkg_resources  # type: ignore
 import pytest  # type: ignore
 from aiohttp import web
+from marshmallow import fields, validate
 
-from aiohttp_micro import AppConfig, setup
+import aiohttp_micro
+from aiohttp_micro import AppConfig, Distribution, setup, setup_metrics, setup_openapi
+from aiohttp_micro.web.handlers.openapi import (
+    OperationView,
+    ParameterIn,
+    ParametersSchema,
+    ResourceVersion,
+    ResponseSchema,
+)
+
+
+class GreetParamsSchema(ParametersSchema):
+    in_ = ParameterIn.query
+
+    name = fields.Str(missing="world")
+
+
+class GreetingSchema(ResponseSchema):
+    """Greeting."""
+
+    greeting = fields.Str()
+
+
+class GreetView(OperationView):
+    """Greet somebody."""
+
+    parameters = {"query": GreetParamsSchema}
+    responses = {HTTPStatus.OK: GreetingSchema}
+
+    # Time to think about greeting, lets identical requests overlap
+    delay = 0.0
+    # Version checked by conditional requests, ETag is computed from response otherwise
+    version: Optional[ResourceVersion] = None
+
+    calls = 0
+
+    async def get_version(self, request, params):
+        return self.version
+
+    async def process_request(self, request, params=None, payload=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+        if params["query"]["name"] == "nobody":
+            raise web.HTTPNotFound(text="Nobody to greet")
+
+        return {"greeting": f"Hello, {params['query']['name']}"}, HTTPStatus.OK
+
+
+class ItemResponseSchema(ResponseSchema):
+    """Item response."""
+
+    name = fields.Str(description="Item name", validate=validate.Length(min=1))
+    tags = fields.List(fields.Str(), missing=list)
+
+
+class GetItemView(OperationView):
+    """Get item."""
+
+    parameters = {}
+    responses = {HTTPStatus.OK: ItemResponseSchema}
+
+    async def process_request(self, request, params=None, payload=None):
+        return {"name": "Foo"}, HTTPStatus.OK
 
 
 @pytest.fixture(scope="function")
 def distribution(monkeypatch):
-    class Distribution(NamedTuple):
-        project_name: str
-        version: str
-
     def patch_distribution(*args, **kwargs):
         return Distribution("micro", "0.0.1.dev1")
 
-    monkeypatch.setattr(pkg_resources, "get_distribution", patch_distribution)
+    monkeypatch.setattr(aiohttp_micro, "get_distribution", patch_distribution)
 
 
 @pytest.fixture(scope="function")
@@ -32,3 +93,57 @@ def app(loop, distribution):
     yield app
 
     loop.run_until_complete(runner.cleanup())
+
+
+@pytest.fixture(scope="function")
+def greet_view():
+    """Create greet operation with overridden attributes."""
+
+    def create(name: str = "greet", security=None, **attrs) -> GreetView:
+        view = GreetView(name=name, security=security, tags=["greetings"])
+        for attr, value in attrs.items():
+            setattr(view, attr, value)
+
+        return view
+
+    return create
+
+
+@pytest.fixture(scope="function")
+def get_item_view():
+    """Create get item operation with overridden attributes."""
+
+    def create(name: str = "getItem", tags=("items",), **attrs) -> GetItemView:
+        view = GetItemView(name=name, security=None, tags=list(tags))
+        for attr, value in attrs.items():
+            setattr(view, attr, value)
+
+        return view
+
+    return create
+
+
+@pytest.fixture(scope="function")
+def openapi_app(distribution):
+    """Create application serving operations.
+
+    Application is set up by `prepare` before `setup_openapi`, which gets the
+    rest of options.
+    """
+
+    def create(operations, metrics: bool = False, prepare=None, **options) -> web.Application:
+        app = web.Application()
+        setup(app, app_name="micro", config=AppConfig())
+        if metrics:
+            setup_metrics(app)
+
+        if prepare is not None:
+            prepare(app)
+
+        setup_openapi(
+            app, title="Micro", version="0.0.1", description="Test microservice", operations=operations, **options
+        )
+
+        return app
+
+    return create
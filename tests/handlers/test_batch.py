@@ -0,0 +1,195 @@
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import web
+from marshmallow import EXCLUDE, fields
+
+from aiohttp_micro import setup_admission_control, setup_batch
+from aiohttp_micro.web.handlers.openapi import (
+    OperationView,
+    ParameterIn,
+    ParametersSchema,
+    PayloadSchema,
+    ResponseSchema,
+)
+from aiohttp_micro.web.middlewares import Handler
+
+
+class ItemSchema(ResponseSchema):
+    """Item."""
+
+    key = fields.Int()
+    name = fields.Str()
+    user = fields.Str(allow_none=True)
+
+
+class KeyParameters(ParametersSchema):
+    in_ = ParameterIn.path
+
+    key = fields.Int(required=True)
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class NameParameters(ParametersSchema):
+    in_ = ParameterIn.query
+
+    name = fields.Str(missing="item")
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class ItemPayloadSchema(PayloadSchema):
+    """New item."""
+
+    name = fields.Str(required=True)
+
+
+class GetItemView(OperationView):
+    """Get item."""
+
+    parameters = {"path": KeyParameters, "query": NameParameters}
+    responses = {HTTPStatus.OK: ItemSchema}
+
+    async def process_request(self, request, params=None, payload=None):
+        if params["path"]["key"] == 0:
+            raise web.HTTPNotFound(text="Item not found")
+
+        return (
+            {"key": params["path"]["key"], "name": params["query"]["name"], "user": request.headers.get("X-User")},
+            HTTPStatus.OK,
+        )
+
+
+class AddItemView(OperationView):
+    """Add item."""
+
+    parameters = {}
+    payload_cls = ItemPayloadSchema
+    responses = {HTTPStatus.CREATED: ItemSchema}
+
+    async def process_request(self, request, params=None, payload=None):
+        return {"key": 1, "name": payload["name"]}, HTTPStatus.CREATED
+
+
+GET_AND_ADD = [{"operationId": "getItem", "params": {"key": 1}}, {"operationId": "addItem", "payload": {"name": "new"}}]
+
+
+@web.middleware
+async def auth_middleware(request: web.Request, handler: Handler) -> web.Response:
+    if request.match_info.route.name == "addItem" and "X-User" not in request.headers:
+        raise web.HTTPUnauthorized(text="Unauthorized")
+
+    return await handler(request)
+
+
+@pytest.fixture(scope="function")
+def create_app(openapi_app):
+    def create(prepare=None, **options) -> web.Application:
+        def prepare_batch(app: web.Application) -> None:
+            if prepare is not None:
+                prepare(app)
+
+            setup_batch(app, max_operations=3)
+
+        return openapi_app(
+            [
+                ("GET", r"/api/items/{key:\d+}", GetItemView(name="getItem", security=None, tags=["items"])),
+                ("POST", "/api/items", AddItemView(name="addItem", security=None, tags=["items"])),
+            ],
+            prepare=prepare_batch,
+            **options,
+        )
+
+    return create
+
+
+@pytest.fixture(scope="function")
+def batch_app(create_app):
+    return create_app()
+
+
+async def test_batch(aiohttp_client, batch_app):
+    client = await aiohttp_client(batch_app)
+
+    # act
+    resp = await client.post(
+        "/api/batch",
+        json={
+            "operations": [
+                {"operationId": "getItem", "params": {"key": 2, "name": "second"}},
+                {"operationId": "addItem", "payload": {"name": "new"}},
+                {"operationId": "removeItem"},
+            ]
+        },
+        headers={"X-User": "user"},
+    )
+
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == {
+        "results": [
+            {"operationId": "getItem", "status": 200, "body": {"key": 2, "name": "second", "user": "user"}},
+            {"operationId": "addItem", "status": 201, "body": {"key": 1, "name": "new"}},
+            {"operationId": "removeItem", "status": 404, "body": {"message": "Unknown operation"}},
+        ]
+    }
+
+
+@pytest.mark.parametrize(
+    "entry, status, body",
+    (
+        ({"operationId": "getItem", "params": {"key": 0}}, HTTPStatus.NOT_FOUND, "Item not found"),
+        ({"operationId": "getItem"}, HTTPStatus.BAD_REQUEST, {"message": "Missing path parameter: key"}),
+        (
+            {"operationId": "getItem", "params": {"key": "abc"}},
+            HTTPStatus.BAD_REQUEST,
+            {"message": "Invalid path parameters"},
+        ),
+    ),
+)
+async def test_batch_failed_operation(aiohttp_client, batch_app, entry, status, body):
+    client = await aiohttp_client(batch_app)
+
+    # act
+    resp = await client.post("/api/batch", json={"operations": [entry]})
+
+    assert resp.status == HTTPStatus.OK
+    assert (await resp.json())["results"] == [{"operationId": "getItem", "status": status, "body": body}]
+
+
+@pytest.mark.parametrize("operations", ([], [{"operationId": "getItem", "params": {"key": 1}}] * 4))
+async def test_invalid_batch(aiohttp_client, batch_app, operations):
+    client = await aiohttp_client(batch_app)
+
+    # act
+    resp = await client.post("/api/batch", json={"operations": operations})
+
+    assert resp.status == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+async def test_batch_operations_pass_middlewares(aiohttp_client, create_app):
+    app = create_app(prepare=lambda app: app.middlewares.append(auth_middleware), metrics=True)
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/batch", json={"operations": GET_AND_ADD})
+
+    assert resp.status == HTTPStatus.OK
+    assert [result["status"] for result in (await resp.json())["results"]] == [200, 401]
+    labels = {"app_name": "micro", "method": "GET", "endpoint": "/api/items/{key}", "http_status": "200"}
+    assert app["metrics_registry"].get_sample_value("requests_total", labels) == 1
+
+
+async def test_batch_operations_admission(aiohttp_client, create_app):
+    app = create_app(prepare=lambda app: setup_admission_control(app, route_limits={"/api/items": 0}, max_queue=0))
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/batch", json={"operations": GET_AND_ADD})
+
+    assert resp.status == HTTPStatus.OK
+    results = (await resp.json())["results"]
+    assert [result["status"] for result in results] == [200, 503]
+    assert results[1]["body"] == "Service is overloaded"
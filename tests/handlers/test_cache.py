@@ -0,0 +1,114 @@
+import pytest  # type: ignore
+from aiohttp import web
+
+from aiohttp_micro import setup_response_cache
+from aiohttp_micro.web.cache import ResponseCache
+from aiohttp_micro.web.media import JSON, MSGPACK
+
+
+@pytest.fixture(scope="function")
+def create_app(openapi_app):
+    def create(view) -> web.Application:
+        return openapi_app(
+            [("GET", "/api/greet", view)],
+            prepare=lambda app: setup_response_cache(app, max_entries=2),
+            security=("TokenAuth", {"type": "apiKey", "name": "X-Access-Token", "in": "header"}),
+        )
+
+    return create
+
+
+@pytest.fixture(scope="function")
+def view(greet_view):
+    return greet_view(security="TokenAuth", cache_ttl=60)
+
+
+@pytest.fixture(scope="function")
+def cache_app(create_app, view):
+    return create_app(view)
+
+
+async def test_cached_response(aiohttp_client, cache_app, view):
+    client = await aiohttp_client(cache_app)
+    await client.get("/api/greet", params={"name": "John"})
+
+    # act
+    resp = await client.get("/api/greet", params={"name": "John"})
+
+    assert await resp.json() == {"greeting": "Hello, John"}
+    assert resp.headers["Cache-Control"] == "private, max-age=60"
+    assert view.calls == 1
+    assert cache_app["response_cache"].stats["greet"].hits == 1
+
+
+@pytest.mark.parametrize(
+    "params, headers",
+    (({"name": "Jane"}, {"X-Access-Token": "token"}), ({"name": "John"}, {"X-Access-Token": "other"})),
+)
+async def test_cache_varies_on_params_and_credentials(aiohttp_client, cache_app, view, params, headers):
+    client = await aiohttp_client(cache_app)
+    await client.get("/api/greet", params={"name": "John"}, headers={"X-Access-Token": "token"})
+
+    # act
+    await client.get("/api/greet", params=params, headers=headers)
+
+    assert view.calls == 2
+
+
+async def test_invalidate_cache(aiohttp_client, cache_app, view):
+    client = await aiohttp_client(cache_app)
+    await client.get("/api/greet")
+
+    # act
+    view.invalidate()
+
+    await client.get("/api/greet")
+    assert view.calls == 2
+
+
+@pytest.mark.unit
+def test_cache_expires_and_evicts_entries():
+    now = [0.0]
+    cache = ResponseCache(max_entries=2, clock=lambda: now[0])
+    response = web.Response(body=b"{}", content_type="application/json")
+    cache.set("greet", "a", response, ttl=10)
+    cache.set("greet", "b", response, ttl=10)
+    cache.get("greet", "a")
+
+    cache.set("greet", "c", response, ttl=10)  # act
+
+    now[0] = 5.0
+    recent = cache.get("greet", "a")
+    evicted = cache.get("greet", "b")
+    now[0] = 11.0
+    expired = cache.get("greet", "c")
+    assert (recent is not None, evicted, expired) == (True, None, None)
+    assert cache.stats["greet"].evictions == 1
+    assert cache.stats["greet"].expirations == 1
+
+
+@pytest.mark.unit
+def test_cache_size_follows_entries():
+    cache = ResponseCache(max_entries=2)
+    cache.set("greet", "a", web.Response(body=b"a" * 10), ttl=10)
+    cache.set("greet", "a", web.Response(body=b"a" * 20), ttl=10)
+    cache.set("greet", "b", web.Response(body=b"b" * 30), ttl=10)
+    cache.set("other", "c", web.Response(body=b"c" * 40), ttl=10)
+
+    cache.invalidate("other")  # act
+
+    assert cache.size == 30
+
+
+async def test_cached_response_vary(aiohttp_client, create_app, greet_view):
+    pytest.importorskip("msgpack")
+    view = greet_view(security="TokenAuth", cache_ttl=60, cache_vary=("Accept-Language",), media_types=(JSON, MSGPACK))
+    client = await aiohttp_client(create_app(view))
+    headers = {"Accept": MSGPACK, "Accept-Language": "en"}
+    first = await client.get("/api/greet", headers=headers)
+
+    # act
+    resp = await client.get("/api/greet", headers=headers)
+
+    assert view.calls == 1
+    assert first.headers["Vary"] == resp.headers["Vary"] == "Accept, Accept-Language, X-Access-Token"
@@ -0,0 +1,98 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import web
+
+from aiohttp_micro.web.coalescing import SingleFlight
+
+
+@pytest.fixture(scope="function")
+def view(greet_view):
+    return greet_view(coalesce=True, delay=0.05)
+
+
+@pytest.fixture(scope="function")
+def coalescing_app(openapi_app, view):
+    return openapi_app([("GET", "/api/greet", view)], metrics=True)
+
+
+async def test_coalesce_identical_requests(aiohttp_client, coalescing_app, view):
+    client = await aiohttp_client(coalescing_app)
+
+    # act
+    responses = await asyncio.gather(*(client.get("/api/greet", params={"name": "Bob"}) for _ in range(5)))
+
+    assert [resp.status for resp in responses] == [HTTPStatus.OK] * 5
+    assert [await resp.json() for resp in responses] == [{"greeting": "Hello, Bob"}] * 5
+    assert view.calls == 1
+    assert coalescing_app["metrics_registry"].get_sample_value(
+        "coalesced_requests_total", {"app_name": "micro", "operation": "greet"}
+    ) == 4
+
+
+async def test_different_requests_not_coalesced(aiohttp_client, coalescing_app, view):
+    client = await aiohttp_client(coalescing_app)
+
+    # act
+    responses = await asyncio.gather(*(client.get("/api/greet", params={"name": name}) for name in ("Bob", "Alice")))
+
+    assert [await resp.json() for resp in responses] == [{"greeting": "Hello, Bob"}, {"greeting": "Hello, Alice"}]
+    assert view.calls == 2
+
+
+async def test_coalesce_http_exception(aiohttp_client, coalescing_app, view):
+    client = await aiohttp_client(coalescing_app)
+
+    # act
+    responses = await asyncio.gather(*(client.get("/api/greet", params={"name": "nobody"}) for _ in range(3)))
+
+    assert [resp.status for resp in responses] == [HTTPStatus.NOT_FOUND] * 3
+    assert [await resp.text() for resp in responses] == ["Nobody to greet"] * 3
+    assert view.calls == 1
+
+
+async def test_cancel_one_of_waiters():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def execute():
+        started.set()
+        await asyncio.sleep(0.05)
+        return web.Response(text="done")
+
+    first = asyncio.ensure_future(flights.do("key", execute))
+    second = asyncio.ensure_future(flights.do("key", execute))
+    await started.wait()
+
+    # act
+    first.cancel()
+
+    response, shared = await second
+    assert response.text == "done"
+    assert shared is True
+    assert first.cancelled()
+    assert len(flights) == 0
+
+
+async def test_cancel_all_waiters():
+    flights = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def execute():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.ensure_future(flights.do("key", execute))
+    await started.wait()
+
+    # act
+    waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert len(flights) == 0
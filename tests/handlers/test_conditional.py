@@ -0,0 +1,80 @@
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import web
+
+from aiohttp_micro.web.handlers.openapi import ResourceVersion
+
+
+VERSION = ResourceVersion(etag="v1", last_modified=datetime(2021, 1, 1, 12, 0))
+
+
+@pytest.fixture(scope="function")
+def create_app(openapi_app):
+    def create(view) -> web.Application:
+        return openapi_app([("GET", "/api/greet", view)], metrics=True)
+
+    return create
+
+
+def count(app: web.Application, result: str) -> float:
+    labels = {"app_name": "micro", "operation": "greet", "result": result}
+    return app["metrics_registry"].get_sample_value("conditional_requests_total", labels)
+
+
+async def test_etag_from_body(aiohttp_client, create_app, greet_view):
+    app = create_app(greet_view(conditional=True))
+    client = await aiohttp_client(app)
+    resp = await client.get("/api/greet")
+    etag = resp.headers["ETag"]
+
+    # act
+    resp = await client.get("/api/greet", headers={"If-None-Match": etag})
+
+    assert etag.startswith('W/"')
+    assert resp.status == HTTPStatus.NOT_MODIFIED
+    assert resp.headers["ETag"] == etag
+    assert (count(app, "full"), count(app, "not_modified")) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "headers",
+    (
+        {"If-None-Match": 'W/"v1"'},
+        {"If-None-Match": '"v0", "v1"'},
+        {"If-Modified-Since": "Fri, 01 Jan 2021 12:00:00 GMT"},
+        {"If-Modified-Since": "Sat, 02 Jan 2021 00:00:00 GMT"},
+    ),
+)
+async def test_version_skips_processing(aiohttp_client, create_app, greet_view, headers):
+    view = greet_view(conditional=True, version=VERSION)
+    client = await aiohttp_client(create_app(view))
+
+    # act
+    resp = await client.get("/api/greet", headers=headers)
+
+    assert resp.status == HTTPStatus.NOT_MODIFIED
+    assert resp.headers["ETag"] == 'W/"v1"'
+    assert view.calls == 0
+
+
+@pytest.mark.parametrize(
+    "headers",
+    (
+        {},
+        {"If-None-Match": 'W/"v0"'},
+        {"If-Modified-Since": "Thu, 31 Dec 2020 00:00:00 GMT"},
+        {"If-None-Match": 'W/"v0"', "If-Modified-Since": "Sat, 02 Jan 2021 00:00:00 GMT"},
+    ),
+)
+async def test_modified_resource(aiohttp_client, create_app, greet_view, headers):
+    view = greet_view(conditional=True, version=VERSION)
+    client = await aiohttp_client(create_app(view))
+
+    # act
+    resp = await client.get("/api/greet", headers=headers)
+
+    assert resp.status == HTTPStatus.OK
+    assert resp.headers["Last-Modified"] == "Fri, 01 Jan 2021 12:00:00 GMT"
+    assert view.calls == 1
@@ -0,0 +1,147 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from marshmallow import fields
+
+from aiohttp_micro import setup_deadlines
+from aiohttp_micro.web.deadline import DEADLINE, Deadline, get_timeout, parse_grpc_timeout
+from aiohttp_micro.web.handlers.openapi import OperationView, ResponseSchema
+
+
+class BudgetSchema(ResponseSchema):
+    """Remaining budget."""
+
+    remaining = fields.Float(allow_none=True)
+
+
+class SlowView(OperationView):
+    """Take a while."""
+
+    parameters = {}
+    responses = {HTTPStatus.OK: BudgetSchema}
+
+    started = 0
+    cancelled = 0
+
+    async def process_request(self, request, params=None, payload=None):
+        self.started += 1
+        try:
+            await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        deadline = request.get(DEADLINE, None)
+        return {"remaining": deadline.remaining if deadline else None}, HTTPStatus.OK
+
+
+@pytest.fixture(scope="function")
+def view():
+    return SlowView(name="slow", security=None, tags=["slow"])
+
+
+@pytest.fixture(scope="function")
+def deadline_app(openapi_app, view):
+    return openapi_app(
+        [("GET", "/api/slow", view)], metrics=True, prepare=lambda app: setup_deadlines(app, max_timeout=10)
+    )
+
+
+def exceeded(app, result):
+    return app["metrics_registry"].get_sample_value(
+        "deadline_exceeded_total", {"app_name": "micro", "operation": "slow", "result": result}
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "value, expected", (("1S", 1.0), ("250m", 0.25), ("2M", 120.0), ("100u", 1e-4), ("1s", None), ("m", None))
+)
+def test_parse_grpc_timeout(value, expected):
+    timeout = parse_grpc_timeout(value)  # act
+
+    assert timeout == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "headers, expected",
+    (
+        ({}, None),
+        ({"X-Request-Timeout": "1.5"}, 1.5),
+        ({"X-Request-Timeout": "-1"}, None),
+        ({"X-Request-Timeout": "nan"}, None),
+        ({"X-Request-Timeout": "1.5", "grpc-timeout": "500m"}, 0.5),
+        ({"X-Request-Timeout": "invalid", "grpc-timeout": "2S"}, 2.0),
+    ),
+)
+def test_get_timeout(headers, expected):
+    timeout = get_timeout(headers)  # act
+
+    assert timeout == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("elapsed, remaining, expired", ((1.0, 0.5, False), (2.0, 0.0, True)))
+def test_deadline(elapsed, remaining, expired):
+    now = [0.0]
+    deadline = Deadline(1.5, clock=lambda: now[0])
+    now[0] = elapsed
+
+    result = (deadline.remaining, deadline.expired)  # act
+
+    assert result == (remaining, expired)
+
+
+@pytest.mark.unit
+def test_deadline_headers():
+    now = [0.0]
+    deadline = Deadline(1.5, clock=lambda: now[0])
+    now[0] = 1.0
+
+    headers = deadline.headers()  # act
+
+    assert headers == {"X-Request-Timeout": "0.500"}
+
+
+async def test_within_deadline(aiohttp_client, deadline_app):
+    client = await aiohttp_client(deadline_app)
+
+    # act
+    resp = await client.get("/api/slow", headers={"X-Request-Timeout": "5"})
+
+    assert resp.status == HTTPStatus.OK
+    assert 0 < (await resp.json())["remaining"] < 5
+
+
+async def test_without_deadline(aiohttp_client, deadline_app):
+    client = await aiohttp_client(deadline_app)
+
+    # act
+    resp = await client.get("/api/slow")
+
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == {"remaining": None}
+
+
+async def test_cancel_after_deadline(aiohttp_client, deadline_app, view):
+    client = await aiohttp_client(deadline_app)
+
+    # act
+    resp = await client.get("/api/slow", headers={"grpc-timeout": "20m"})
+
+    assert resp.status == HTTPStatus.GATEWAY_TIMEOUT
+    assert view.cancelled == 1
+    assert exceeded(deadline_app, "cancelled") == 1
+
+
+async def test_skip_expired(aiohttp_client, deadline_app, view):
+    client = await aiohttp_client(deadline_app)
+
+    # act
+    resp = await client.get("/api/slow", headers={"X-Request-Timeout": "0"})
+
+    assert resp.status == HTTPStatus.GATEWAY_TIMEOUT
+    assert view.started == 0
+    assert exceeded(deadline_app, "skipped") == 1
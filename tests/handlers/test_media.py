@@ -0,0 +1,156 @@
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import web
+from marshmallow import fields
+
+from aiohttp_micro.web.handlers.openapi import OperationView, PayloadSchema, ResponseSchema
+from aiohttp_micro.web.media import CBOR, choose_media_type, CODECS, JSON, MSGPACK
+
+
+msgpack = pytest.importorskip("msgpack")
+cbor2 = pytest.importorskip("cbor2")
+
+
+class ItemPayloadSchema(PayloadSchema):
+    name = fields.Str(required=True)
+
+
+class ItemSchema(ResponseSchema):
+    """Item."""
+
+    name = fields.Str()
+    tags = fields.List(fields.Str())
+
+
+class AddItemView(OperationView):
+    """Add item."""
+
+    parameters = {}
+    payload_cls = ItemPayloadSchema
+    responses = {HTTPStatus.CREATED: ItemSchema}
+    media_types = (JSON, MSGPACK, CBOR)
+
+    async def process_request(self, request, params=None, payload=None):
+        return {"name": payload["name"], "tags": ["new"]}, HTTPStatus.CREATED
+
+
+@pytest.fixture(scope="function")
+def media_app():
+    view = AddItemView(name="addItem", security=None, tags=["items"])
+
+    app = web.Application()
+    view.setup(app)
+    app.router.add_post("/api/items", view.handle)
+
+    return app
+
+
+@pytest.mark.parametrize("media_type", (JSON, MSGPACK, CBOR))
+async def test_negotiate_media_type(aiohttp_client, media_app, media_type):
+    client = await aiohttp_client(media_app)
+    codec = CODECS[media_type]
+
+    # act
+    resp = await client.post(
+        "/api/items",
+        data=codec.dumps({"name": "Item"}),
+        headers={"Content-Type": media_type, "Accept": f"{media_type}, application/json;q=0.5"},
+    )
+
+    assert resp.status == HTTPStatus.CREATED
+    assert resp.content_type == media_type
+    assert resp.headers["Vary"] == "Accept"
+    assert codec.loads(await resp.read()) == {"name": "Item", "tags": ["new"]}
+
+
+class LegacyAddItemView(AddItemView):
+    """Add item with response processing written before media type negotiation."""
+
+    def process_response(self, response):
+        response = super().process_response(response)
+        response.headers["X-Processed"] = "1"
+        return response
+
+
+async def test_legacy_process_response(aiohttp_client):
+    view = LegacyAddItemView(name="addItem", security=None, tags=["items"])
+    app = web.Application()
+    view.setup(app)
+    app.router.add_post("/api/items", view.handle)
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/items", json={"name": "Item"}, headers={"Accept": MSGPACK})
+
+    assert resp.status == HTTPStatus.CREATED
+    assert resp.content_type == JSON
+    assert resp.headers["X-Processed"] == "1"
+    assert await resp.json() == {"name": "Item", "tags": ["new"]}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "accept, expected",
+    (
+        (None, JSON),
+        ("*/*", JSON),
+        ("text/html", JSON),
+        ("application/x-msgpack", MSGPACK),
+        ("application/json;q=0.9, application/cbor", CBOR),
+        ("application/msgpack;q=0, */*;q=0.1", JSON),
+    ),
+)
+def test_choose_media_type(accept, expected):
+    media_type = choose_media_type(accept)  # act
+
+    assert media_type == expected
+
+
+@pytest.mark.unit
+def test_operation_spec_media_types():
+    view = AddItemView(name="addItem", security=None, tags=["items"])
+
+    operation = view.spec.generate()  # act
+
+    assert list(operation["requestBody"]["content"]) == [JSON, MSGPACK, CBOR]
+    assert list(operation["responses"]["201"]["content"]) == [JSON, MSGPACK, CBOR]
+
+
+class JSONAddItemView(AddItemView):
+    """Add item in JSON only."""
+
+    media_types = OperationView.media_types
+
+
+@pytest.mark.unit
+def test_operation_spec_default_media_type():
+    view = JSONAddItemView(name="addItem", security=None, tags=["items"])
+
+    operation = view.spec.generate()  # act
+
+    assert list(operation["requestBody"]["content"]) == [JSON]
+    assert list(operation["responses"]["201"]["content"]) == [JSON]
+
+
+async def test_default_media_type_response(aiohttp_client):
+    view = JSONAddItemView(name="addItem", security=None, tags=["items"])
+    app = web.Application()
+    view.setup(app)
+    app.router.add_post("/api/items", view.handle)
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/items", json={"name": "Item"}, headers={"Accept": MSGPACK})
+
+    assert resp.content_type == JSON
+    assert "Vary" not in resp.headers
+
+
+@pytest.mark.unit
+def test_unavailable_media_type():
+    view = JSONAddItemView(name="addItem", security=None, tags=["items"])
+    view.media_types = (JSON, "application/x-unknown")
+
+    with pytest.raises(ValueError):
+        view.setup(web.Application())  # act
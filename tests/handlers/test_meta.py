@@ -1,3 +1,6 @@
+import os
+
+
 async def test_meta_endpoint(aiohttp_client, app):
     client = await aiohttp_client(app)
 
@@ -12,3 +15,12 @@ async def test_health_endpoint(aiohttp_client, app):
     resp = await client.get("/-/health")
 
     assert resp.status == 200
+
+
+async def test_meta_endpoint_reports_worker_pid(aiohttp_client, app):
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/-/meta")
+
+    meta = await resp.json()
+    assert meta["pid"] == os.getpid()
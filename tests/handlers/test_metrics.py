@@ -0,0 +1,83 @@
+import asyncio
+import gzip
+
+import pytest  # type: ignore
+from aiohttp import web
+from prometheus_client import CollectorRegistry, Counter  # type: ignore
+from prometheus_client.core import GaugeMetricFamily  # type: ignore
+
+from aiohttp_micro.web.handlers import metrics
+
+
+class CountingCollector:
+    def __init__(self):
+        self.collected = 0
+
+    def collect(self):
+        self.collected += 1
+        yield GaugeMetricFamily("collected", "Collections", value=self.collected)
+
+
+@pytest.fixture(scope="function")
+def collector():
+    return CountingCollector()
+
+
+@pytest.fixture(scope="function")
+def now():
+    return [0.0]
+
+
+@pytest.fixture(scope="function")
+def metrics_app(collector, now):
+    registry = CollectorRegistry()
+    registry.register(collector)
+    Counter("requests_total", "Total request count", registry=registry).inc()
+
+    app = web.Application()
+    app["metrics_exposition"] = metrics.MetricsExposition(registry, ttl=1.0, clock=lambda: now[0])
+    app.router.add_get("/-/metrics", metrics.handler)
+
+    return app
+
+
+async def test_share_exposition(aiohttp_client, metrics_app, collector):
+    client = await aiohttp_client(metrics_app)
+
+    # act
+    responses = await asyncio.gather(*(client.get("/-/metrics") for _ in range(5)))
+
+    assert [resp.status for resp in responses] == [200] * 5
+    assert collector.collected == 1
+
+
+async def test_render_expired_exposition(aiohttp_client, metrics_app, collector, now):
+    client = await aiohttp_client(metrics_app)
+    await client.get("/-/metrics")
+
+    # act
+    now[0] = 1.0
+    resp = await client.get("/-/metrics")
+
+    assert "collected 2.0" in await resp.text()
+    assert collector.collected == 2
+
+
+async def test_compressed_exposition(aiohttp_client, metrics_app):
+    client = await aiohttp_client(metrics_app)
+
+    # act
+    resp = await client.get("/-/metrics", headers={"Accept-Encoding": "gzip"}, auto_decompress=False)
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert b"requests_total 1.0" in gzip.decompress(await resp.read())
+
+
+async def test_openmetrics_exposition(aiohttp_client, metrics_app):
+    client = await aiohttp_client(metrics_app)
+
+    # act
+    resp = await client.get("/-/metrics", headers={"Accept": "application/openmetrics-text; version=0.0.1"})
+
+    assert resp.headers["Content-Type"].startswith("application/openmetrics-text")
+    assert (await resp.text()).endswith("# EOF\n")
@@ -0,0 +1,208 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import List
+
+import pytest  # type: ignore
+from aiohttp import web
+from marshmallow import fields, post_load
+
+from aiohttp_micro import setup_offloading
+from aiohttp_micro.web.handlers.openapi import OperationView, PayloadSchema, ResponseSchema
+from aiohttp_micro.web.offload import count_items
+
+
+class ItemsSchema(ResponseSchema):
+    """Items."""
+
+    items = fields.List(fields.Int())
+    thread = fields.Str()
+
+
+class NumbersSchema(PayloadSchema):
+    """Numbers."""
+
+    numbers = fields.List(fields.Int())
+
+    @post_load
+    def make_payload(self, data, **kwargs):
+        return {**data, "thread": threading.current_thread().name}
+
+
+class ItemsView(OperationView):
+    """Echo numbers."""
+
+    parameters = {}
+    payload_cls = NumbersSchema
+    responses = {HTTPStatus.OK: ItemsSchema}
+
+    async def process_request(self, request, params=None, payload=None):
+        return {"items": payload["numbers"], "thread": payload["thread"]}, HTTPStatus.OK
+
+
+class ProcessNumbersSchema(PayloadSchema):
+    """Numbers."""
+
+    numbers = fields.List(fields.Int())
+
+    @post_load
+    def make_payload(self, data, **kwargs):
+        return {**data, "pid": os.getpid()}
+
+
+class ProcessItemsSchema(ResponseSchema):
+    """Items."""
+
+    items = fields.List(fields.Int())
+    loaded_in = fields.Int()
+    dumped_in = fields.Function(lambda obj: os.getpid())
+
+
+class ProcessItemsView(OperationView):
+    """Echo numbers."""
+
+    parameters = {}
+    payload_cls = ProcessNumbersSchema
+    responses = {HTTPStatus.OK: ProcessItemsSchema}
+    offload = True
+
+    async def process_request(self, request, params=None, payload=None):
+        return {"items": payload["numbers"], "loaded_in": payload["pid"]}, HTTPStatus.OK
+
+
+@pytest.fixture(scope="function")
+def create_app(openapi_app):
+    def create(view: OperationView, executor=None) -> web.Application:
+        return openapi_app(
+            [("POST", "/api/items", view)],
+            metrics=True,
+            prepare=lambda app: setup_offloading(app, executor=executor, payload_size=1024, response_items=10),
+        )
+
+    return create
+
+
+def executions(app: web.Application, stage: str) -> float:
+    labels = {"app_name": "micro", "operation": "items", "stage": stage}
+    return app["metrics_registry"].get_sample_value("offload_execution_seconds_count", labels) or 0
+
+
+@pytest.mark.parametrize("count, offloaded", ((5, 0), (10, 1), (1000, 1)))
+async def test_offload_response_dump(aiohttp_client, create_app, count, offloaded):
+    app = create_app(ItemsView(name="items", security=None, tags=["items"]))
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/items", json={"numbers": list(range(count))})
+
+    result = await resp.json()
+    assert result["items"] == list(range(count))
+    assert executions(app, "dump") == offloaded
+
+
+async def test_offload_payload_load(aiohttp_client, create_app):
+    app = create_app(ItemsView(name="items", security=None, tags=["items"]))
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/items", json={"numbers": list(range(1000))})
+
+    result = await resp.json()
+    assert result["thread"] != threading.main_thread().name
+    assert executions(app, "payload") == 1
+    labels = {"app_name": "micro", "operation": "items", "stage": "payload"}
+    assert app["metrics_registry"].get_sample_value("offload_queued_total", labels) == 0
+
+
+async def test_disable_offload_for_operation(aiohttp_client, create_app):
+    view = ItemsView(name="items", security=None, tags=["items"])
+    view.offload = False
+    app = create_app(view)
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/items", json={"numbers": list(range(1000))})
+
+    result = await resp.json()
+    assert result["thread"] == threading.main_thread().name
+    assert executions(app, "payload") == executions(app, "dump") == 0
+
+
+async def test_zero_threshold_for_operation(aiohttp_client, create_app):
+    view = ItemsView(name="items", security=None, tags=["items"])
+    view.offload_response_items = 0
+    app = create_app(view)
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/items", json={"numbers": [1]})
+
+    assert resp.status == HTTPStatus.OK
+    assert executions(app, "dump") == 1
+
+
+async def test_offload_by_read_body_size(aiohttp_client, create_app):
+    app = create_app(ItemsView(name="items", security=None, tags=["items"]))
+    client = await aiohttp_client(app)
+    body = b'{"numbers": [' + b", ".join(b"1" for _ in range(1000)) + b"]}"
+
+    async def stream():
+        yield body
+
+    # act
+    resp = await client.post("/api/items", data=stream(), headers={"Content-Type": "application/json"})
+
+    assert resp.status == HTTPStatus.OK
+    assert executions(app, "payload") == 1
+
+
+async def test_offload_to_process_pool(aiohttp_client, create_app):
+    executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork"))
+    app = create_app(ProcessItemsView(name="items", security=None, tags=["items"]), executor=executor)
+    client = await aiohttp_client(app)
+
+    try:
+        # act
+        resp = await client.post("/api/items", json={"numbers": [1, 2, 3]})
+    finally:
+        executor.shutdown()
+
+    assert resp.status == HTTPStatus.OK
+    result = await resp.json()
+    assert result["items"] == [1, 2, 3]
+    assert result["loaded_in"] != os.getpid()
+    assert result["dumped_in"] != os.getpid()
+    assert executions(app, "payload") == executions(app, "dump") == 1
+
+
+async def test_offloading_disabled_by_default(aiohttp_client, openapi_app):
+    view = ItemsView(name="items", security=None, tags=["items"])
+    view.offload = True
+    app = openapi_app([("POST", "/api/items", view)])
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.post("/api/items", json={"numbers": list(range(1000))})
+
+    result = await resp.json()
+    assert result["thread"] == threading.main_thread().name
+    assert "offloader" not in app
+
+
+@dataclass
+class Page:
+    items: List[int]
+    total: int
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "data, expected", (([1, 2, 3], 3), ({"items": [1, 2], "total": 2}, 2), (Page(items=[1], total=1), 1), ("abc", 0))
+)
+def test_count_items(data, expected):
+    count = count_items(data)  # act
+
+    assert count == expected
@@ -0,0 +1,74 @@
+import pytest  # type: ignore
+from aiohttp.test_utils import make_mocked_request
+from marshmallow import fields, validates
+
+from aiohttp_micro.web.handlers.openapi import (
+    compile_flat_loader,
+    InvalidParameters,
+    ParameterIn,
+    ParametersLoader,
+    ParametersSchema,
+)
+from aiohttp_micro.web.schemas import CollectionFiltersSchema, CommonParameters
+
+
+class ItemParameters(ParametersSchema):
+    in_ = ParameterIn.path
+
+    key = fields.Int(required=True, data_key="id")
+
+    @validates("key")
+    def validate_key(self, value: int, **kwargs) -> None:
+        pass
+
+
+def load_or_errors(load, query):
+    try:
+        return load(query)
+    except Exception as exc:
+        return exc.messages
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "query", ({}, {"offset": "20"}, {"offset": "10", "limit": "20", "foo": "bar"}, {"offset": "-1"}, {"limit": "foo"})
+)
+def test_flat_loader_matches_schema_load(query):
+    schema = CollectionFiltersSchema()
+    load = compile_flat_loader(schema)
+    expected = load_or_errors(schema.load, query)
+
+    result = load_or_errors(load, query)  # act
+
+    assert result == expected
+
+
+@pytest.mark.unit
+def test_flat_loader_skip_schema_with_hooks():
+    schema = ItemParameters()
+
+    load = compile_flat_loader(schema)  # act
+
+    assert load is None
+
+
+@pytest.mark.unit
+def test_load_parameters():
+    loader = ParametersLoader({"common": CommonParameters(), "filters": CollectionFiltersSchema()})
+    request = make_mocked_request("GET", "/api/items?offset=10", headers={"X-Request-ID": "foo"})
+
+    parameters = loader.load(request)  # act
+
+    assert parameters == {
+        "common": {"request_id": "foo", "correlation_id": None},
+        "filters": {"offset": 10, "limit": 10},
+    }
+
+
+@pytest.mark.unit
+def test_load_invalid_parameters():
+    loader = ParametersLoader({"filters": CollectionFiltersSchema()})
+    request = make_mocked_request("GET", "/api/items?limit=100")
+
+    with pytest.raises(InvalidParameters):
+        loader.load(request)
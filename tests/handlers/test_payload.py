@@ -0,0 +1,172 @@
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import FormData, web
+from marshmallow import fields, Schema
+
+from aiohttp_micro.web import handlers
+from aiohttp_micro.web.handlers import get_payload, json_response, UploadedFile, validate_payload
+
+
+class ItemSchema(Schema):
+    name = fields.Str(required=True)
+
+
+class DocumentSchema(Schema):
+    title = fields.Str(required=True)
+    document = fields.Raw(required=True)
+
+
+@validate_payload(ItemSchema, max_body_size=64)
+async def add_item(payload, request: web.Request) -> web.Response:
+    return json_response(payload, status=HTTPStatus.CREATED)
+
+
+async def upload(request: web.Request) -> web.Response:
+    payload = await get_payload(request, spool_size=16)
+
+    document: UploadedFile = payload["document"]
+    return json_response(
+        {
+            "title": payload["title"],
+            "filename": document.filename,
+            "content": document.file.read().decode(),
+            "spooled": document.file._rolled,
+        }
+    )
+
+
+@validate_payload(DocumentSchema, max_body_size=512)
+async def add_document(payload, request: web.Request) -> web.Response:
+    request.app["documents"].append(payload["document"])
+    return json_response({"title": payload["title"]}, status=HTTPStatus.CREATED)
+
+
+@pytest.fixture(scope="function")
+def payload_app():
+    app = web.Application()
+    app["documents"] = []
+    app.router.add_post("/api/items", add_item)
+    app.router.add_post("/api/upload", upload)
+    app.router.add_post("/api/documents", add_document)
+
+    return app
+
+
+@pytest.fixture(scope="function")
+def spooled_files(monkeypatch):
+    files = []
+    spooled_file_cls = handlers.tempfile.SpooledTemporaryFile
+
+    def create(*args, **kwargs):
+        files.append(spooled_file_cls(*args, **kwargs))
+        return files[-1]
+
+    monkeypatch.setattr(handlers.tempfile, "SpooledTemporaryFile", create)
+
+    return files
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    (
+        {"json": {"name": "Item"}},
+        {"data": {"name": "Item"}},
+        {"data": b'{"name": "Item"}', "headers": {"Content-Type": "application/json"}},
+    ),
+)
+async def test_load_payload(aiohttp_client, payload_app, kwargs):
+    client = await aiohttp_client(payload_app)
+
+    # act
+    resp = await client.post("/api/items", **kwargs)
+
+    assert resp.status == HTTPStatus.CREATED
+    assert await resp.json() == {"name": "Item"}
+
+
+async def test_invalid_json(aiohttp_client, payload_app):
+    client = await aiohttp_client(payload_app)
+
+    # act
+    resp = await client.post("/api/items", data=b"{", headers={"Content-Type": "application/json"})
+
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize("content_type", ("text/plain", "application/octet-stream", "application/xml"))
+async def test_unsupported_media_type(aiohttp_client, payload_app, content_type):
+    client = await aiohttp_client(payload_app)
+
+    # act
+    resp = await client.post("/api/items", data=b"name=Item", headers={"Content-Type": content_type})
+
+    assert resp.status == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+@pytest.mark.parametrize("chunked", (False, True))
+async def test_payload_too_large(aiohttp_client, payload_app, chunked):
+    client = await aiohttp_client(payload_app)
+    body = b'{"name": "' + b"x" * 100 + b'"}'
+
+    async def stream():
+        yield body
+
+    # act
+    resp = await client.post(
+        "/api/items", data=stream() if chunked else body, headers={"Content-Type": "application/json"}
+    )
+
+    assert resp.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.parametrize("content, spooled", (("small", False), ("large file content", True)))
+async def test_multipart_upload(aiohttp_client, payload_app, content, spooled):
+    client = await aiohttp_client(payload_app)
+
+    form = FormData()
+    form.add_field("title", "Document")
+    form.add_field("document", content.encode(), filename="document.txt", content_type="text/plain")
+
+    # act
+    resp = await client.post("/api/upload", data=form)
+
+    result = await resp.json()
+    assert result == {"title": "Document", "filename": "document.txt", "content": content, "spooled": spooled}
+
+
+async def test_close_uploaded_files(aiohttp_client, payload_app, spooled_files):
+    client = await aiohttp_client(payload_app)
+
+    form = FormData()
+    form.add_field("title", "Document")
+    form.add_field("document", b"content", filename="document.txt", content_type="text/plain")
+
+    # act
+    resp = await client.post("/api/documents", data=form)
+
+    assert resp.status == HTTPStatus.CREATED
+    assert [document.file.closed for document in payload_app["documents"]] == [True]
+    assert [spooled_file.closed for spooled_file in spooled_files] == [True]
+
+
+async def test_close_files_of_too_large_upload(aiohttp_client, payload_app, spooled_files):
+    client = await aiohttp_client(payload_app)
+
+    parts = [
+        b'--boundary\r\nContent-Disposition: form-data; name="first"; filename="first.txt"\r\n\r\ncontent\r\n',
+        b'--boundary\r\nContent-Disposition: form-data; name="second"; filename="second.txt"\r\n\r\n',
+        b"x" * 1024 + b"\r\n--boundary--\r\n",
+    ]
+
+    async def stream():
+        for part in parts:
+            yield part
+
+    # act
+    resp = await client.post(
+        "/api/documents", data=stream(), headers={"Content-Type": "multipart/form-data; boundary=boundary"}
+    )
+
+    assert resp.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert [spooled_file.closed for spooled_file in spooled_files] == [True, True]
@@ -0,0 +1,51 @@
+import pytest  # type: ignore
+
+
+@pytest.fixture(scope="function")
+def spec_app(openapi_app, get_item_view):
+    return openapi_app(
+        [
+            ("GET", "/api/items", get_item_view()),
+            ("GET", "/api/tags", get_item_view(name="getTag", tags=["tags"])),
+        ],
+        yaml_path="/api/spec.yaml",
+    )
+
+
+async def test_compressed_spec(aiohttp_client, spec_app):
+    client = await aiohttp_client(spec_app)
+
+    resp = await client.get("/api/spec.json", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["ETag"]
+    spec = await resp.json()
+    assert set(spec["paths"].keys()) == {"/api/items", "/api/tags"}
+
+
+async def test_not_modified_spec(aiohttp_client, spec_app):
+    client = await aiohttp_client(spec_app)
+    resp = await client.get("/api/spec.json")
+
+    resp = await client.get("/api/spec.json", headers={"If-None-Match": resp.headers["ETag"]})
+
+    assert resp.status == 304
+
+
+async def test_spec_fragment(aiohttp_client, spec_app):
+    client = await aiohttp_client(spec_app)
+
+    resp = await client.get("/api/spec.json", params={"tag": "items"})
+
+    spec = await resp.json()
+    assert set(spec["paths"].keys()) == {"/api/items"}
+
+
+async def test_yaml_spec(aiohttp_client, spec_app):
+    client = await aiohttp_client(spec_app)
+
+    resp = await client.get("/api/spec.yaml")
+
+    assert resp.status == 200
+    assert resp.content_type == "application/yaml"
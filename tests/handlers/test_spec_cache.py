@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from marshmallow import fields
+
+from aiohttp_micro.web import spec_cache
+from aiohttp_micro.web.spec_cache import fingerprint, load_spec, save_spec
+
+
+SPEC_INFO = {"title": "Micro", "version": "0.0.1", "description": "", "openapi_version": "3.0.2", "security": None}
+
+
+@pytest.fixture(scope="function")
+def operations(get_item_view):
+    return lambda: [("GET", "/api/items", get_item_view())]
+
+
+@pytest.mark.unit
+def test_stable_fingerprint(operations):
+    expected = fingerprint(SPEC_INFO, operations())
+
+    result = fingerprint(SPEC_INFO, operations())  # act
+
+    assert result == expected
+
+
+@pytest.mark.unit
+def test_fingerprint_follows_schemas(monkeypatch, operations):
+    expected = fingerprint(SPEC_INFO, operations())
+    schema_cls = operations()[0][2].responses[HTTPStatus.OK]
+    monkeypatch.setitem(schema_cls._declared_fields, "tags", fields.List(fields.Int(), missing=list))
+
+    result = fingerprint(SPEC_INFO, operations())  # act
+
+    assert result != expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "info", ({**SPEC_INFO, "version": "0.0.2"}, {**SPEC_INFO, "security": ("TokenAuth", {"type": "http"})})
+)
+def test_fingerprint_follows_info(operations, info):
+    expected = fingerprint(SPEC_INFO, operations())
+
+    result = fingerprint(info, operations())  # act
+
+    assert result != expected
+
+
+@pytest.mark.unit
+def test_fingerprint_follows_generators(operations, monkeypatch):
+    expected = fingerprint(SPEC_INFO, operations())
+    version = spec_cache.metadata.version
+    monkeypatch.setattr(
+        spec_cache.metadata, "version", lambda name: "0.0.0" if name == "apispec" else version(name)
+    )
+
+    result = fingerprint(SPEC_INFO, operations())  # act
+
+    assert result != expected
+
+
+@pytest.mark.unit
+def test_load_saved_spec(tmp_path):
+    path = str(tmp_path / "cache" / "spec.json")
+    save_spec(path, "abc", {"openapi": "3.0.2"})
+
+    spec = load_spec(path, "abc")  # act
+
+    assert spec == {"openapi": "3.0.2"}
+    assert [item.name for item in (tmp_path / "cache").iterdir()] == ["spec.json"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("content", (None, b"{broken", b'{"fingerprint": "other", "spec": {}}'))
+def test_skip_unusable_cache(tmp_path, content):
+    path = tmp_path / "spec.json"
+    if content is not None:
+        path.write_bytes(content)
+
+    spec = load_spec(str(path), "abc")  # act
+
+    assert spec is None
+
+
+@pytest.fixture(scope="function")
+def create_app(openapi_app, operations):
+    return lambda spec_cache_path: openapi_app(operations(), spec_cache_path=spec_cache_path)
+
+
+async def test_spec_from_cache(aiohttp_client, create_app, tmp_path):
+    path = str(tmp_path / "spec.json")
+    app = create_app(path)
+    cached = {**app["spec_document"].to_dict(), "x-cached": True}
+    save_spec(path, app["spec_fingerprint"], cached)
+
+    client = await aiohttp_client(create_app(path))
+
+    # act
+    resp = await client.get("/api/spec.json")
+
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == cached
+    assert "spec" not in client.app
+
+
+async def test_generated_spec(aiohttp_client, create_app, tmp_path):
+    app = create_app(str(tmp_path / "spec.json"))
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.get("/api/spec.json")
+
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == app["spec"].to_dict()
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import orjson
+import pytest  # type: ignore
+from aiohttp import web
+from marshmallow import fields
+
+from aiohttp_micro.core.entities import Entity
+from aiohttp_micro.web.handlers.openapi import NDJSON, OperationView, ResponseSchema
+
+
+@dataclass
+class Item(Entity):
+    name: str
+
+
+class ItemResponseSchema(ResponseSchema):
+    """Item."""
+
+    key = fields.Int(data_key="id")
+    name = fields.Str()
+
+
+class StreamItemsView(OperationView):
+    """Stream items."""
+
+    parameters = {}
+    responses = {HTTPStatus.OK: ItemResponseSchema}
+    streaming = True
+    stream_chunk_size = 64
+
+    async def process_request(self, request, params=None, payload=None):
+        async def fetch_items():
+            for key in range(int(request.query.get("count", 10))):
+                yield Item(key=key, name=f"Item {key}")
+
+        return fetch_items()
+
+
+@pytest.fixture(scope="function")
+def stream_app():
+    view = StreamItemsView(name="streamItems", security=None, tags=["items"])
+
+    app = web.Application()
+    view.setup(app)
+    app.router.add_get("/api/items", view.handle)
+
+    return app
+
+
+@pytest.mark.parametrize("count", (0, 1, 50))
+async def test_stream_json_array(aiohttp_client, stream_app, count):
+    client = await aiohttp_client(stream_app)
+
+    resp = await client.get("/api/items", params={"count": count})
+
+    items = await resp.json()
+    assert [item["id"] for item in items] == list(range(count))
+
+
+async def test_stream_ndjson(aiohttp_client, stream_app):
+    client = await aiohttp_client(stream_app)
+
+    resp = await client.get("/api/items", headers={"Accept": NDJSON})
+
+    body = await resp.read()
+    assert resp.content_type == NDJSON
+    assert [orjson.loads(line)["id"] for line in body.splitlines()] == list(range(10))
+
+
+def test_streaming_operation_spec():
+    view = StreamItemsView(name="streamItems", security=None, tags=["items"])
+
+    operation = view.spec.generate()  # act
+
+    assert operation["responses"]["200"]["content"] == {
+        "application/json": {"schema": {"type": "array", "items": ItemResponseSchema}},
+        NDJSON: {"schema": ItemResponseSchema},
+    }
@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import web
+
+from aiohttp_micro import setup_stage_timing
+
+
+@pytest.fixture(scope="function")
+def create_app(openapi_app, greet_view):
+    def create(metrics: bool = False, prepare=None) -> web.Application:
+        return openapi_app([("GET", "/api/greet", greet_view())], metrics=metrics, prepare=prepare)
+
+    return create
+
+
+async def test_server_timing_header(aiohttp_client, create_app):
+    client = await aiohttp_client(create_app(prepare=lambda app: setup_stage_timing(app, server_timing=True)))
+
+    # act
+    resp = await client.get("/api/greet")
+
+    stages = [item.split(";")[0] for item in resp.headers["Server-Timing"].split(", ")]
+    assert stages == ["parameters", "process", "dump"]
+
+
+async def test_stage_latency_metrics(aiohttp_client, create_app):
+    app = create_app(metrics=True, prepare=setup_stage_timing)
+    client = await aiohttp_client(app)
+
+    # act
+    resp = await client.get("/api/greet")
+
+    assert "Server-Timing" not in resp.headers
+    labels = {"app_name": "micro", "operation": "greet", "stage": "process"}
+    assert app["metrics_registry"].get_sample_value("operation_stage_latency_seconds_count", labels) == 1
+
+
+async def test_timings_disabled(aiohttp_client, create_app):
+    client = await aiohttp_client(create_app())
+
+    # act
+    resp = await client.get("/api/greet")
+
+    assert resp.status == HTTPStatus.OK
+    assert "Server-Timing" not in resp.headers
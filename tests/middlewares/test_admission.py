@@ -0,0 +1,141 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from prometheus_client import CollectorRegistry  # type: ignore
+
+from aiohttp_micro.web.admission import AdmissionCollector, AIMDLimiter, Limiter
+from aiohttp_micro.web.middlewares.admission import admission_middleware_factory
+
+
+async def slow(request: web.Request) -> web.Response:
+    await asyncio.sleep(0.1)
+    return web.Response(text="done")
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.Response(text="ok")
+
+
+def create_app(limiter=None, route_limiters=None) -> web.Application:
+    app = web.Application(middlewares=[admission_middleware_factory(limiter, route_limiters, retry_after=2)])
+    app.router.add_get("/api/slow", slow)
+    app.router.add_get("/api/items/{key}", slow)
+    app.router.add_get("/-/health", health)
+
+    return app
+
+
+async def test_queue_full(aiohttp_client):
+    limiter = Limiter(limit=1, max_queue=1, timeout=1)
+    client = await aiohttp_client(create_app(limiter))
+
+    # act
+    responses = await asyncio.gather(*(client.get("/api/slow") for _ in range(3)))
+
+    statuses = sorted(resp.status for resp in responses)
+    assert statuses == [HTTPStatus.OK, HTTPStatus.OK, HTTPStatus.SERVICE_UNAVAILABLE]
+    assert [resp.headers["Retry-After"] for resp in responses if resp.status != HTTPStatus.OK] == ["2"]
+    assert limiter.rejected == {"queue_full": 1, "timeout": 0}
+    assert limiter.queued == 1
+    assert limiter.in_flight == 0
+
+
+async def test_queue_timeout(aiohttp_client):
+    limiter = Limiter(limit=1, max_queue=10, timeout=0.01)
+    client = await aiohttp_client(create_app(limiter))
+
+    # act
+    responses = await asyncio.gather(*(client.get("/api/slow") for _ in range(2)))
+
+    assert sorted(resp.status for resp in responses) == [HTTPStatus.OK, HTTPStatus.SERVICE_UNAVAILABLE]
+    assert limiter.rejected == {"queue_full": 0, "timeout": 1}
+    assert limiter.depth == 0
+
+
+async def test_route_limit(aiohttp_client):
+    route_limiter = Limiter(limit=1, max_queue=0)
+    client = await aiohttp_client(create_app(route_limiters={"/api/items/{key}": route_limiter}))
+
+    # act
+    responses = await asyncio.gather(
+        client.get("/api/items/1"), client.get("/api/items/2"), client.get("/api/slow"), client.get("/api/slow")
+    )
+
+    assert sorted(resp.status for resp in responses[:2]) == [HTTPStatus.OK, HTTPStatus.SERVICE_UNAVAILABLE]
+    assert [resp.status for resp in responses[2:]] == [HTTPStatus.OK, HTTPStatus.OK]
+
+
+async def test_exempt_paths(aiohttp_client):
+    client = await aiohttp_client(create_app(Limiter(limit=0, max_queue=0)))
+
+    # act
+    health_resp, slow_resp = await asyncio.gather(client.get("/-/health"), client.get("/api/slow"))
+
+    assert health_resp.status == HTTPStatus.OK
+    assert slow_resp.status == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+async def test_release_route_slot_when_cancelled():
+    limiter = Limiter(limit=1, max_queue=10, timeout=10)
+    route_limiter = Limiter(limit=10, max_queue=0)
+    app = create_app(limiter, {"/api/slow": route_limiter})
+    request = make_mocked_request("GET", "/api/slow", app=app)
+    request._match_info = await app.router.resolve(request)
+    middleware = app.middlewares[0]
+    admitted = asyncio.ensure_future(middleware(request, slow))
+    queued = asyncio.ensure_future(middleware(request, slow))
+    await asyncio.sleep(0.01)
+
+    # act
+    queued.cancel()
+
+    await asyncio.gather(admitted, queued, return_exceptions=True)
+    assert queued.cancelled()
+    assert route_limiter.in_flight == 0
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "limit, in_flight, latency, expected",
+    ((10, 10, 0.1, 11), (11, 11, 0.1, 11), (10, 5, 0.1, 10), (10, 10, 1.0, 9), (5, 5, 1.0, 5)),
+)
+def test_aimd_limit(limit, in_flight, latency, expected):
+    limiter = AIMDLimiter(limit=limit, min_limit=5, max_limit=11, latency_threshold=0.5, clock=lambda: 0.0)
+    limiter.in_flight = in_flight
+
+    limiter.release(latency)  # act
+
+    assert limiter.limit == expected
+    assert limiter.in_flight == in_flight - 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("elapsed, expected", ((0.0, 9), (0.5, 8)))
+def test_aimd_decrease_once_per_interval(elapsed, expected):
+    now = [0.0]
+    limiter = AIMDLimiter(limit=10, min_limit=5, max_limit=11, latency_threshold=0.5, clock=lambda: now[0])
+    limiter.in_flight = 10
+    limiter.release(1.0)
+    now[0] = elapsed
+
+    limiter.release(1.0)  # act
+
+    assert limiter.limit == expected
+
+
+@pytest.mark.unit
+def test_admission_collector():
+    limiter = Limiter(limit=4)
+    limiter.in_flight = 3
+    limiter.rejected["timeout"] = 2
+    registry = CollectorRegistry()
+
+    registry.register(AdmissionCollector({"global": limiter}))  # act
+
+    assert registry.get_sample_value("admission_limit", {"limiter": "global"}) == 4
+    assert registry.get_sample_value("admission_in_flight", {"limiter": "global"}) == 3
+    assert registry.get_sample_value("admission_rejected_total", {"limiter": "global", "reason": "timeout"}) == 2
@@ -0,0 +1,63 @@
+import gzip
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+from aiohttp import web
+
+from aiohttp_micro.web.middlewares.compression import compression_middleware_factory
+
+
+BODY = b'{"items": [' + b",".join(b'{"id": %d, "name": "Item"}' % key for key in range(200)) + b"]}"
+
+
+async def items(request: web.Request) -> web.Response:
+    return web.Response(body=BODY, content_type="application/json", headers={"ETag": '"items"'})
+
+
+async def small(request: web.Request) -> web.Response:
+    return web.Response(body=b'{"id": 1}', content_type="application/json")
+
+
+async def image(request: web.Request) -> web.Response:
+    return web.Response(body=BODY, content_type="image/png")
+
+
+@pytest.fixture(scope="function")
+def compression_app():
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    app = web.Application(middlewares=[compression_middleware_factory(executor_threshold=4096, executor=executor)])
+    app.router.add_get("/items", items)
+    app.router.add_get("/small", small)
+    app.router.add_get("/image", image)
+
+    yield app
+
+    executor.shutdown()
+
+
+@pytest.mark.parametrize("encoding, decompress", (("gzip", gzip.decompress), ("deflate", zlib.decompress)))
+async def test_compress_response(aiohttp_client, compression_app, encoding, decompress):
+    client = await aiohttp_client(compression_app, auto_decompress=False)
+
+    # act
+    resp = await client.get("/items", headers={"Accept-Encoding": encoding})
+
+    assert resp.headers["Content-Encoding"] == encoding
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert resp.headers["ETag"] == 'W/"items"'
+    assert decompress(await resp.read()) == BODY
+
+
+@pytest.mark.parametrize(
+    "path, accept_encoding", (("/items", "identity"), ("/items", "gzip;q=0"), ("/small", "gzip"), ("/image", "gzip"))
+)
+async def test_skip_compression(aiohttp_client, compression_app, path, accept_encoding):
+    client = await aiohttp_client(compression_app, auto_decompress=False)
+
+    # act
+    resp = await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    assert "Content-Encoding" not in resp.headers
+    assert await resp.read() != b""
@@ -0,0 +1,74 @@
+import pytest  # type: ignore
+from aiohttp import web
+
+from aiohttp_micro import AppConfig, setup, setup_metrics
+from aiohttp_micro.web.middlewares.metrics import OTHER_METHOD, OVERFLOW_ENDPOINT, UNMATCHED_ENDPOINT
+
+
+async def get_item(request: web.Request) -> web.Response:
+    return web.Response(body=b"Item")
+
+
+async def get_tag(request: web.Request) -> web.Response:
+    return web.Response(body=b"Tag")
+
+
+@pytest.fixture(scope="function")
+def prepare_app(distribution):
+    def prepare(max_endpoints: int = 1000) -> web.Application:
+        app = web.Application()
+        setup(app, app_name="micro", config=AppConfig())
+        setup_metrics(app, max_endpoints=max_endpoints)
+
+        app.router.add_get("/api/items/{key}", get_item)
+        app.router.add_get("/api/tags/{key}", get_tag)
+
+        return app
+
+    return prepare
+
+
+def get_labels(app: web.Application, label: str):
+    return {
+        sample.labels[label]
+        for metric in app["metrics_registry"].collect()
+        if metric.name == "requests"
+        for sample in metric.samples
+    }
+
+
+def get_endpoints(app: web.Application):
+    return get_labels(app, "endpoint")
+
+
+async def test_label_requests_with_route_template(aiohttp_client, prepare_app):
+    app = prepare_app()
+    client = await aiohttp_client(app)
+
+    for key in range(3):
+        await client.get(f"/api/items/{key}")
+    await client.get("/api/unknown")
+
+    assert get_endpoints(app) == {"/api/items/{key}", UNMATCHED_ENDPOINT}
+
+
+async def test_limit_endpoints(aiohttp_client, prepare_app):
+    app = prepare_app(max_endpoints=1)
+    client = await aiohttp_client(app)
+
+    await client.get("/api/items/1")
+    await client.get("/api/tags/1")
+
+    assert get_endpoints(app) == {"/api/items/{key}", OVERFLOW_ENDPOINT}
+
+
+async def test_label_other_methods(aiohttp_client, prepare_app):
+    app = prepare_app()
+    client = await aiohttp_client(app)
+
+    # act
+    for method in ("GET", "PROPFIND", "MKCOL"):
+        await client.request(method, "/api/unknown")
+
+    assert get_labels(app, "method") == {"GET", OTHER_METHOD}
+    assert len(app["request_metrics"]._cache) == 2
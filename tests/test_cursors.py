@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import pytest  # type: ignore
+from aiohttp import web
+from marshmallow import fields
+
+from aiohttp_micro.core.cursors import CursorCodec, make_page
+from aiohttp_micro.core.entities import CursorFilters
+from aiohttp_micro.core.exceptions import InvalidCursor
+from aiohttp_micro.web.handlers.openapi import OperationView, ResponseSchema
+from aiohttp_micro.web.schemas import CursorFiltersSchema, CursorPageSchema
+
+
+@dataclass
+class Item:
+    key: int
+    name: str
+
+
+ITEMS = [Item(key=key, name=f"Item {key}") for key in range(1, 26)]
+
+
+class ItemSchema(ResponseSchema):
+    key = fields.Int(data_key="id")
+    name = fields.Str()
+
+
+class ItemsPageSchema(CursorPageSchema):
+    """Items page."""
+
+    items = fields.List(fields.Nested(ItemSchema))
+
+
+class InvalidParametersSchema(ResponseSchema):
+    """Invalid parameters."""
+
+    after = fields.List(fields.Str())
+
+
+class GetItemsView(OperationView):
+    """Get items."""
+
+    parameters = {"filters": CursorFiltersSchema}
+    responses = {HTTPStatus.OK: ItemsPageSchema, HTTPStatus.BAD_REQUEST: InvalidParametersSchema}
+
+    async def process_request(self, request, params=None, payload=None):
+        filters: CursorFilters = params["filters"]
+
+        # Emulate keyset query: WHERE key > after ORDER BY key LIMIT fetch_limit
+        if filters.backward:
+            items = [item for item in reversed(ITEMS) if item.key < filters.before[0]]
+        else:
+            items = [item for item in ITEMS if filters.after is None or item.key > filters.after[0]]
+
+        page = make_page(items[: filters.fetch_limit], filters, lambda item: (item.key,), request.app["cursor_codec"])
+        return page, HTTPStatus.OK
+
+
+@pytest.fixture(scope="function")
+def cursor_app():
+    app = web.Application()
+    app["cursor_codec"] = CursorCodec(b"secret")
+
+    view = GetItemsView(name="getItems", security=None, tags=["items"])
+    view.setup(app)
+    app.router.add_get("/api/items", view.handle)
+
+    return app
+
+
+async def test_paginate_with_cursors(aiohttp_client, cursor_app):
+    client = await aiohttp_client(cursor_app)
+
+    first = await (await client.get("/api/items")).json()
+    second = await (await client.get("/api/items", params={"after": first["next"]})).json()
+    third = await (await client.get("/api/items", params={"after": second["next"]})).json()
+
+    # act
+    resp = await client.get("/api/items", params={"before": third["prev"]})
+
+    back = await resp.json()
+    assert [item["id"] for item in third["items"]] == list(range(21, 26))
+    assert (first.get("prev"), third.get("next")) == (None, None)
+    assert back == second
+
+
+@pytest.mark.parametrize("params", ({"after": "garbage"}, {"after": CursorCodec(b"other").encode([10])}))
+async def test_invalid_cursor(aiohttp_client, cursor_app, params):
+    client = await aiohttp_client(cursor_app)
+
+    # act
+    resp = await client.get("/api/items", params=params)
+
+    assert resp.status == HTTPStatus.BAD_REQUEST
+    assert await resp.json() == {"after": ["Invalid cursor"]}
+
+
+@pytest.mark.unit
+def test_cursor_codec():
+    codec = CursorCodec(b"secret")
+    cursor = codec.encode(["2021-01-01T00:00:00", 42])
+
+    key = codec.decode(cursor)  # act
+
+    assert key == ("2021-01-01T00:00:00", 42)
+
+
+@pytest.mark.unit
+def test_tampered_cursor():
+    codec = CursorCodec(b"secret")
+    cursor = codec.encode(["2021-01-01T00:00:00", 42])
+
+    with pytest.raises(InvalidCursor):
+        codec.decode(cursor[:-2])
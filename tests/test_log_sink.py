@@ -0,0 +1,108 @@
+import gc
+import io
+import os
+import threading
+import weakref
+
+import pytest  # type: ignore
+
+from aiohttp_micro.core.tools.log_sink import LogSink, LogSinkCollector, OverflowPolicy, SinkLogger, SINKS
+
+
+class SlowFile(io.BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblocked = threading.Event()
+
+    def write(self, data: bytes) -> int:
+        self.unblocked.wait()
+        return super().write(data)
+
+
+@pytest.mark.unit
+def test_flush_lines_on_close():
+    output = io.BytesIO()
+    sink = LogSink(file=output, batch_size=2)
+    logger = SinkLogger(sink)
+    for key in range(5):
+        logger.info(f"line {key}".encode())
+
+    sink.close()  # act
+
+    assert output.getvalue().splitlines() == [f"line {key}".encode() for key in range(5)]
+
+
+@pytest.mark.unit
+def test_write_directly_after_close():
+    output = io.BytesIO()
+    sink = LogSink(file=output)
+    sink.close()
+
+    SinkLogger(sink).info(b"line")  # act
+
+    assert output.getvalue() == b"line\n"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("policy", (OverflowPolicy.drop, OverflowPolicy.sample))
+def test_drop_lines_on_overflow(policy):
+    output = SlowFile()
+    sink = LogSink(file=output, max_size=10, batch_size=1, policy=policy)
+    logger = SinkLogger(sink)
+
+    for key in range(100):  # act
+        logger.info(f"line {key}".encode())
+
+    output.unblocked.set()
+    sink.close()
+    assert sink.dropped + sink.sampled > 0
+    assert len(output.getvalue().splitlines()) == 100 - sink.dropped - sink.sampled
+
+
+@pytest.mark.unit
+def test_collect_sink_metrics():
+    sink = LogSink(file=io.BytesIO())
+    sink.dropped = 3
+    sink.close()
+
+    metrics = {metric.name: metric for metric in LogSinkCollector(sink).collect()}  # act
+
+    assert metrics["log_sink_queue_depth"].samples[0].value == 0
+    assert {sample.labels["reason"]: sample.value for sample in metrics["log_sink_dropped_lines"].samples} == {
+        "overflow": 3,
+        "sampled": 0,
+    }
+
+
+@pytest.mark.unit
+def test_forget_collected_sinks():
+    sink = LogSink(file=io.BytesIO())
+    sink.close()
+    registered = sink in SINKS
+    ref = weakref.ref(sink)
+
+    del sink  # act
+
+    gc.collect()
+    assert registered
+    assert ref() is None
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork")
+def test_restart_sink_in_child_process():
+    read_fd, write_fd = os.pipe()
+    sink = LogSink(file=os.fdopen(write_fd, "wb", closefd=False))
+
+    pid = os.fork()  # act
+
+    if pid == 0:
+        sink.write(b"child\n")
+        sink.close()
+        os._exit(0 if sink._thread is not None else 1)
+    _, status = os.waitpid(pid, 0)
+    sink.close()
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as output:
+        assert output.read() == b"child\n"
+    assert os.WEXITSTATUS(status) == 0
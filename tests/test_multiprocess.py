@@ -0,0 +1,32 @@
+import pytest  # type: ignore
+from prometheus_client import values  # type: ignore
+
+from aiohttp_micro import enable_multiprocess_metrics, setup_multiprocess_metrics, setup_stage_timing
+
+
+@pytest.fixture(scope="function")
+def metrics_dir(monkeypatch, tmp_path):
+    # Restored after test, other tests keep values in process memory
+    monkeypatch.setattr(values, "ValueClass", values.ValueClass)
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    monkeypatch.setenv("prometheus_multiproc_dir", "")
+
+    return str(tmp_path)
+
+
+async def test_expose_metrics_of_workers(aiohttp_client, openapi_app, get_item_view, metrics_dir):
+    enable_multiprocess_metrics(metrics_dir)
+    app = openapi_app(
+        [("GET", "/api/items", get_item_view(cache_ttl=60))], metrics=True, prepare=setup_stage_timing
+    )
+    setup_multiprocess_metrics(app, metrics_dir)
+
+    client = await aiohttp_client(app)
+    await client.get("/api/items")
+
+    # act
+    resp = await client.get("/-/metrics")
+
+    text = await resp.text()
+    assert 'operation_stage_latency_seconds_count{app_name="micro",operation="getItem",stage="process"} 1.0' in text
+    assert "response_cache_entries 1.0" in text
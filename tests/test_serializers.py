@@ -0,0 +1,120 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pytest  # type: ignore
+from marshmallow import fields, Schema
+
+from aiohttp_micro.core.entities import Entity
+from aiohttp_micro.core.schemas import EntitySchema
+from aiohttp_micro.core.serializers import Dumper, get_dumper
+
+
+@dataclass
+class Tag(Entity):
+    name: Optional[str] = None
+
+
+@dataclass
+class Item(Entity):
+    name: str
+    tags: List[Tag] = field(default_factory=list)
+    main: Optional[Tag] = None
+
+
+class TagSchema(EntitySchema):
+    entity_cls = Tag
+
+    name = fields.Str()
+
+
+class ItemSchema(EntitySchema):
+    entity_cls = Item
+
+    key = fields.Int(data_key="id", dump_only=True)
+    name = fields.Str(required=True)
+    tags = fields.List(fields.Nested(TagSchema))
+    main = fields.Nested(TagSchema)
+    title = fields.Str(default="Untitled")
+
+
+class ItemsSchema(Schema):
+    items = fields.List(fields.Nested(ItemSchema), required=True)
+    total = fields.Int()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"items": []},
+        {"items": [Item(key=1, name="Foo")], "total": None},
+        {"items": [Item(key=1, name="Foo", tags=[Tag(key=2, name="Bar"), Tag(key=3)], main=Tag(key=4, name="Baz"))]},
+        {"items": [{"key": 1, "name": "Foo", "main": None}], "total": 1},
+    ),
+)
+def test_fast_dump_matches_schema_dump(data):
+    schema = ItemsSchema()
+
+    result = get_dumper(schema)(data)  # act
+
+    assert result == schema.dump(data)
+
+
+class CatalogSchema(Schema):
+    items = fields.Nested(ItemSchema, many=True)
+    featured = fields.Nested(ItemSchema(many=True))
+    main = fields.Nested(TagSchema)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"items": None, "main": None},
+        {"items": [Item(key=1, name="Foo", tags=[Tag(key=2)])], "featured": [], "main": Tag(key=3, name="Bar")},
+        {"items": [{"key": 1, "name": "Foo"}], "featured": [Item(key=2, name="Bar")], "main": {"name": "Baz"}},
+    ),
+)
+def test_fast_dump_nested(data):
+    schema = CatalogSchema()
+    dumper = get_dumper(schema)
+
+    result = dumper(data)  # act
+
+    assert isinstance(dumper, Dumper)
+    assert result == schema.dump(data)
+
+
+@pytest.mark.unit
+def test_fast_dump_entity():
+    schema = ItemSchema()
+    dumper = get_dumper(schema)
+
+    result = dumper(Item(key=1, name="Foo", main=Tag(key=2)))  # act
+
+    assert isinstance(dumper, Dumper)
+    assert result == {"id": 1, "name": "Foo", "tags": [], "main": {"id": 2}, "title": "Untitled"}
+
+
+@pytest.mark.unit
+def test_fast_dump_unserializable_entity():
+    dumper = get_dumper(ItemSchema())
+
+    with pytest.raises(ValueError):
+        dumper(Tag(key=1, name="Foo"))
+
+
+class MethodFieldSchema(Schema):
+    name = fields.Method("get_name")
+
+    def get_name(self, obj) -> str:
+        return "Foo"
+
+
+@pytest.mark.unit
+def test_fallback_for_schema_with_method_fields():
+    schema = MethodFieldSchema()
+
+    dumper = get_dumper(schema)  # act
+
+    assert dumper == schema.dump
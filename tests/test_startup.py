@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest  # type: ignore
+
+
+# Imported by `setup_*` functions only, never by importing the package
+HEAVY_MODULES = ("aiozipkin", "apispec", "pkg_resources", "prometheus_client", "sentry_sdk", "structlog")
+
+# Seconds spent importing the package on top of aiohttp itself
+IMPORT_BUDGET = 0.1
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Self import time of every module imported with `module`, in microseconds."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+
+    prefix = len("import time:")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_time, _, name = line[prefix:].split("|")
+        times[name.strip()] = int(self_time)
+
+    return times
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "module",
+    (
+        "aiohttp_micro",
+        "aiohttp_micro.core.tools.log_sink",
+        "aiohttp_micro.web.handlers.openapi",
+        "aiohttp_micro.web.schemas",
+    ),
+)
+def test_heavy_modules_not_imported(module):
+    times = import_times(module)  # act
+
+    assert module in times
+    assert sorted({name.split(".")[0] for name in times} & set(HEAVY_MODULES)) == []
+
+
+@pytest.mark.unit
+def test_import_budget():
+    baseline = import_times("aiohttp.web")
+
+    times = import_times("aiohttp_micro")  # act
+
+    spent = sum(self_time for name, self_time in times.items() if name not in baseline)
+    assert spent / 1e6 < IMPORT_BUDGET
@@ -0,0 +1,134 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+
+import pytest  # type: ignore
+from aiohttp import web
+
+from aiohttp_micro.cli.supervisor import create_socket, Supervisor
+
+
+CONTEXT = multiprocessing.get_context("fork")
+
+
+def create_app(events, on_shutdown=None):
+    async def started(app):
+        events.send(("started", os.getpid()))
+
+    async def stopped(app):
+        events.send(("stopped", os.getpid()))
+
+    app = web.Application()
+    app.on_startup.append(started)
+    app.on_cleanup.append(stopped)
+    if on_shutdown:
+        app.on_shutdown.append(on_shutdown)
+
+    return app
+
+
+def receive(events, count, timeout=10.0):
+    received = []
+
+    deadline = time.monotonic() + timeout
+    while len(received) < count and events.poll(max(deadline - time.monotonic(), 0)):
+        received.append(events.recv())
+
+    return received
+
+
+@pytest.fixture(scope="function")
+def events():
+    reader, writer = CONTEXT.Pipe(duplex=False)
+
+    yield reader, writer
+
+    reader.close()
+    writer.close()
+
+
+@pytest.fixture(scope="function")
+def supervise():
+    processes = []
+
+    def start(app, workers, **kwargs):
+        def run():
+            # Own process group, so tests signal it the same way terminal does
+            os.setpgid(0, 0)
+            Supervisor(app, create_socket("127.0.0.1", 0), workers, restart_delay=0, **kwargs).run()
+
+        process = CONTEXT.Process(target=run)
+        process.start()
+        processes.append(process)
+
+        return process
+
+    yield start
+
+    for process in processes:
+        if process.is_alive():
+            os.killpg(process.pid, signal.SIGKILL)
+            process.join()
+
+
+def test_fork_workers(events, supervise):
+    reader, writer = events
+
+    process = supervise(create_app(writer), workers=2)  # act
+
+    started = receive(reader, 2)
+    pids = {pid for _, pid in started}
+    assert len(pids) == 2
+    assert process.pid not in pids
+
+
+def test_restart_crashed_worker(events, supervise):
+    reader, writer = events
+    supervise(create_app(writer), workers=1)
+    [(_, crashed)] = receive(reader, 1)
+
+    os.kill(crashed, signal.SIGKILL)  # act
+
+    [(event, pid)] = receive(reader, 1)
+    assert event == "started"
+    assert pid != crashed
+
+
+async def slow_shutdown(app):
+    await asyncio.sleep(0.5)
+
+
+async def stuck_shutdown(app):
+    time.sleep(30)
+
+
+def test_forward_signal_once(events, supervise):
+    reader, writer = events
+    process = supervise(create_app(writer, on_shutdown=slow_shutdown), workers=2)
+    started = receive(reader, 2)
+    os.killpg(process.pid, signal.SIGINT)
+    time.sleep(0.2)
+
+    os.killpg(process.pid, signal.SIGINT)  # act
+
+    process.join(10)
+    stopped = receive(reader, 3, timeout=1.0)
+    assert process.exitcode == 0
+    assert sorted(pid for _, pid in stopped) == sorted(pid for _, pid in started)
+    assert {event for event, _ in stopped} == {"stopped"}
+
+
+def test_kill_workers_after_shutdown_timeout(events, supervise):
+    reader, writer = events
+    process = supervise(create_app(writer, on_shutdown=stuck_shutdown), workers=2, shutdown_timeout=0.5)
+    receive(reader, 2)
+    stopping_at = time.monotonic()
+
+    os.kill(process.pid, signal.SIGTERM)  # act
+
+    process.join(10)
+    assert process.exitcode == 0
+    assert time.monotonic() - stopping_at < 5
+    assert receive(reader, 1, timeout=0.5) == []
@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import aiozipkin as az  # type: ignore
+import pytest  # type: ignore
+from aiozipkin.transport import StubTransport  # type: ignore
+
+from aiohttp_micro import setup_tracing
+from aiohttp_micro.core.tools.zipkin import AdaptiveSampler, BatchTransport, LocalCollector, RateSampler
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "rate, value, expected", ((0.0, 0.0, False), (1.0, 0.99, True), (0.5, 0.3, True), (0.5, 0.7, False))
+)
+def test_rate_sampler(rate, value, expected):
+    sampler = RateSampler(rate, rand=lambda: value)
+
+    sampled = sampler.is_sampled("getItems")  # act
+
+    assert sampled is expected
+
+
+@pytest.mark.unit
+def test_rate_sampler_rules():
+    sampler = RateSampler(1.0, rules={"health": 0.0}, rand=lambda: 0.5)
+
+    sampled = [sampler.is_sampled(route_name) for route_name in ("getItems", "health")]  # act
+
+    assert sampled == [True, False]
+
+
+@pytest.mark.unit
+def test_adaptive_sampler_follows_budget():
+    now = [0.0]
+    sampler = AdaptiveSampler(10, rules={"health": 0.0}, rand=lambda: 0.5, clock=lambda: now[0])
+
+    for _ in range(100):  # act
+        now[0] += 0.01
+        sampler.is_sampled("getItems")
+        sampler.is_sampled("health")
+
+    assert sampler.rate == pytest.approx(0.1)
+
+
+@pytest.fixture
+async def collector(aiohttp_server):
+    collector = LocalCollector()
+    server = await aiohttp_server(collector.create_app())
+
+    collector.address = str(server.make_url("/api/v2/spans"))
+
+    return collector
+
+
+def create_tracer(transport):
+    return az.Tracer(transport, az.Sampler(sample_rate=1.0), az.create_endpoint("micro"))
+
+
+async def test_batch_transport_exports_spans(collector):
+    transport = BatchTransport(collector.address, batch_size=2, flush_interval=10)
+    tracer = create_tracer(transport)
+
+    for index in range(5):
+        with tracer.new_trace(sampled=True) as span:
+            span.name(f"span {index}")
+
+    # act
+    await tracer.close()
+
+    assert [span["name"] for span in collector.spans] == [f"span {index}" for index in range(5)]
+    assert collector.batches == 3
+    assert transport.exported == 5
+
+
+async def test_batch_transport_drops_spans_on_overflow(collector):
+    transport = BatchTransport(collector.address, max_queue_size=3, batch_size=10, flush_interval=10)
+    tracer = create_tracer(transport)
+
+    for _ in range(5):
+        with tracer.new_trace(sampled=True):
+            pass
+
+    # act
+    await tracer.close()
+
+    assert len(collector.spans) == 3
+    assert transport.dropped == 2
+
+
+async def test_batch_transport_counts_failed_exports(collector):
+    collector.status = 503
+    transport = BatchTransport(collector.address, flush_interval=10)
+    tracer = create_tracer(transport)
+
+    with tracer.new_trace(sampled=True):
+        pass
+
+    # act
+    await tracer.close()
+
+    assert collector.spans == []
+    assert transport.failed == 1
+
+
+async def test_sampling_rules_follow_operation_names(aiohttp_client, openapi_app, get_item_view):
+    app = openapi_app(
+        [
+            ("GET", "/api/items", get_item_view()),
+            ("GET", "/api/tags", get_item_view(name="getTag", tags=["tags"])),
+        ],
+        prepare=lambda app: setup_tracing(app, sampling_rules={"getTag": 0.0}),
+    )
+    transport = StubTransport()
+    app["tracer"] = create_tracer(transport)
+    client = await aiohttp_client(app)
+    headers = {"X-B3-TraceId": "463ac35c9f6413ad48485a3953bb6124", "X-B3-SpanId": "a2fb4a1d1a96d312"}
+
+    # act
+    responses = [await client.get(path, headers=headers) for path in ("/api/items", "/api/tags")]
+
+    assert [resp.status for resp in responses] == [HTTPStatus.OK, HTTPStatus.OK]
+    assert [record.asdict()["name"] for record in transport.records] == ["GET /api/items"]